@@ -0,0 +1,26 @@
+"""
+Gunicorn settings, picked up automatically from the working directory.
+Threaded workers keep /api/ai/tab-events long-polls from occupying a whole
+worker each; command-line flags (e.g. --workers, --bind) still take precedence.
+
+GUNICORN_WORKER_CLASS=gevent switches to cooperative workers for the Claude
+routes (chat, invoke-llm, tab and report generation, idea validation): each
+request is a greenlet, so a worker holds up to GUNICORN_WORKER_CONNECTIONS
+requests waiting on the model instead of GUNICORN_THREADS. psycopg2 is made
+gevent-aware after fork, and the routes give their pooled connection back
+before calling Claude (utils/llm_client.py), so DB_POOL_SIZE does not cap
+in-flight calls.
+"""
+import os
+
+worker_class = os.environ.get('GUNICORN_WORKER_CLASS', 'gthread')
+threads = int(os.environ.get('GUNICORN_THREADS', 16))
+worker_connections = int(os.environ.get('GUNICORN_WORKER_CONNECTIONS', 1000))
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', 120))
+
+
+def post_fork(server, worker):
+    if worker_class == 'gevent':
+        # Database waits yield to other greenlets instead of blocking the worker
+        from psycogreen.gevent import patch_psycopg
+        patch_psycopg()
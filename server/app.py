@@ -1,15 +1,22 @@
 """
 Flask application factory and initialization.
 """
-from flask import Flask, jsonify, send_from_directory
+from flask import Flask, jsonify, request, send_from_directory
 from flask_cors import CORS
-from flask_migrate import Migrate
-from flasgger import Swagger
 from .models import db
 from server.config import get_config
 from server.exceptions import APIException
 from server.utils.response import APIResponse
 from server.utils.audit_middleware import setup_audit_logging
+from server.utils.response_compression import setup_response_compression
+from server.utils.json_provider import FastJSONProvider
+from server.utils.db_engine import setup_sqlite_foreign_keys, setup_statement_timeouts
+from server.utils.db_routing import setup_read_routing
+from server.schema_migrations import initialize_database, schema_is_current
+from server.utils.static_assets import StaticAssetMiddleware, get_static_manifest
+from server.utils.api_docs import init_api_docs
+from server.utils.boot_timing import BootTimer
+from server.utils.llm_client import setup_write_tracking
 import logging
 import os
 
@@ -20,31 +27,24 @@ logger = logging.getLogger(__name__)
 
 def create_app(config=None):
     """Application factory function"""
+    timer = BootTimer()
     app = Flask(__name__)
     
     # Load configuration
     if config is None:
         config = get_config(os.environ.get('FLASK_ENV', 'development'))
     app.config.from_object(config)
+    app.json = FastJSONProvider(app)
+    fast_boot = app.config.get('FAST_BOOT')
+    timer.mark('config')
     
     # Initialize extensions
     db.init_app(app)
-    migrate = Migrate(app, db)
-    
-    # Initialize Swagger for API documentation
-    swagger = Swagger(app, template={
-        "swagger": "2.0",
-        "info": {
-            "title": "Planlyze API",
-            "description": "Professional Business Analysis Platform API",
-            "version": "1.0.0",
-            "contact": {
-                "name": "Planlyze Support"
-            }
-        },
-        "schemes": ["http", "https"],
-        "basePath": "/api"
-    })
+    setup_write_tracking()
+    if not fast_boot:
+        # Only the `flask db` commands use it; alembic alone takes ~250 ms to import
+        from flask_migrate import Migrate
+        Migrate(app, db)
     
     # Setup CORS
     CORS(app, origins=app.config['CORS_ORIGINS'], resources={
@@ -54,6 +54,7 @@ def create_app(config=None):
             "supports_credentials": True
         }
     })
+    timer.mark('extensions')
     
     # Register blueprints
     _register_blueprints(app)
@@ -77,28 +78,86 @@ def create_app(config=None):
                   example: healthy
         """
         return APIResponse.success({'status': 'healthy'}, message='Server is running')
+    timer.mark('blueprints')
     
-    # Create database tables if they don't exist
+    # Create missing tables and apply schema migrations. FAST_BOOT workers
+    # check the schema version (one query) and skip both when it is current.
     with app.app_context():
-        db.create_all()
+        for engine in db.engines.values():
+            setup_sqlite_foreign_keys(engine)
+            setup_statement_timeouts(app, engine)
+        if not fast_boot or not schema_is_current():
+            initialize_database()
         logger.info("Database initialized")
+    timer.mark('database')
+    
+    # Compress large API responses (registered first so it runs after audit logging)
+    setup_response_compression(app)
+    
+    # Pin recent writers to the primary when a read replica is configured
+    setup_read_routing(app)
     
     # Setup audit logging middleware
     setup_audit_logging(app)
     logger.info("Audit logging middleware initialized")
     
-    logger.info(f"Application created with {app.config.get('FLASK_ENV', 'development')} configuration")
-    logger.info(f"Swagger UI available at http://localhost:3000/api/apidocs")
-    
-    # Serve static files from Vite build in production
+    # Deliver queued emails in the background
+    if app.config.get('EMAIL_OUTBOX_ENABLED') and app.config.get('EMAIL_DISPATCHER_ENABLED'):
+        from server.services.email_outbox_service import start_email_dispatcher
+        start_email_dispatcher(app)
+        logger.info("Email outbox dispatcher started")
+    
+    # Flush coalesced admin alerts once per window
+    if app.config.get('ADMIN_ALERT_FLUSH_ENABLED'):
+        from server.services.admin_alert_service import start_alert_flusher
+        start_alert_flusher(app)
+    
+    # Persist buffered shared-report view counts
+    if app.config.get('SHARED_REPORT_VIEW_FLUSH_ENABLED'):
+        from server.services.report_share_service import start_share_view_flusher
+        start_share_view_flusher(app)
+    
+    # Wake tab-event long-polls for changes made by other workers
+    if app.config.get('TAB_EVENTS_WATCH_ENABLED'):
+        from server.services.tab_events_service import start_tab_event_watcher
+        start_tab_event_watcher(app)
+    
+    # Release tab generation leases whose holder stopped heartbeating
+    if app.config.get('TAB_LEASE_REAPER_ENABLED'):
+        from server.services.tab_generation_service import start_lease_reaper
+        start_lease_reaper(app)
+    
+    # Write buffered Claude call records to the usage ledger
+    if app.config.get('LLM_USAGE_FLUSH_ENABLED'):
+        from server.services.llm_usage_service import start_llm_usage_flusher
+        start_llm_usage_flusher(app)
+    
+    timer.mark('background')
+    
+    # Serve static files from Vite build in production. Files in the startup
+    # manifest are answered by the middleware before Flask's request hooks run;
+    # the catch-all below only handles SPA routes (index.html).
     dist_folder = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'dist')
+    static_manifest = get_static_manifest(dist_folder)
+    app.wsgi_app = StaticAssetMiddleware(app.wsgi_app, static_manifest)
     
     @app.route('/', defaults={'path': ''})
     @app.route('/<path:path>')
     def serve_frontend(path):
-        if path and os.path.exists(os.path.join(dist_folder, path)):
-            return send_from_directory(dist_folder, path)
-        return send_from_directory(dist_folder, 'index.html')
+        asset = static_manifest.get('/' + path) or static_manifest.index
+        if asset is None:
+            return send_from_directory(dist_folder, 'index.html')
+        return static_manifest.flask_response(asset, request)
+    timer.mark('static')
+    
+    # API docs, after all routes so the lazy docs app sees them
+    init_api_docs(app)
+    timer.mark('api docs')
+    
+    app.extensions['boot_timings'] = timer.phases
+    logger.info(f"Application created with {app.config.get('FLASK_ENV', 'development')} configuration "
+                f"in {timer.total_ms} ms ({timer.summary()})")
+    logger.info(f"Swagger UI available at http://localhost:3000/apidocs/")
     
     return app
 
@@ -156,10 +215,13 @@ def _register_error_handlers(app):
             user_email = None
             if hasattr(flask_request, 'current_user') and flask_request.current_user:
                 user_email = getattr(flask_request.current_user, 'email', None)
+            # Group by route pattern so /analyses/<id> errors coalesce into one alert
+            endpoint = flask_request.url_rule.rule if flask_request.url_rule else flask_request.path
+            original = getattr(error, 'original_exception', None) or error
             notify_server_error(
-                flask_request.path,
+                endpoint,
                 flask_request.method,
-                str(error),
+                f"{type(original).__name__}: {original}",
                 user_email
             )
         except Exception as notify_error:
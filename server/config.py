@@ -4,6 +4,7 @@ Supports multiple environments (development, testing, production).
 """
 import os
 from dotenv import load_dotenv
+from server.utils.db_engine import build_engine_options
 
 load_dotenv()
 
@@ -19,6 +20,52 @@ class Config:
     SQLALCHEMY_DATABASE_URI = os.environ.get('DATABASE_URL')
     SQLALCHEMY_TRACK_MODIFICATIONS = False
     SQLALCHEMY_ECHO = False
+    # Fast worker boot: skip create_all()/migrations when the schema version is
+    # current, skip Flask-Migrate (set FAST_BOOT=false for `flask db`), and
+    # build the Swagger docs on first request
+    FAST_BOOT = os.environ.get('FAST_BOOT', 'false').lower() == 'true'
+    API_DOCS_LAZY = os.environ.get('API_DOCS_LAZY', str(FAST_BOOT)).lower() == 'true'
+    # Connection pool per process (gunicorn worker); the database needs
+    # workers x (DB_POOL_SIZE + DB_MAX_OVERFLOW) connections at peak
+    DB_POOL_SIZE = int(os.environ.get('DB_POOL_SIZE', 5))
+    DB_MAX_OVERFLOW = int(os.environ.get('DB_MAX_OVERFLOW', 10))
+    DB_POOL_TIMEOUT = int(os.environ.get('DB_POOL_TIMEOUT', 10))
+    DB_POOL_RECYCLE = int(os.environ.get('DB_POOL_RECYCLE', 1800))
+    DB_POOL_PRE_PING = os.environ.get('DB_POOL_PRE_PING', 'true').lower() == 'true'
+    DB_CONNECT_TIMEOUT = int(os.environ.get('DB_CONNECT_TIMEOUT', 10))
+    # Default per-statement limit; routes can override with @statement_timeout
+    DB_STATEMENT_TIMEOUT_MS = int(os.environ.get('DB_STATEMENT_TIMEOUT_MS', 30000))
+    # PgBouncer in transaction pooling mode: no startup parameters, timeouts set per transaction
+    DB_PGBOUNCER = os.environ.get('DB_PGBOUNCER', 'false').lower() == 'true'
+    # JSON columns use the same fast encoder as API responses
+    SQLALCHEMY_ENGINE_OPTIONS = build_engine_options(
+        SQLALCHEMY_DATABASE_URI,
+        pool_size=DB_POOL_SIZE,
+        max_overflow=DB_MAX_OVERFLOW,
+        pool_timeout=DB_POOL_TIMEOUT,
+        pool_recycle=DB_POOL_RECYCLE,
+        pre_ping=DB_POOL_PRE_PING,
+        connect_timeout=DB_CONNECT_TIMEOUT,
+        statement_timeout_ms=DB_STATEMENT_TIMEOUT_MS,
+        pgbouncer=DB_PGBOUNCER
+    )
+    # Optional read replica for admin/analytics/list endpoints (see utils/db_routing.py)
+    DATABASE_REPLICA_URL = os.environ.get('DATABASE_REPLICA_URL')
+    SQLALCHEMY_BINDS = {
+        'replica': {'url': DATABASE_REPLICA_URL, **build_engine_options(
+            DATABASE_REPLICA_URL,
+            pool_size=DB_POOL_SIZE,
+            max_overflow=DB_MAX_OVERFLOW,
+            pool_timeout=DB_POOL_TIMEOUT,
+            pool_recycle=DB_POOL_RECYCLE,
+            pre_ping=DB_POOL_PRE_PING,
+            connect_timeout=DB_CONNECT_TIMEOUT,
+            statement_timeout_ms=DB_STATEMENT_TIMEOUT_MS,
+            pgbouncer=DB_PGBOUNCER
+        )}
+    } if DATABASE_REPLICA_URL else {}
+    # After a user's own write, their reads stay on the primary this long
+    DB_REPLICA_STICKY_SECONDS = int(os.environ.get('DB_REPLICA_STICKY_SECONDS', 10))
     
     # JWT
     JWT_SECRET_KEY = os.environ.get('JWT_SECRET_KEY', 'jwt-secret-key-change-in-production')
@@ -33,6 +80,67 @@ class Config:
     # Pagination
     ITEMS_PER_PAGE = int(os.environ.get('ITEMS_PER_PAGE', 20))
 
+    # Email outbox (emails are queued in the DB and sent by a background dispatcher)
+    EMAIL_OUTBOX_ENABLED = os.environ.get('EMAIL_OUTBOX_ENABLED', 'true').lower() == 'true'
+    EMAIL_DISPATCHER_ENABLED = os.environ.get('EMAIL_DISPATCHER_ENABLED', 'true').lower() == 'true'
+    EMAIL_DISPATCH_INTERVAL_SECONDS = float(os.environ.get('EMAIL_DISPATCH_INTERVAL_SECONDS', 2))
+    EMAIL_DISPATCH_BATCH_SIZE = int(os.environ.get('EMAIL_DISPATCH_BATCH_SIZE', 25))
+    EMAIL_MAX_ATTEMPTS = int(os.environ.get('EMAIL_MAX_ATTEMPTS', 6))
+    EMAIL_RETRY_BASE_SECONDS = int(os.environ.get('EMAIL_RETRY_BASE_SECONDS', 30))
+    # Compiled email templates are cached per process; other workers pick up edits after this TTL
+    EMAIL_TEMPLATE_CACHE_TTL_SECONDS = int(os.environ.get('EMAIL_TEMPLATE_CACHE_TTL_SECONDS', 300))
+
+    # Public read endpoints (landing stats, partners, packages...) are cached in-process
+    PUBLIC_CACHE_TTL_SECONDS = int(os.environ.get('PUBLIC_CACHE_TTL_SECONDS', 60))
+
+    # API response compression (gzip, or brotli when installed)
+    API_COMPRESSION_ENABLED = os.environ.get('API_COMPRESSION_ENABLED', 'true').lower() == 'true'
+    API_COMPRESSION_MIN_BYTES = int(os.environ.get('API_COMPRESSION_MIN_BYTES', 1024))
+    API_COMPRESSION_GZIP_LEVEL = int(os.environ.get('API_COMPRESSION_GZIP_LEVEL', 5))
+    API_COMPRESSION_BROTLI_QUALITY = int(os.environ.get('API_COMPRESSION_BROTLI_QUALITY', 4))
+
+    # Public shared reports: snapshot cache, batched view counts, throttled owner notifications
+    SHARED_REPORT_CACHE_TTL_SECONDS = int(os.environ.get('SHARED_REPORT_CACHE_TTL_SECONDS', 300))
+    SHARED_REPORT_CACHE_MAX_ENTRIES = int(os.environ.get('SHARED_REPORT_CACHE_MAX_ENTRIES', 100))
+    SHARED_REPORT_VIEW_FLUSH_ENABLED = os.environ.get('SHARED_REPORT_VIEW_FLUSH_ENABLED', 'true').lower() == 'true'
+    SHARED_REPORT_VIEW_FLUSH_SECONDS = int(os.environ.get('SHARED_REPORT_VIEW_FLUSH_SECONDS', 10))
+    SHARED_REPORT_NOTIFY_WINDOW_SECONDS = int(os.environ.get('SHARED_REPORT_NOTIFY_WINDOW_SECONDS', 3600))
+
+    # Admin alerts (server errors are grouped and sent as one digest per window)
+    ADMIN_ALERT_FLUSH_ENABLED = os.environ.get('ADMIN_ALERT_FLUSH_ENABLED', 'true').lower() == 'true'
+    ADMIN_ALERT_WINDOW_SECONDS = int(os.environ.get('ADMIN_ALERT_WINDOW_SECONDS', 60))
+
+    # Tab status long-polling (/api/ai/tab-events)
+    TAB_EVENTS_WATCH_ENABLED = os.environ.get('TAB_EVENTS_WATCH_ENABLED', 'true').lower() == 'true'
+    TAB_EVENTS_WATCH_SECONDS = float(os.environ.get('TAB_EVENTS_WATCH_SECONDS', 1))
+    TAB_EVENTS_MAX_WAIT_SECONDS = int(os.environ.get('TAB_EVENTS_MAX_WAIT_SECONDS', 25))
+
+    # Tab generation leases (one Claude call per tab at a time, expired leases reaped)
+    TAB_LEASE_TTL_SECONDS = int(os.environ.get('TAB_LEASE_TTL_SECONDS', 90))
+    TAB_LEASE_HEARTBEAT_SECONDS = int(os.environ.get('TAB_LEASE_HEARTBEAT_SECONDS', 30))
+    TAB_LEASE_REAPER_ENABLED = os.environ.get('TAB_LEASE_REAPER_ENABLED', 'true').lower() == 'true'
+    TAB_LEASE_REAPER_SECONDS = int(os.environ.get('TAB_LEASE_REAPER_SECONDS', 30))
+    TAB_GENERATION_JOIN_WAIT_SECONDS = int(os.environ.get('TAB_GENERATION_JOIN_WAIT_SECONDS', 20))
+
+    # Local idea classifier: confident validations skip the Claude call
+    IDEA_CLASSIFIER_ENABLED = os.environ.get('IDEA_CLASSIFIER_ENABLED', 'true').lower() == 'true'
+
+    # Near-duplicate idea detection (per-user MinHash/LSH indexes, LRU-bounded per worker)
+    DUPLICATE_IDEA_DETECTION_ENABLED = os.environ.get('DUPLICATE_IDEA_DETECTION_ENABLED', 'true').lower() == 'true'
+    DUPLICATE_IDEA_THRESHOLD = float(os.environ.get('DUPLICATE_IDEA_THRESHOLD', 0.6))
+    DUPLICATE_IDEA_WINDOW_DAYS = int(os.environ.get('DUPLICATE_IDEA_WINDOW_DAYS', 90))
+    DUPLICATE_IDEA_REFRESH_SECONDS = int(os.environ.get('DUPLICATE_IDEA_REFRESH_SECONDS', 30))
+    DUPLICATE_IDEA_MAX_PER_USER = int(os.environ.get('DUPLICATE_IDEA_MAX_PER_USER', 200))
+    DUPLICATE_IDEA_MAX_ENTRIES = int(os.environ.get('DUPLICATE_IDEA_MAX_ENTRIES', 5000))
+
+    # LLM usage ledger (every Claude call, written in batches by a background thread)
+    LLM_USAGE_FLUSH_ENABLED = os.environ.get('LLM_USAGE_FLUSH_ENABLED', 'true').lower() == 'true'
+    LLM_USAGE_FLUSH_SECONDS = int(os.environ.get('LLM_USAGE_FLUSH_SECONDS', 5))
+
+    # Report JSON through forced tool calls; invalid fields are re-requested on their own
+    LLM_STRUCTURED_OUTPUT_ENABLED = os.environ.get('LLM_STRUCTURED_OUTPUT_ENABLED', 'true').lower() == 'true'
+    LLM_FRAGMENT_RETRIES = int(os.environ.get('LLM_FRAGMENT_RETRIES', 1))
+
 
 class DevelopmentConfig(Config):
     """Development environment configuration"""
@@ -44,12 +152,22 @@ class TestingConfig(Config):
     """Testing environment configuration"""
     TESTING = True
     SQLALCHEMY_DATABASE_URI = 'sqlite:///:memory:'
+    SQLALCHEMY_ENGINE_OPTIONS = build_engine_options(SQLALCHEMY_DATABASE_URI)
+    SQLALCHEMY_BINDS = {}
+    EMAIL_DISPATCHER_ENABLED = False
+    ADMIN_ALERT_FLUSH_ENABLED = False
+    SHARED_REPORT_VIEW_FLUSH_ENABLED = False
+    TAB_EVENTS_WATCH_ENABLED = False
+    TAB_LEASE_REAPER_ENABLED = False
+    LLM_USAGE_FLUSH_ENABLED = False
 
 
 class ProductionConfig(Config):
     """Production environment configuration"""
     DEBUG = False
     # In production, all secrets must be provided via environment variables
+    FAST_BOOT = os.environ.get('FAST_BOOT', 'true').lower() == 'true'
+    API_DOCS_LAZY = os.environ.get('API_DOCS_LAZY', str(FAST_BOOT)).lower() == 'true'
 
 
 def get_config(env=None):
@@ -0,0 +1,126 @@
+"""
+Startup import profile and budget for gunicorn workers.
+Boots the app in a fresh interpreter under `python -X importtime` with the
+production settings (FAST_BOOT), then reports the cumulative import cost of
+the largest third-party packages and of each server module.
+
+    python -m server.import_profile [--top 15] [--runs 3] [--budget-ms 1000]
+
+Exits 1 (for CI) when a module registered in DEFERRED_MODULES
+(utils/lazy_imports.py) was loaded during boot, or when the total import time
+of the fastest run exceeds the budget (IMPORT_BUDGET_MS, default 1000 ms;
+set it from a baseline taken on the CI machine). DATABASE_URL defaults to an
+in-memory SQLite database, so no server is needed.
+"""
+import json
+import os
+import subprocess
+import sys
+
+DEFAULT_BUDGET_MS = 1000
+
+_PROBE = """
+import json
+from server.app import create_app
+from server.utils.lazy_imports import loaded_deferred_modules
+create_app()
+print(json.dumps(loaded_deferred_modules()))
+"""
+
+
+def parse_importtime(stderr):
+    """
+    Entries of `-X importtime` output in import order.
+
+    Returns:
+        list: (module, self_us, cumulative_us, depth)
+    """
+    entries = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        fields = line[len('import time:'):].split('|')
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            continue  # column header
+        name = fields[2].rstrip()
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        entries.append((name.strip(), int(fields[0]), int(fields[1]), depth))
+    return entries
+
+
+def run_probe():
+    """
+    Boot the app once under -X importtime.
+
+    Returns:
+        tuple: (importtime entries, deferred modules that were loaded)
+    """
+    env = dict(os.environ, FLASK_ENV='production')
+    env.setdefault('DATABASE_URL', 'sqlite://')
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', _PROBE],
+        env=env, capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        sys.stderr.write(result.stderr)
+        raise SystemExit(f"App boot failed (exit {result.returncode})")
+    return parse_importtime(result.stderr), json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def summarize(entries):
+    """Total, per-package and per-server-module cumulative import times (ms)"""
+    total = sum(cumulative for _, _, cumulative, depth in entries if depth == 0)
+    packages = {}
+    server_modules = {}
+    for name, self_us, cumulative, _ in entries:
+        if name == 'server' or name.startswith('server.'):
+            server_modules[name] = (self_us / 1000, cumulative / 1000)
+        elif '.' not in name:
+            # Top-level package: its cumulative time covers its submodules
+            packages[name] = cumulative / 1000
+    return total / 1000, packages, server_modules
+
+
+def print_profile(total_ms, packages, server_modules, top=15):
+    print(f"Startup imports: {total_ms:.1f} ms")
+    print(f"\nLargest packages (cumulative ms)")
+    for name, ms in sorted(packages.items(), key=lambda item: -item[1])[:top]:
+        print(f"  {name:<40}{ms:>9.1f}")
+    print(f"\nServer modules (self / cumulative ms)")
+    for name, (self_ms, cumulative_ms) in sorted(server_modules.items(), key=lambda item: -item[1][1])[:top]:
+        print(f"  {name:<40}{self_ms:>9.1f}{cumulative_ms:>9.1f}")
+
+
+if __name__ == '__main__':
+    from server.utils.lazy_imports import DEFERRED_MODULES
+
+    args = sys.argv[1:]
+
+    def option(name, default):
+        return type(default)(args[args.index(name) + 1]) if name in args else default
+
+    top = option('--top', 15)
+    runs = option('--runs', 3)
+    budget_ms = option('--budget-ms', float(os.environ.get('IMPORT_BUDGET_MS', DEFAULT_BUDGET_MS)))
+
+    # Import times are noisy; judge the fastest run
+    best = None
+    loaded = set()
+    for _ in range(runs):
+        entries, deferred = run_probe()
+        loaded.update(deferred)
+        summary = summarize(entries)
+        if best is None or summary[0] < best[0]:
+            best = summary
+    print_profile(*best, top=top)
+
+    failed = False
+    for name in sorted(loaded):
+        print(f"\nDeferred module loaded at startup: {name} ({DEFERRED_MODULES[name]})")
+        failed = True
+    if best[0] > budget_ms:
+        print(f"\nStartup imports took {best[0]:.1f} ms, over the {budget_ms:.0f} ms budget")
+        failed = True
+    if failed:
+        sys.exit(1)
+    print(f"\nWithin the {budget_ms:.0f} ms budget, no deferred modules loaded")
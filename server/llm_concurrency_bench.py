@@ -0,0 +1,200 @@
+"""
+Concurrency benchmark for the Claude-bound routes.
+Starts the fake Messages API (utils/fake_llm.py) with a fixed reply latency,
+then, for each gunicorn worker class, boots one worker against a scratch
+SQLite database and fires concurrent authenticated requests at an AI route.
+Reports throughput, latency percentiles and the peak number of model calls
+the worker held in flight at once.
+
+    python -m server.llm_concurrency_bench [--workers gthread,gevent] [--concurrency 200]
+        [--requests 1000] [--latency 1.0] [--endpoint invoke-llm|validate-idea|chat]
+
+gevent and psycogreen must be installed for the gevent run (requirements.txt).
+With gthread the peak is bounded by GUNICORN_THREADS; with gevent it should
+approach --concurrency.
+"""
+import argparse
+import http.client
+import json
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from server.config import Config
+from server.utils.fake_llm import FakeLLM
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+ENDPOINTS = {
+    'invoke-llm': ('/api/ai/invoke-llm', {'prompt': 'Name three risks of a food delivery startup.'}),
+    'validate-idea': ('/api/analyses/validate-idea', {'business_idea': 'Online grocery delivery in Damascus'}),
+    'chat': ('/api/ai/chat', {'message': 'How should I price my delivery app?'}),
+}
+
+# Background threads would compete with the measured requests
+_QUIET_ENV = {
+    'EMAIL_DISPATCHER_ENABLED': 'false',
+    'ADMIN_ALERT_FLUSH_ENABLED': 'false',
+    'SHARED_REPORT_VIEW_FLUSH_ENABLED': 'false',
+    'TAB_EVENTS_WATCH_ENABLED': 'false',
+    'TAB_LEASE_REAPER_ENABLED': 'false',
+}
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def prepare_database(database_url):
+    """Create the schema and a user with credits; returns a bearer token for it"""
+    from server.app import create_app
+    from server.models import db, User
+    from server.routes.auth import create_token
+
+    class BenchConfig(Config):
+        SQLALCHEMY_DATABASE_URI = database_url
+        EMAIL_DISPATCHER_ENABLED = False
+        ADMIN_ALERT_FLUSH_ENABLED = False
+        SHARED_REPORT_VIEW_FLUSH_ENABLED = False
+        TAB_EVENTS_WATCH_ENABLED = False
+        TAB_LEASE_REAPER_ENABLED = False
+        LLM_USAGE_FLUSH_ENABLED = False
+
+    app = create_app(BenchConfig)
+    with app.app_context():
+        user = User(email=f'bench-{uuid.uuid4().hex[:8]}@example.com', full_name='Bench', credits=1000,
+                    email_verified=True)
+        db.session.add(user)
+        db.session.commit()
+        return create_token(user.id, user.email)
+
+
+def start_gunicorn(worker_class, port, env, log_path):
+    """One gunicorn worker on `port`; its log goes to `log_path`"""
+    log = open(log_path, 'w')
+    process = subprocess.Popen(
+        [sys.executable, '-m', 'gunicorn', '-c', 'gunicorn.conf.py', '--workers', '1', '--graceful-timeout', '2',
+         '--bind', f'127.0.0.1:{port}', 'wsgi:app'],
+        cwd=ROOT, env=dict(env, GUNICORN_WORKER_CLASS=worker_class),
+        stdout=log, stderr=subprocess.STDOUT
+    )
+    log.close()
+    deadline = time.time() + 30
+    while time.time() < deadline:
+        if process.poll() is not None:
+            with open(log_path) as f:
+                raise SystemExit(f"gunicorn ({worker_class}) exited:\n{f.read()}")
+        try:
+            conn = http.client.HTTPConnection('127.0.0.1', port, timeout=2)
+            conn.request('GET', '/api/health')
+            conn.getresponse().read()
+            conn.close()
+            return process
+        except OSError:
+            time.sleep(0.2)
+    process.terminate()
+    raise SystemExit(f"gunicorn ({worker_class}) did not become ready")
+
+
+def _send(port, path, body, token):
+    started = time.perf_counter()
+    try:
+        conn = http.client.HTTPConnection('127.0.0.1', port, timeout=120)
+        conn.request('POST', path, body=body, headers={
+            'Content-Type': 'application/json', 'Authorization': f'Bearer {token}'
+        })
+        status = conn.getresponse()
+        status.read()
+        conn.close()
+        code = status.status
+    except OSError:
+        code = None
+    return code, time.perf_counter() - started
+
+
+def run_load(port, endpoint, token, concurrency, requests):
+    """Fire `requests` POSTs with `concurrency` clients; returns (seconds, [(status, latency)])"""
+    path, payload = ENDPOINTS[endpoint]
+    body = json.dumps(payload)
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        results = list(pool.map(lambda _: _send(port, path, body, token), range(requests)))
+    return time.perf_counter() - started, results
+
+
+def summarize(worker_class, elapsed, results, peak_in_flight):
+    latencies = sorted(latency for _, latency in results)
+
+    def percentile(p):
+        return latencies[min(len(latencies) - 1, int(len(latencies) * p))] * 1000
+
+    errors = sum(1 for status, _ in results if status != 200)
+    return {
+        'worker_class': worker_class,
+        'requests': len(results),
+        'errors': errors,
+        'rps': len(results) / elapsed,
+        'p50_ms': percentile(0.50),
+        'p95_ms': percentile(0.95),
+        'peak_in_flight': peak_in_flight,
+    }
+
+
+def print_report(rows, latency, concurrency):
+    print(f"\nFake LLM latency {latency * 1000:.0f} ms, {concurrency} concurrent clients, 1 worker")
+    print(f"  {'worker':<10}{'requests':>9}{'errors':>8}{'req/s':>9}{'p50 ms':>9}{'p95 ms':>9}{'in flight':>11}")
+    for row in rows:
+        print(f"  {row['worker_class']:<10}{row['requests']:>9}{row['errors']:>8}{row['rps']:>9.1f}"
+              f"{row['p50_ms']:>9.0f}{row['p95_ms']:>9.0f}{row['peak_in_flight']:>11}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Concurrent Claude-route benchmark against a fake LLM')
+    parser.add_argument('--workers', default='gthread,gevent', help='comma-separated gunicorn worker classes')
+    parser.add_argument('--concurrency', type=int, default=200)
+    parser.add_argument('--requests', type=int, default=1000)
+    parser.add_argument('--latency', type=float, default=1.0, help='fake LLM reply delay in seconds')
+    parser.add_argument('--endpoint', choices=sorted(ENDPOINTS), default='invoke-llm')
+    args = parser.parse_args()
+
+    fake = FakeLLM(latency=args.latency)
+    fake_server = fake.serve('127.0.0.1', 0)
+    threading.Thread(target=fake_server.serve_forever, daemon=True).start()
+
+    with tempfile.TemporaryDirectory() as scratch:
+        database_url = f"sqlite:///{os.path.join(scratch, 'bench.db')}"
+        token = prepare_database(database_url)
+        env = dict(os.environ, **_QUIET_ENV,
+                   FLASK_ENV='production', DATABASE_URL=database_url,
+                   AI_INTEGRATIONS_ANTHROPIC_API_KEY='local',
+                   AI_INTEGRATIONS_ANTHROPIC_BASE_URL=f'http://127.0.0.1:{fake_server.server_address[1]}')
+
+        rows = []
+        for worker_class in args.workers.split(','):
+            port = _free_port()
+            process = start_gunicorn(worker_class, port, env, os.path.join(scratch, f'{worker_class}.log'))
+            try:
+                # One warm-up call so the lazy SDK import is not measured
+                path, payload = ENDPOINTS[args.endpoint]
+                _send(port, path, json.dumps(payload), token)
+                fake.reset()
+                elapsed, results = run_load(port, args.endpoint, token, args.concurrency, args.requests)
+                rows.append(summarize(worker_class, elapsed, results, fake.stats()['peak_in_flight']))
+            finally:
+                process.terminate()
+                process.wait()
+
+    fake_server.shutdown()
+    print_report(rows, args.latency, args.concurrency)
+
+
+if __name__ == '__main__':
+    main()
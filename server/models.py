@@ -1,8 +1,12 @@
 from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import event, inspect
 from datetime import datetime
 import uuid
 
-db = SQLAlchemy()
+from server.utils.compressed_json import CompressedJSON
+from server.utils.db_routing import RoutingSession
+
+db = SQLAlchemy(session_options={'class_': RoutingSession})
 
 def generate_uuid():
     return str(uuid.uuid4())
@@ -54,6 +58,10 @@ class User(db.Model):
     
     role = db.relationship('Role', backref=db.backref('users', lazy='dynamic'))
     
+    __table_args__ = (
+        db.Index('ix_users_role', 'role_id'),
+    )
+    
     def to_dict(self):
         import logging
         total_referrals = 0
@@ -98,13 +106,26 @@ class User(db.Model):
             'email_verified': self.email_verified,
             'is_active': self.is_active,
             'ngo_status': self.ngo_status,
-            'last_login': self.last_login.isoformat() if self.last_login else None,
-            'created_at': self.created_at.isoformat() if self.created_at else None,
-            'updated_at': self.updated_at.isoformat() if self.updated_at else None,
+            'last_login': self.last_login,
+            'created_at': self.created_at,
+            'updated_at': self.updated_at,
             'total_referrals': total_referrals,
             'referral_credits_earned': referral_credits_earned
         }
 
+TAB_NAMES = ('overview', 'market', 'business', 'technical', 'financial', 'strategy')
+
+
+def _tab_property(tab_name):
+    """Backward-compatible `analysis.tab_<name>` attribute backed by analysis_tabs"""
+    def getter(self):
+        return self.get_tab(tab_name)
+
+    def setter(self, content):
+        self.set_tab(tab_name, content)
+
+    return property(getter, setter)
+
 class Analysis(db.Model):
     __tablename__ = 'analyses'
     
@@ -120,12 +141,12 @@ class Analysis(db.Model):
     report_language = db.Column(db.String(20), default='english')  # 'english' or 'arabic'
     pending_transaction_id = db.Column(db.String(36), db.ForeignKey('transactions.id'))
     last_error = db.Column(db.Text)  # Store error message on failure
-    report = db.Column(db.JSON)
+    report = db.Column(CompressedJSON)
     executive_summary = db.Column(db.Text)
-    market_analysis = db.Column(db.JSON)
-    financial_projections = db.Column(db.JSON)
-    risk_assessment = db.Column(db.JSON)
-    recommendations = db.Column(db.JSON)
+    market_analysis = db.Column(CompressedJSON)
+    financial_projections = db.Column(CompressedJSON)
+    risk_assessment = db.Column(CompressedJSON)
+    recommendations = db.Column(CompressedJSON)
     score = db.Column(db.Integer)
     user_rating = db.Column(db.Integer, nullable=True)
     user_feedback = db.Column(db.Text, nullable=True)
@@ -134,16 +155,22 @@ class Analysis(db.Model):
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
-    # Tab-specific data fields (generated separately via Claude API)
-    tab_overview = db.Column(db.JSON)
-    tab_market = db.Column(db.JSON)
-    tab_business = db.Column(db.JSON)
-    tab_technical = db.Column(db.JSON)
-    tab_financial = db.Column(db.JSON)
-    tab_strategy = db.Column(db.JSON)
+    # Legacy inline tab columns. Tab content now lives in `analysis_tabs` (see
+    # AnalysisTab and the tab_<name> properties below); schema migration 3 moves
+    # existing content over and these stay deferred so they are never loaded.
+    legacy_tab_overview = db.deferred(db.Column('tab_overview', db.JSON))
+    legacy_tab_market = db.deferred(db.Column('tab_market', db.JSON))
+    legacy_tab_business = db.deferred(db.Column('tab_business', db.JSON))
+    legacy_tab_technical = db.deferred(db.Column('tab_technical', db.JSON))
+    legacy_tab_financial = db.deferred(db.Column('tab_financial', db.JSON))
+    legacy_tab_strategy = db.deferred(db.Column('tab_strategy', db.JSON))
     
-    # Track when each tab started processing (for timeout detection)
-    tab_processing_started = db.Column(db.JSON, default=dict)
+    tab_overview = _tab_property('overview')
+    tab_market = _tab_property('market')
+    tab_business = _tab_property('business')
+    tab_technical = _tab_property('technical')
+    tab_financial = _tab_property('financial')
+    tab_strategy = _tab_property('strategy')
     
     # Regeneration context from AI assistant chat
     regeneration_context = db.Column(db.Text, nullable=True)
@@ -157,6 +184,79 @@ class Analysis(db.Model):
     pending_transaction = db.relationship('Transaction', foreign_keys=[pending_transaction_id])
     voucher = db.relationship('ProjectVoucher', backref=db.backref('linked_analyses', lazy='dynamic'))
     
+    # All tab versions (history, in-flight generations); rows are removed by ON DELETE CASCADE
+    tab_rows = db.relationship('AnalysisTab', back_populates='analysis', lazy='dynamic',
+                               cascade='all, delete-orphan', passive_deletes=True)
+    # Current content of each tab; use selectinload(Analysis.current_tabs) when listing
+    current_tabs = db.relationship(
+        'AnalysisTab',
+        primaryjoin='and_(Analysis.id == foreign(AnalysisTab.analysis_id), AnalysisTab.is_current == True)',
+        viewonly=True
+    )
+    # Generations in flight, for the tab_processing_started compatibility view
+    processing_tabs = db.relationship(
+        'AnalysisTab',
+        primaryjoin="and_(Analysis.id == foreign(AnalysisTab.analysis_id), AnalysisTab.status == 'processing')",
+        viewonly=True
+    )
+    
+    __table_args__ = (
+        db.Index('ix_analyses_user_created', 'user_email', 'created_at'),
+        # NGO voucher pages only ever list/count live reports
+        db.Index('ix_analyses_voucher_live', 'voucher_id', 'created_at',
+                 postgresql_where=db.text('is_deleted = false'),
+                 sqlite_where=db.text('is_deleted = 0')),
+    )
+    
+    def get_tab(self, tab_name):
+        """Current content of a tab, or None"""
+        overrides = self.__dict__.get('_tab_overrides')
+        if overrides and tab_name in overrides:
+            return overrides[tab_name]
+        for row in self.current_tabs:
+            if row.tab_name == tab_name:
+                return row.content
+        return None
+    
+    def set_tab(self, tab_name, content, **usage):
+        """
+        Write a tab as a new version row (content None clears it). The previous
+        current row is kept as history. `usage` may carry model/input_tokens/output_tokens.
+        """
+        previous = None
+        next_version = 1
+        if self.id is not None and inspect(self).persistent:
+            previous = self.tab_rows.filter_by(tab_name=tab_name, is_current=True).first()
+            latest = db.session.query(db.func.max(AnalysisTab.version)).filter(
+                AnalysisTab.analysis_id == self.id, AnalysisTab.tab_name == tab_name
+            ).scalar()
+            next_version = (latest or 0) + 1
+        if previous is not None and previous.content == content:
+            return
+        if previous is not None:
+            previous.is_current = False
+        row = None
+        if content is not None:
+            row = AnalysisTab(analysis=self, tab_name=tab_name, version=next_version, is_current=True,
+                              status='completed', content=content, completed_at=datetime.utcnow(), **usage)
+        elif previous is not None:
+            row = AnalysisTab(analysis=self, tab_name=tab_name, version=next_version, status='cleared')
+        # Backrefs on the dynamic collection do not cascade into the session
+        session = inspect(self).session
+        if row is not None and session is not None:
+            session.add(row)
+        self.__dict__.setdefault('_tab_overrides', {})[tab_name] = content
+    
+    @property
+    def tab_versions(self):
+        """{tab_name: version} of the current tab rows"""
+        return {row.tab_name: row.version for row in self.current_tabs}
+    
+    @property
+    def tab_processing_started(self):
+        """{tab_name: iso start time} of generations in flight (compatibility view)"""
+        return {row.tab_name: row.started_at.isoformat() for row in self.processing_tabs if row.started_at}
+    
     def to_dict(self):
         return {
             'id': self.id,
@@ -182,16 +282,17 @@ class Analysis(db.Model):
             'user_rating': self.user_rating,
             'user_feedback': self.user_feedback,
             'is_deleted': self.is_deleted,
-            'deleted_at': self.deleted_at.isoformat() if self.deleted_at else None,
-            'created_at': self.created_at.isoformat() if self.created_at else None,
-            'updated_at': self.updated_at.isoformat() if self.updated_at else None,
+            'deleted_at': self.deleted_at,
+            'created_at': self.created_at,
+            'updated_at': self.updated_at,
             'tab_overview': self.tab_overview,
             'tab_market': self.tab_market,
             'tab_business': self.tab_business,
             'tab_technical': self.tab_technical,
             'tab_financial': self.tab_financial,
             'tab_strategy': self.tab_strategy,
-            'tab_processing_started': self.tab_processing_started or {},
+            'tab_processing_started': self.tab_processing_started,
+            'tab_versions': self.tab_versions,
             'regeneration_context': self.regeneration_context,
             'voucher_id': self.voucher_id,
             'voucher': {
@@ -203,6 +304,85 @@ class Analysis(db.Model):
             'is_ngo_archived': self.is_ngo_archived
         }
 
+
+@event.listens_for(Analysis, 'expire')
+def _clear_tab_overrides(target, attrs):
+    target.__dict__.pop('_tab_overrides', None)
+
+
+@event.listens_for(Analysis, 'refresh')
+def _clear_tab_overrides_on_refresh(target, context, attrs):
+    target.__dict__.pop('_tab_overrides', None)
+
+class AnalysisTab(db.Model):
+    """
+    One version of one report tab. A generation inserts a 'processing' row
+    holding a lease; on success it becomes the current completed version.
+    At most one current row and one processing row exist per (analysis, tab).
+    """
+    __tablename__ = 'analysis_tabs'
+
+    id = db.Column(db.String(36), primary_key=True, default=generate_uuid)
+    analysis_id = db.Column(db.String(36), db.ForeignKey('analyses.id', ondelete='CASCADE'), nullable=False)
+    tab_name = db.Column(db.String(50), nullable=False)
+    version = db.Column(db.Integer, nullable=False, default=1)
+    is_current = db.Column(db.Boolean, nullable=False, default=False)
+    status = db.Column(db.String(20), nullable=False, default='pending')  # processing, completed, failed, cleared
+    content = db.Column(CompressedJSON)
+    error = db.Column(db.Text)
+
+    # Generation lease (status='processing'); renewed by heartbeats, reaped once expired
+    lease_owner = db.Column(db.String(64))
+    lease_expires_at = db.Column(db.DateTime)
+    heartbeat_at = db.Column(db.DateTime)
+    started_at = db.Column(db.DateTime)
+    completed_at = db.Column(db.DateTime)
+
+    # LLM usage for the generation that produced this version
+    model = db.Column(db.String(100))
+    input_tokens = db.Column(db.Integer)
+    output_tokens = db.Column(db.Integer)
+
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    analysis = db.relationship('Analysis', back_populates='tab_rows')
+
+    __table_args__ = (
+        db.UniqueConstraint('analysis_id', 'tab_name', 'version', name='uq_analysis_tabs_version'),
+        db.Index('ux_analysis_tabs_current', 'analysis_id', 'tab_name', unique=True,
+                 postgresql_where=db.text('is_current = true'),
+                 sqlite_where=db.text('is_current = 1')),
+        # Single-flight: a second concurrent generation of the same tab fails to insert
+        db.Index('ux_analysis_tabs_processing', 'analysis_id', 'tab_name', unique=True,
+                 postgresql_where=db.text("status = 'processing'"),
+                 sqlite_where=db.text("status = 'processing'")),
+        db.Index('ix_analysis_tabs_lease_expires', 'lease_expires_at',
+                 postgresql_where=db.text("status = 'processing'"),
+                 sqlite_where=db.text("status = 'processing'")),
+    )
+
+    def to_dict(self, include_content=True):
+        data = {
+            'id': self.id,
+            'analysis_id': self.analysis_id,
+            'tab_name': self.tab_name,
+            'version': self.version,
+            'is_current': self.is_current,
+            'status': self.status,
+            'error': self.error,
+            'started_at': self.started_at,
+            'completed_at': self.completed_at,
+            'model': self.model,
+            'input_tokens': self.input_tokens,
+            'output_tokens': self.output_tokens,
+            'created_at': self.created_at,
+            'updated_at': self.updated_at
+        }
+        if include_content:
+            data['content'] = self.content
+        return data
+
 class Transaction(db.Model):
     __tablename__ = 'transactions'
     
@@ -216,6 +396,10 @@ class Transaction(db.Model):
     status = db.Column(db.String(50), default='completed')
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     
+    __table_args__ = (
+        db.Index('ix_transactions_user_created', 'user_email', 'created_at'),
+    )
+    
     def to_dict(self):
         return {
             'id': self.id,
@@ -226,7 +410,7 @@ class Transaction(db.Model):
             'description': self.description,
             'reference_id': self.reference_id,
             'status': self.status,
-            'created_at': self.created_at.isoformat() if self.created_at else None
+            'created_at': self.created_at
         }
 
 class Currency(db.Model):
@@ -255,8 +439,8 @@ class Currency(db.Model):
             'is_default': self.is_default,
             'is_active': self.is_active,
             'sort_order': self.sort_order,
-            'created_at': self.created_at.isoformat() if self.created_at else None,
-            'updated_at': self.updated_at.isoformat() if self.updated_at else None
+            'created_at': self.created_at,
+            'updated_at': self.updated_at
         }
 
 class CreditPackage(db.Model):
@@ -291,7 +475,7 @@ class CreditPackage(db.Model):
             'features_ar': self.features_ar or [],
             'is_active': self.is_active,
             'is_popular': self.is_popular,
-            'created_at': self.created_at.isoformat() if self.created_at else None
+            'created_at': self.created_at
         }
 
 class Payment(db.Model):
@@ -315,6 +499,13 @@ class Payment(db.Model):
     approved_at = db.Column(db.DateTime)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     
+    __table_args__ = (
+        db.Index('ix_payments_user_created', 'user_email', 'created_at'),
+        db.Index('ix_payments_discount_approved', 'discount_code', 'created_at',
+                 postgresql_where=db.text("status = 'approved'"),
+                 sqlite_where=db.text("status = 'approved'")),
+    )
+    
     def to_dict(self):
         return {
             'id': self.id,
@@ -332,8 +523,8 @@ class Payment(db.Model):
             'status': self.status,
             'notes': self.notes,
             'approved_by': self.approved_by,
-            'approved_at': self.approved_at.isoformat() if self.approved_at else None,
-            'created_at': self.created_at.isoformat() if self.created_at else None
+            'approved_at': self.approved_at,
+            'created_at': self.created_at
         }
 
 class EmailTemplate(db.Model):
@@ -360,8 +551,41 @@ class EmailTemplate(db.Model):
             'body_en': self.body_en,
             'body_ar': self.body_ar,
             'is_active': self.is_active,
-            'created_at': self.created_at.isoformat() if self.created_at else None,
-            'updated_at': self.updated_at.isoformat() if self.updated_at else None
+            'created_at': self.created_at,
+            'updated_at': self.updated_at
+        }
+
+class EmailOutbox(db.Model):
+    __tablename__ = 'email_outbox'
+
+    id = db.Column(db.String(36), primary_key=True, default=generate_uuid)
+    to_email = db.Column(db.String(255), nullable=False)
+    to_name = db.Column(db.String(255))
+    subject = db.Column(db.String(500), nullable=False)
+    html_body = db.Column(db.Text, nullable=False)
+    status = db.Column(db.String(20), default='pending')  # pending, sending, sent, dead
+    attempts = db.Column(db.Integer, default=0)
+    last_error = db.Column(db.Text)
+    next_attempt_at = db.Column(db.DateTime, default=datetime.utcnow)
+    sent_at = db.Column(db.DateTime)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    __table_args__ = (
+        db.Index('ix_email_outbox_status_next_attempt', 'status', 'next_attempt_at'),
+    )
+
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'to_email': self.to_email,
+            'to_name': self.to_name,
+            'subject': self.subject,
+            'status': self.status,
+            'attempts': self.attempts,
+            'last_error': self.last_error,
+            'next_attempt_at': self.next_attempt_at,
+            'sent_at': self.sent_at,
+            'created_at': self.created_at
         }
 
 class PaymentMethod(db.Model):
@@ -393,7 +617,7 @@ class PaymentMethod(db.Model):
             'instructions':  self.instructions,
             'instructions_ar': self.instructions_ar,
             'is_active': self.is_active,
-            'created_at': self.created_at.isoformat() if self.created_at else None
+            'created_at': self.created_at
         }
         print("PaymentMethod to_dict:", js)
         return js
@@ -426,10 +650,10 @@ class DiscountCode(db.Model):
             'min_purchase_amount': self.min_purchase_amount or 0,
             'max_uses': self.max_uses,
             'used_count': self.used_count,
-            'valid_from': self.valid_from.isoformat() if self.valid_from else None,
-            'valid_until': self.valid_until.isoformat() if self.valid_until else None,
+            'valid_from': self.valid_from,
+            'valid_until': self.valid_until,
             'is_active': self.is_active,
-            'created_at': self.created_at.isoformat() if self.created_at else None
+            'created_at': self.created_at
         }
 
 class Role(db.Model):
@@ -449,7 +673,7 @@ class Role(db.Model):
             'permissions': self.permissions,
             'description': self.description,
             'is_active': self.is_active if self.is_active is not None else True,
-            'created_at': self.created_at.isoformat() if self.created_at else None
+            'created_at': self.created_at
         }
 
 class AuditLog(db.Model):
@@ -475,7 +699,7 @@ class AuditLog(db.Model):
             'meta_data': self.meta_data,
             'entity_id': self.entity_id,
             'entity_type': self.entity_type,
-            'created_at': self.created_at.isoformat() if self.created_at else None
+            'created_at': self.created_at
         }
 
 class ApiRequestLog(db.Model):
@@ -498,6 +722,10 @@ class ApiRequestLog(db.Model):
     error_message = db.Column(db.Text)
     created_at = db.Column(db.DateTime, default=datetime.utcnow, index=True)
     
+    __table_args__ = (
+        db.Index('ix_api_request_logs_user_created', 'user_email', 'created_at'),
+    )
+    
     def to_dict(self):
         return {
             'id': self.id,
@@ -515,9 +743,68 @@ class ApiRequestLog(db.Model):
             'user_agent': self.user_agent,
             'execution_time_ms': self.execution_time_ms,
             'error_message': self.error_message,
-            'created_at': self.created_at.isoformat() if self.created_at else None
+            'created_at': self.created_at
         }
 
+class LlmCall(db.Model):
+    """One Claude API call, written in batches by llm_usage_service"""
+    __tablename__ = 'llm_calls'
+
+    id = db.Column(db.String(36), primary_key=True, default=generate_uuid)
+    endpoint = db.Column(db.String(100), nullable=False)
+    tab_name = db.Column(db.String(50))
+    analysis_id = db.Column(db.String(36))
+    user_email = db.Column(db.String(255))
+    model = db.Column(db.String(100))
+    input_tokens = db.Column(db.Integer, default=0)
+    output_tokens = db.Column(db.Integer, default=0)
+    cache_read_tokens = db.Column(db.Integer, default=0)
+    cache_creation_tokens = db.Column(db.Integer, default=0)
+    stop_reason = db.Column(db.String(50))
+    latency_ms = db.Column(db.Float)
+    retries = db.Column(db.Integer, default=0)
+    status = db.Column(db.String(20), default='ok')  # ok, error
+    error = db.Column(db.String(500))
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, index=True)
+
+    __table_args__ = (
+        db.Index('ix_llm_calls_tab_created', 'tab_name', 'created_at'),
+        db.Index('ix_llm_calls_user_created', 'user_email', 'created_at'),
+    )
+
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'endpoint': self.endpoint,
+            'tab_name': self.tab_name,
+            'analysis_id': self.analysis_id,
+            'user_email': self.user_email,
+            'model': self.model,
+            'input_tokens': self.input_tokens,
+            'output_tokens': self.output_tokens,
+            'cache_read_tokens': self.cache_read_tokens,
+            'cache_creation_tokens': self.cache_creation_tokens,
+            'stop_reason': self.stop_reason,
+            'latency_ms': self.latency_ms,
+            'retries': self.retries,
+            'status': self.status,
+            'error': self.error,
+            'created_at': self.created_at
+        }
+
+class IdeaValidation(db.Model):
+    """A validation verdict from Claude, kept as training data for the local idea classifier"""
+    __tablename__ = 'idea_validations'
+
+    id = db.Column(db.String(36), primary_key=True, default=generate_uuid)
+    business_idea = db.Column(db.Text, nullable=False)
+    language = db.Column(db.String(10))
+    industry = db.Column(db.String(100))
+    valid = db.Column(db.Boolean, nullable=False)
+    industry_match = db.Column(db.Boolean)
+    confidence = db.Column(db.Float)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, index=True)
+
 class ActivityFeed(db.Model):
     __tablename__ = 'activity_feed'
     
@@ -530,6 +817,10 @@ class ActivityFeed(db.Model):
     is_public = db.Column(db.Boolean, default=False)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     
+    __table_args__ = (
+        db.Index('ix_activity_feed_user_created', 'user_email', 'created_at'),
+    )
+    
     def to_dict(self):
         return {
             'id': self.id,
@@ -539,7 +830,7 @@ class ActivityFeed(db.Model):
             'description': self.description,
             'metadata': self.metadata,
             'is_public': self.is_public,
-            'created_at': self.created_at.isoformat() if self.created_at else None
+            'created_at': self.created_at
         }
 
 class Notification(db.Model):
@@ -554,6 +845,14 @@ class Notification(db.Model):
     meta_data = db.Column(db.JSON)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     
+    __table_args__ = (
+        db.Index('ix_notifications_user_created', 'user_email', 'created_at'),
+        # Partial index keeps unread counts proportional to unread rows, not history
+        db.Index('ix_notifications_user_unread', 'user_email',
+                 postgresql_where=db.text('is_read = false'),
+                 sqlite_where=db.text('is_read = false')),
+    )
+    
     def to_dict(self):
         return {
             'id': self.id,
@@ -563,7 +862,7 @@ class Notification(db.Model):
             'message': self.message,
             'is_read': self.is_read,
             'meta_data': self.meta_data,
-            'created_at': self.created_at.isoformat() if self.created_at else None
+            'created_at': self.created_at
         }
 
 class ReportShare(db.Model):
@@ -578,6 +877,11 @@ class ReportShare(db.Model):
     access_count = db.Column(db.Integer, default=0)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     
+    __table_args__ = (
+        db.Index('ix_report_shares_created_by', 'created_by', 'created_at'),
+        db.Index('ix_report_shares_analysis', 'analysis_id'),
+    )
+    
     def to_dict(self):
         return {
             'id': self.id,
@@ -585,9 +889,9 @@ class ReportShare(db.Model):
             'share_token': self.share_token,
             'created_by': self.created_by,
             'is_active': self.is_active,
-            'expires_at': self.expires_at.isoformat() if self.expires_at else None,
+            'expires_at': self.expires_at,
             'access_count': self.access_count,
-            'created_at': self.created_at.isoformat() if self.created_at else None
+            'created_at': self.created_at
         }
 
 class ChatConversation(db.Model):
@@ -601,6 +905,10 @@ class ChatConversation(db.Model):
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
+    __table_args__ = (
+        db.Index('ix_chat_conversations_user_updated', 'user_email', 'updated_at'),
+    )
+    
     def to_dict(self):
         return {
             'id': self.id,
@@ -608,8 +916,8 @@ class ChatConversation(db.Model):
             'analysis_id': self.analysis_id,
             'title': self.title,
             'messages': self.messages,
-            'created_at': self.created_at.isoformat() if self.created_at else None,
-            'updated_at': self.updated_at.isoformat() if self.updated_at else None
+            'created_at': self.created_at,
+            'updated_at': self.updated_at
         }
 
 class Referral(db.Model):
@@ -623,6 +931,14 @@ class Referral(db.Model):
     rewarded_at = db.Column(db.DateTime)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     
+    __table_args__ = (
+        db.Index('ix_referrals_referrer_created', 'referrer_email', 'created_at'),
+        # Signup bonus lookup; only pending referrals are ever searched by referred user
+        db.Index('ix_referrals_referred_pending', 'referred_email',
+                 postgresql_where=db.text("status = 'pending'"),
+                 sqlite_where=db.text("status = 'pending'")),
+    )
+    
     def to_dict(self):
         return {
             'id': self.id,
@@ -630,8 +946,8 @@ class Referral(db.Model):
             'referred_email': self.referred_email,
             'referral_code': self.referral_code,
             'status': self.status,
-            'rewarded_at': self.rewarded_at.isoformat() if self.rewarded_at else None,
-            'created_at': self.created_at.isoformat() if self.created_at else None
+            'rewarded_at': self.rewarded_at,
+            'created_at': self.created_at
         }
 
 class SystemSettings(db.Model):
@@ -649,7 +965,7 @@ class SystemSettings(db.Model):
             'key': self.key,
             'value': self.value,
             'description': self.description,
-            'updated_at': self.updated_at.isoformat() if self.updated_at else None
+            'updated_at': self.updated_at
         }
 
 class Partner(db.Model):
@@ -675,7 +991,7 @@ class Partner(db.Model):
             'color': self.color,
             'display_order': self.display_order,
             'is_active': self.is_active,
-            'created_at': self.created_at.isoformat() if self.created_at else None
+            'created_at': self.created_at
         }
 
 class SeedVersion(db.Model):
@@ -691,7 +1007,7 @@ class SeedVersion(db.Model):
             'id': self.id,
             'seed_name': self.seed_name,
             'version': self.version,
-            'applied_at': self.applied_at.isoformat() if self.applied_at else None
+            'applied_at': self.applied_at
         }
 
 class ContactMessage(db.Model):
@@ -713,7 +1029,7 @@ class ContactMessage(db.Model):
             'message': self.message,
             'is_read': self.is_read,
             'email_sent': self.email_sent,
-            'created_at': self.created_at.isoformat() if self.created_at else None
+            'created_at': self.created_at
         }
 
 class SocialMedia(db.Model):
@@ -737,7 +1053,7 @@ class SocialMedia(db.Model):
             'hover_color': self.hover_color,
             'display_order': self.display_order,
             'is_active': self.is_active,
-            'created_at': self.created_at.isoformat() if self.created_at else None
+            'created_at': self.created_at
         }
 
 class NGORequest(db.Model):
@@ -761,6 +1077,10 @@ class NGORequest(db.Model):
     
     user = db.relationship('User', backref=db.backref('ngo_requests', lazy='dynamic'))
     
+    __table_args__ = (
+        db.Index('ix_ngo_requests_user_status', 'user_id', 'status'),
+    )
+    
     def to_dict(self):
         return {
             'id': self.id,
@@ -777,9 +1097,9 @@ class NGORequest(db.Model):
             'status': self.status,
             'admin_notes': self.admin_notes,
             'reviewed_by': self.reviewed_by,
-            'reviewed_at': self.reviewed_at.isoformat() if self.reviewed_at else None,
-            'created_at': self.created_at.isoformat() if self.created_at else None,
-            'updated_at': self.updated_at.isoformat() if self.updated_at else None
+            'reviewed_at': self.reviewed_at,
+            'created_at': self.created_at,
+            'updated_at': self.updated_at
         }
 
 def generate_voucher_code(org_name=None):
@@ -809,6 +1129,10 @@ class ProjectVoucher(db.Model):
     
     ngo_request = db.relationship('NGORequest', backref=db.backref('vouchers', lazy='dynamic'))
     
+    __table_args__ = (
+        db.Index('ix_project_vouchers_ngo_request', 'ngo_request_id', 'created_at'),
+    )
+    
     def to_dict(self):
         return {
             'id': self.id,
@@ -816,10 +1140,10 @@ class ProjectVoucher(db.Model):
             'code': self.code,
             'name': self.name,
             'description': self.description,
-            'activation_start': self.activation_start.isoformat() if self.activation_start else None,
-            'activation_end': self.activation_end.isoformat() if self.activation_end else None,
+            'activation_start': self.activation_start,
+            'activation_end': self.activation_end,
             'linked_ideas_count': self.linked_ideas_count,
             'is_active': self.is_active,
-            'created_at': self.created_at.isoformat() if self.created_at else None,
-            'updated_at': self.updated_at.isoformat() if self.updated_at else None
+            'created_at': self.created_at,
+            'updated_at': self.updated_at
         }
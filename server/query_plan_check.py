@@ -0,0 +1,264 @@
+"""
+Query-plan regression check for the hot per-user filters.
+Seeds a few thousand synthetic users with reports, transactions, notifications
+etc., refreshes planner statistics, and EXPLAINs each hot query in the shape
+the routes and services build it. Any sequential scan of a large table fails
+the check. Everything runs in one transaction that is rolled back, so the
+target database is left unchanged; still, point it at a scratch copy.
+
+    DATABASE_URL=postgresql://.../scratch python -m server.query_plan_check [--users 2000]
+
+Exits 1 when a query scans a table (for CI). SQLite (EXPLAIN QUERY PLAN) is
+supported for a quick local run. Full-table admin listings and whole-table
+counts are deliberately not listed: a sequential scan is the right plan there.
+"""
+import sys
+import uuid
+from datetime import datetime, timedelta
+
+from server.config import Config
+from server.services.duplicate_idea_service import user_ideas_query
+from server.models import (
+    db, User, Role, Analysis, AnalysisTab, Transaction, Payment, Notification, Referral,
+    ChatConversation, ActivityFeed, ReportShare, NGORequest, ProjectVoucher, ApiRequestLog, EmailOutbox
+)
+
+# Tables that grow with users/usage; scans of small lookup tables (roles, settings...) are fine
+LARGE_TABLES = {
+    'users', 'analyses', 'analysis_tabs', 'transactions', 'payments', 'notifications', 'referrals',
+    'chat_conversations', 'activity_feed', 'report_shares', 'ngo_requests', 'project_vouchers',
+    'api_request_logs', 'email_outbox',
+}
+
+
+class PlanCheckConfig(Config):
+    """Production settings with background threads off"""
+    EMAIL_DISPATCHER_ENABLED = False
+    ADMIN_ALERT_FLUSH_ENABLED = False
+    SHARED_REPORT_VIEW_FLUSH_ENABLED = False
+    TAB_EVENTS_WATCH_ENABLED = False
+    TAB_LEASE_REAPER_ENABLED = False
+    LLM_USAGE_FLUSH_ENABLED = False
+
+
+def _id():
+    return str(uuid.uuid4())
+
+
+def seed_plan_data(users=2000):
+    """Insert synthetic rows (not committed by the caller). Returns sample keys for the queries."""
+    now = datetime.utcnow()
+    role_id, admin_role_id = _id(), _id()
+    admin_role = f'plan-check-admin-{admin_role_id[:8]}'
+    db.session.execute(Role.__table__.insert(), [
+        {'id': role_id, 'name': f'plan-check-{role_id[:8]}'},
+        {'id': admin_role_id, 'name': admin_role},
+    ])
+
+    rows = {table: [] for table in (
+        User, Analysis, AnalysisTab, Transaction, Payment, Notification, Referral, ChatConversation,
+        ActivityFeed, ReportShare, NGORequest, ProjectVoucher, ApiRequestLog, EmailOutbox
+    )}
+    sample = {}
+
+    for i in range(users):
+        email = f'user{i}@plan-check.invalid'
+        user_id = _id()
+        created = now - timedelta(minutes=i)
+        rows[User].append({'id': user_id, 'email': email, 'role_id': admin_role_id if i % 500 == 0 else role_id,
+                           'referral_code': f'PC{i:08d}', 'created_at': created})
+
+        voucher_id = None
+        if i % 100 == 0:
+            request_id = _id()
+            voucher_id = _id()
+            rows[NGORequest].append({'id': request_id, 'user_id': user_id, 'organization_name': 'org',
+                                     'contact_name': 'n', 'contact_email': email, 'contact_phone': '0',
+                                     'status': 'approved', 'created_at': created})
+            rows[ProjectVoucher].append({'id': voucher_id, 'ngo_request_id': request_id, 'code': f'V{i:09d}',
+                                         'name': 'voucher', 'created_at': created})
+            sample.setdefault('ngo_user_id', user_id)
+            sample.setdefault('ngo_request_id', request_id)
+            sample.setdefault('voucher_id', voucher_id)
+
+        analysis_ids = []
+        for j in range(5):
+            analysis_id = _id()
+            analysis_ids.append(analysis_id)
+            rows[Analysis].append({'id': analysis_id, 'user_email': email, 'business_idea': 'idea',
+                                   'status': 'completed', 'report_type': 'premium' if j == 0 else 'free',
+                                   'is_deleted': j == 4, 'voucher_id': voucher_id if j == 1 else None,
+                                   'created_at': created - timedelta(days=j)})
+            for version, tab_name in enumerate(('overview', 'market', 'business'), start=1):
+                rows[AnalysisTab].append({'id': _id(), 'analysis_id': analysis_id, 'tab_name': tab_name,
+                                          'version': version, 'is_current': True, 'status': 'completed',
+                                          'created_at': created, 'updated_at': created})
+        for j in range(5):
+            rows[Transaction].append({'id': _id(), 'user_email': email, 'type': 'usage', 'credits': 1,
+                                      'created_at': created - timedelta(hours=j)})
+            rows[ActivityFeed].append({'id': _id(), 'user_email': email, 'action_type': 'login',
+                                       'created_at': created - timedelta(hours=j)})
+            rows[ApiRequestLog].append({'id': _id(), 'user_email': email, 'method': 'GET', 'path': '/api/x',
+                                        'created_at': created - timedelta(hours=j)})
+        for j in range(10):
+            rows[Notification].append({'id': _id(), 'user_email': email, 'title': 't', 'is_read': j > 1,
+                                       'created_at': created - timedelta(hours=j)})
+        for j in range(2):
+            rows[Payment].append({'id': _id(), 'user_email': email, 'amount_usd': 10.0, 'credits': 10,
+                                  'status': 'approved' if j else 'pending',
+                                  'discount_code': f'CODE{i % 50}' if j else None,
+                                  'created_at': created - timedelta(days=j)})
+            rows[ChatConversation].append({'id': _id(), 'user_email': email, 'analysis_id': analysis_ids[j],
+                                           'updated_at': created - timedelta(days=j)})
+        rows[ReportShare].append({'id': _id(), 'analysis_id': analysis_ids[0], 'share_token': _id(),
+                                  'created_by': email, 'is_active': True, 'created_at': created})
+        rows[Referral].append({'id': _id(), 'referrer_email': email,
+                               'referred_email': f'user{(i + 1) % users}@plan-check.invalid',
+                               'referral_code': f'PC{i:08d}', 'status': 'pending' if i % 10 == 0 else 'rewarded',
+                               'created_at': created})
+        rows[EmailOutbox].append({'id': _id(), 'to_email': email, 'subject': 's', 'html_body': 'b',
+                                  'status': 'sent', 'next_attempt_at': created, 'created_at': created})
+
+    # Parents before children, so the rows also load with foreign keys enforced
+    order = db.metadata.sorted_tables
+    for model, table_rows in sorted(rows.items(), key=lambda item: order.index(item[0].__table__)):
+        for start in range(0, len(table_rows), 1000):
+            db.session.execute(model.__table__.insert(), table_rows[start:start + 1000])
+
+    sample.update({
+        'user_email': f'user{users // 2}@plan-check.invalid',
+        'user_id': rows[User][users // 2]['id'],
+        'analysis_id': rows[Analysis][(users // 2) * 5]['id'],
+        'admin_role': admin_role,
+        'share_token': rows[ReportShare][users // 2]['share_token'],
+        'discount_code': 'CODE7',
+    })
+    return sample
+
+
+def hot_queries(s):
+    """(name, statement) for each hot filter, built like the routes/services build them"""
+    now = datetime.utcnow()
+    queries = [
+        ('user by email', User.query.filter_by(email=s['user_email'])),
+        ('admin emails', db.session.query(User.email).join(Role).filter(Role.name == s['admin_role'])),
+        ('my analyses', Analysis.query.filter_by(user_email=s['user_email']).order_by(Analysis.created_at.desc())),
+        ('premium report for referral bonus', Analysis.query.filter_by(
+            user_email=s['user_email'], report_type='premium', status='completed')),
+        ('recent ideas of user (duplicates)', user_ideas_query(s['user_email'], now - timedelta(days=90)).limit(200)),
+        ('voucher reports', Analysis.query.filter_by(voucher_id=s['voucher_id'], is_deleted=False)
+            .order_by(Analysis.created_at.desc())),
+        ('voucher report count', Analysis.query.filter_by(voucher_id=s['voucher_id'], is_deleted=False)
+            .with_entities(db.func.count(Analysis.id))),
+        ('voucher report of user', Analysis.query.filter_by(
+            voucher_id=s['voucher_id'], user_email=s['user_email'], is_deleted=False)),
+        ('tab status rows', db.session.query(AnalysisTab.tab_name, AnalysisTab.status)
+            .filter(AnalysisTab.analysis_id.in_([s['analysis_id']]))),
+        ('current tab', AnalysisTab.query.filter_by(analysis_id=s['analysis_id'], tab_name='overview', is_current=True)),
+        ('expired tab leases', db.session.query(AnalysisTab.id).filter(
+            AnalysisTab.status == 'processing', AnalysisTab.lease_expires_at < now)),
+        ('my transactions', Transaction.query.filter_by(user_email=s['user_email'])
+            .order_by(Transaction.created_at.desc())),
+        ('my payments', Payment.query.filter_by(user_email=s['user_email']).order_by(Payment.created_at.desc())),
+        ('discount code usage', Payment.query.filter_by(discount_code=s['discount_code'], status='approved')
+            .order_by(Payment.created_at.desc())),
+        ('my notifications', Notification.query.filter_by(user_email=s['user_email'])
+            .order_by(Notification.created_at.desc()).limit(100)),
+        ('unread count', db.session.query(db.func.count(Notification.id)).filter(
+            Notification.user_email == s['user_email'], Notification.is_read == False)),
+        ('my referrals', Referral.query.filter_by(referrer_email=s['user_email'])
+            .order_by(Referral.created_at.desc())),
+        ('pending referral of new user', Referral.query.filter_by(referred_email=s['user_email'], status='pending')),
+        ('my conversations', ChatConversation.query.filter_by(user_email=s['user_email'])
+            .order_by(ChatConversation.updated_at.desc())),
+        ('my activity', ActivityFeed.query.filter_by(user_email=s['user_email'])
+            .order_by(ActivityFeed.created_at.desc()).limit(50)),
+        ('my shares', ReportShare.query.filter_by(created_by=s['user_email']).order_by(ReportShare.created_at.desc())),
+        ('share by token', ReportShare.query.filter_by(share_token=s['share_token'], is_active=True)),
+        ('shares of analysis', ReportShare.query.filter_by(analysis_id=s['analysis_id'])),
+        ('approved NGO request', NGORequest.query.filter_by(user_id=s['ngo_user_id'], status='approved')),
+        ('NGO vouchers', ProjectVoucher.query.filter_by(ngo_request_id=s['ngo_request_id'])
+            .order_by(ProjectVoucher.created_at.desc())),
+        ('request logs of user', ApiRequestLog.query.filter(ApiRequestLog.user_email == s['user_email'])
+            .order_by(ApiRequestLog.created_at.desc()).limit(50)),
+        ('due outbox emails', EmailOutbox.query.filter(
+            EmailOutbox.status.in_(['pending', 'sending']), EmailOutbox.next_attempt_at <= now
+        ).order_by(EmailOutbox.next_attempt_at).limit(25)),
+    ]
+    return [(name, query.statement if hasattr(query, 'statement') else query) for name, query in queries]
+
+
+def _sql(statement):
+    return str(statement.compile(dialect=db.engine.dialect, compile_kwargs={'literal_binds': True}))
+
+
+def _postgres_scans(plan):
+    """Yield relation names of sequential scans in an EXPLAIN (FORMAT JSON) plan tree"""
+    if plan.get('Node Type') == 'Seq Scan':
+        yield plan.get('Relation Name')
+    for child in plan.get('Plans', ()):
+        yield from _postgres_scans(child)
+
+
+def find_table_scans(statement):
+    """
+    Returns:
+        tuple: (scanned large tables, plan text)
+    """
+    sql = _sql(statement)
+    if db.engine.dialect.name == 'postgresql':
+        plan = db.session.execute(db.text(f'EXPLAIN (FORMAT JSON) {sql}')).scalar()
+        if isinstance(plan, str):
+            from server.utils import json_provider
+            plan = json_provider.loads(plan)
+        scanned = set(_postgres_scans(plan[0]['Plan']))
+        text = db.session.execute(db.text(f'EXPLAIN {sql}')).scalars().all()
+        return scanned & LARGE_TABLES, '\n'.join(text)
+
+    details = [row[3] for row in db.session.execute(db.text(f'EXPLAIN QUERY PLAN {sql}')).all()]
+    scanned = {
+        detail.split()[1] for detail in details
+        if detail.startswith('SCAN ') and ' USING ' not in detail
+    }
+    return scanned & LARGE_TABLES, '\n'.join(details)
+
+
+def check_query_plans(users=2000):
+    """
+    Seed, analyze and EXPLAIN every hot query inside a rolled-back transaction.
+
+    Returns:
+        list: (name, scanned tables, plan) for each failing query
+    """
+    failures = []
+    try:
+        sample = seed_plan_data(users)
+        db.session.execute(db.text('ANALYZE'))
+        for name, statement in hot_queries(sample):
+            scanned, plan = find_table_scans(statement)
+            status = 'SCAN ' + ', '.join(sorted(scanned)) if scanned else 'ok'
+            print(f"{name:<36}{status}")
+            if scanned:
+                failures.append((name, scanned, plan))
+    finally:
+        db.session.rollback()
+    return failures
+
+
+if __name__ == '__main__':
+    from server.app import create_app
+
+    users = 2000
+    if '--users' in sys.argv:
+        users = int(sys.argv[sys.argv.index('--users') + 1])
+
+    app = create_app(PlanCheckConfig)
+    with app.app_context():
+        failures = check_query_plans(users)
+
+    for name, scanned, plan in failures:
+        print(f"\n{name}: sequential scan of {', '.join(sorted(scanned))}\n{plan}")
+    if failures:
+        print(f"\n{len(failures)} hot quer{'y' if len(failures) == 1 else 'ies'} scan a large table")
+        sys.exit(1)
+    print("\nAll hot queries use an index")
@@ -1,23 +1,24 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, current_app, request, jsonify
 from server.models import db, Analysis, Transaction, User, ChatConversation
 from server.routes.auth import get_current_user
 from server.services.settings_service import get_premium_report_cost
-from server.services.competitor_service import get_competitors_for_analysis, format_competitors_for_prompt
-import anthropic
-import os
+from server.utils.response import stream_json
+from server.utils.conditional import make_etag, is_not_modified, not_modified, with_etag
+from server.services.report_share_service import invalidate_share_snapshots
+from server.services.analysis_tab_service import get_current_tab, get_tab_status_rows, summarize_tabs, clear_tabs
+from server.services.tab_generation_service import generate_tab_single_flight
+from server.services.tab_events_service import (
+    PROCESSING_TIMEOUT_SECONDS, get_tab_states, wait_for_tab_change, publish_tab_change
+)
+from server.utils.lazy_imports import lazy_import
+from server.utils.llm_client import get_anthropic_client, create_message
+from server.utils.structured_output import create_structured, schema_from_prompt
 import json
 from datetime import datetime
 
-ai_bp = Blueprint('ai', __name__)
+competitor_service = lazy_import('server.services.competitor_service')
 
-def get_anthropic_client():
-    api_key = os.environ.get('AI_INTEGRATIONS_ANTHROPIC_API_KEY') or os.environ.get('ANTHROPIC_API_KEY')
-    base_url = os.environ.get('AI_INTEGRATIONS_ANTHROPIC_BASE_URL')
-    if not api_key:
-        return None
-    if base_url:
-        return anthropic.Anthropic(api_key=api_key, base_url=base_url)
-    return anthropic.Anthropic(api_key=api_key)
+ai_bp = Blueprint('ai', __name__)
 
 def require_auth(f):
     def wrapper(*args, **kwargs):
@@ -197,24 +198,13 @@ Provide a detailed analysis in JSON format with the following structure:
 
 Be specific, actionable, and realistic. Tailor all recommendations to a tech entrepreneur building a technology product. Return ONLY the JSON object, no additional text."""
 
-        response = client.messages.create(
+        report, response, _ = create_structured(
+            client, 'generate-analysis', prompt, schema_from_prompt(prompt), 'save_report',
+            analysis_id=analysis_id, user_email=user.email,
             model=DEFAULT_MODEL,
-            max_tokens=8192,
-            messages=[{"role": "user", "content": prompt}]
+            max_tokens=8192
         )
         
-        response_text = response.content[0].text
-        
-        try:
-            if "```json" in response_text:
-                response_text = response_text.split("```json")[1].split("```")[0]
-            elif "```" in response_text:
-                response_text = response_text.split("```")[1].split("```")[0]
-            
-            report = json.loads(response_text.strip())
-        except json.JSONDecodeError:
-            report = {"raw_response": response_text}
-        
         analysis.status = 'completed'
         analysis.report = report
         analysis.executive_summary = report.get('executive_summary', '')
@@ -395,7 +385,9 @@ Analysis Report: {json.dumps(analysis.report) if analysis.report else 'Not avail
 
 Be concise but helpful. If the user asks about their specific analysis, reference the data provided."""
 
-        response = client.messages.create(
+        response = create_message(
+            client, 'chat',
+            analysis_id=analysis_id, user_email=user.email,
             model=DEFAULT_MODEL,
             max_tokens=2048,
             system=system_prompt,
@@ -490,7 +482,7 @@ def invoke_llm(user):
         if system:
             kwargs["system"] = system
         
-        response = client.messages.create(**kwargs)
+        response = create_message(client, 'invoke-llm', user_email=user.email, **kwargs)
         
         return jsonify({
             'response': response.content[0].text
@@ -801,8 +793,12 @@ Respond in JSON format:
 }}"""
 }
 
+# Tool input schemas derived from the JSON examples above (written with doubled braces)
+TAB_SCHEMAS = {
+    name: schema_from_prompt(prompt.replace('{{', '{').replace('}}', '}'))
+    for name, prompt in TAB_PROMPTS.items()
+}
 
-PROCESSING_TIMEOUT_SECONDS = 600  # 10 minutes
 
 @ai_bp.route('/generate-tab-content', methods=['POST'])
 @require_auth
@@ -832,53 +828,21 @@ def generate_tab_content(user):
     if analysis.user_email != user.email:
         return jsonify({'error': 'Access denied'}), 403
     
-    tab_field = f'tab_{tab_name}'
-    existing_data = getattr(analysis, tab_field, None)
-    
     # Check if tab has cached data (unless force regenerate)
-    if existing_data and not force_regenerate:
-        return jsonify({'data': existing_data, 'cached': True})
-    
-    # Check if tab is currently being processed
-    processing_started = analysis.tab_processing_started or {}
-    if tab_name in processing_started and not force_regenerate:
-        started_at = processing_started.get(tab_name)
-        if started_at:
-            try:
-                started_time = datetime.fromisoformat(started_at)
-                elapsed_seconds = (datetime.utcnow() - started_time).total_seconds()
-                
-                if elapsed_seconds < PROCESSING_TIMEOUT_SECONDS:
-                    # Still processing within timeout
-                    return jsonify({
-                        'status': 'processing',
-                        'started_at': started_at,
-                        'elapsed_seconds': int(elapsed_seconds),
-                        'timeout_seconds': PROCESSING_TIMEOUT_SECONDS
-                    })
-                else:
-                    # Processing timed out - allow retry
-                    pass
-            except (ValueError, TypeError):
-                pass
+    if not force_regenerate:
+        current_tab = get_current_tab(analysis.id, tab_name)
+        if current_tab and current_tab.content:
+            return stream_json({'data': current_tab.content, 'cached': True})
     
-    try:
-        # Mark tab as processing
-        if not analysis.tab_processing_started:
-            analysis.tab_processing_started = {}
-        processing_data = dict(analysis.tab_processing_started or {})
-        processing_data[tab_name] = datetime.utcnow().isoformat()
-        analysis.tab_processing_started = processing_data
-        db.session.commit()
-        
+    def generate(lease):
         language_instruction = "Respond in Arabic language." if language == 'ar' else "Respond in English."
         
         competitor_section = ""
         if tab_name == 'market':
-            competitors = get_competitors_for_analysis(analysis.industry)
+            competitors = competitor_service.get_competitors_for_analysis(analysis.industry)
             if competitors:
                 limited_competitors = competitors[:15]
-                competitor_data_str = format_competitors_for_prompt(limited_competitors)
+                competitor_data_str = competitor_service.format_competitors_for_prompt(limited_competitors)
                 competitor_section = f"""
 
 === SYRIAN COMPETITOR DATA (USE THIS DATA) ===
@@ -912,108 +876,169 @@ Budget: {analysis.budget or 'Not specified'}
 
         max_tokens_for_tab = 12000 if tab_name == 'market' else 8192
         
-        response = client.messages.create(
+        # Invalid or cut-off fields are re-requested on their own, not the whole tab
+        tab_data, _, usage = create_structured(
+            client, 'generate-tab-content', prompt, TAB_SCHEMAS[tab_name], f'save_{tab_name}_tab',
+            tab_name=tab_name, analysis_id=analysis_id, user_email=user.email,
             model=DEFAULT_MODEL,
-            max_tokens=max_tokens_for_tab,
-            messages=[{"role": "user", "content": prompt}]
+            max_tokens=max_tokens_for_tab
         )
-        
-        response_text = response.content[0].text
-        
-        try:
-            if "```json" in response_text:
-                response_text = response_text.split("```json")[1].split("```")[0]
-            elif "```" in response_text:
-                response_text = response_text.split("```")[1].split("```")[0]
-            
-            tab_data = json.loads(response_text.strip())
-        except json.JSONDecodeError:
-            tab_data = {"raw_response": response_text}
-        
-        # Save tab data and clear processing flag
-        setattr(analysis, tab_field, tab_data)
-        processing_data = dict(analysis.tab_processing_started or {})
-        if tab_name in processing_data:
-            del processing_data[tab_name]
-        analysis.tab_processing_started = processing_data
-        db.session.commit()
-        
-        return jsonify({'data': tab_data, 'cached': False})
-        
+        return tab_data, {'model': DEFAULT_MODEL, **usage}
+    
+    # Only one request generates a tab at a time; others join it or report 'processing'.
+    # The generation row records processing/completed/failed, so there is no flag to clean up here.
+    try:
+        outcome = generate_tab_single_flight(analysis.id, tab_name, generate)
     except Exception as e:
-        # Clear processing flag on error
-        try:
-            processing_data = dict(analysis.tab_processing_started or {})
-            if tab_name in processing_data:
-                del processing_data[tab_name]
-            analysis.tab_processing_started = processing_data
-            db.session.commit()
-        except:
-            pass
         return jsonify({'error': str(e)}), 500
+    
+    if outcome['status'] == 'generated':
+        invalidate_share_snapshots(analysis_id=analysis_id)
+    
+    if outcome['status'] == 'processing':
+        started_at = outcome.get('started_at') or datetime.utcnow().isoformat()
+        elapsed_seconds = (datetime.utcnow() - datetime.fromisoformat(started_at)).total_seconds()
+        return jsonify({
+            'status': 'processing',
+            'started_at': started_at,
+            'elapsed_seconds': int(elapsed_seconds),
+            'timeout_seconds': PROCESSING_TIMEOUT_SECONDS
+        })
+    if outcome['status'] == 'failed':
+        return jsonify({'error': outcome['error']}), 500
+    
+    return stream_json({'data': outcome['data'], 'cached': outcome['status'] == 'joined'})
 
 
-@ai_bp.route('/check-tab-status', methods=['POST'])
+@ai_bp.route('/check-tab-status', methods=['GET', 'POST'])
 @require_auth
 def check_tab_status(user):
     """
-    Check the processing status of a specific tab
+    Check the processing status of a specific tab.
+    GET (query string) responses for completed tabs carry an ETag from the tab
+    version; a matching If-None-Match returns 304 without reading the tab content.
     """
-    data = request.get_json()
+    data = request.args if request.method == 'GET' else (request.get_json() or {})
     analysis_id = data.get('analysis_id')
     tab_name = data.get('tab_name')
     
     if not analysis_id or not tab_name:
         return jsonify({'error': 'analysis_id and tab_name are required'}), 400
     
-    analysis = Analysis.query.get(analysis_id)
-    if not analysis:
+    if tab_name not in TAB_PROMPTS:
+        return jsonify({'error': f'Invalid tab_name: {tab_name}'}), 400
+    
+    owner_email = db.session.query(Analysis.user_email).filter(Analysis.id == analysis_id).scalar()
+    if owner_email is None:
         return jsonify({'error': 'Analysis not found'}), 404
-    if analysis.user_email != user.email:
+    if owner_email != user.email:
         return jsonify({'error': 'Access denied'}), 403
     
-    tab_field = f'tab_{tab_name}'
-    existing_data = getattr(analysis, tab_field, None)
+    state = summarize_tabs(get_tab_status_rows([analysis_id]))[tab_name]
+    
+    if state['status'] == 'completed':
+        etag = make_etag('tab', analysis_id, tab_name, state['version'])
+        if is_not_modified(etag):
+            return not_modified(etag)
+        current_tab = get_current_tab(analysis_id, tab_name)
+        if current_tab and current_tab.content:
+            return with_etag(stream_json({
+                'status': 'completed',
+                'data': current_tab.content,
+                'cached': True
+            }), etag)
     
-    if existing_data:
+    if state['status'] in ('processing', 'stuck') and state.get('started_at'):
+        elapsed_seconds = (datetime.utcnow() - datetime.fromisoformat(state['started_at'])).total_seconds()
+        response = {
+            'status': state['status'],
+            'started_at': state['started_at'],
+            'elapsed_seconds': int(elapsed_seconds),
+            'timeout_seconds': PROCESSING_TIMEOUT_SECONDS
+        }
+        if state['status'] == 'stuck':
+            response['can_retry'] = True
+        return jsonify(response)
+    
+    if state['status'] == 'failed':
         return jsonify({
-            'status': 'completed',
-            'data': existing_data,
-            'cached': True
+            'status': 'failed',
+            'error': state.get('error'),
+            'can_generate': True
         })
     
-    processing_started = analysis.tab_processing_started or {}
-    if tab_name in processing_started:
-        started_at = processing_started.get(tab_name)
-        if started_at:
-            try:
-                started_time = datetime.fromisoformat(started_at)
-                elapsed_seconds = (datetime.utcnow() - started_time).total_seconds()
-                
-                if elapsed_seconds >= PROCESSING_TIMEOUT_SECONDS:
-                    return jsonify({
-                        'status': 'stuck',
-                        'started_at': started_at,
-                        'elapsed_seconds': int(elapsed_seconds),
-                        'timeout_seconds': PROCESSING_TIMEOUT_SECONDS,
-                        'can_retry': True
-                    })
-                else:
-                    return jsonify({
-                        'status': 'processing',
-                        'started_at': started_at,
-                        'elapsed_seconds': int(elapsed_seconds),
-                        'timeout_seconds': PROCESSING_TIMEOUT_SECONDS
-                    })
-            except (ValueError, TypeError):
-                pass
-    
     return jsonify({
         'status': 'pending',
         'can_generate': True
     })
 
 
+@ai_bp.route('/tab-events', methods=['GET'])
+@require_auth
+def tab_events(user):
+    """
+    Long-poll for tab status changes of an analysis
+    ---
+    tags:
+      - AI Analysis
+    security:
+      - Bearer: []
+    parameters:
+      - name: analysis_id
+        in: query
+        type: string
+        required: true
+      - name: cursor
+        in: query
+        type: string
+        required: false
+        description: Cursor from the previous response; omit to get the current state immediately
+      - name: timeout
+        in: query
+        type: integer
+        required: false
+        description: Seconds to wait for a change (default and maximum TAB_EVENTS_MAX_WAIT_SECONDS)
+    responses:
+      200:
+        description: Tab states ({tab_name - {status, version, started_at?, error?}}), the new cursor and whether anything changed
+      403:
+        description: Access denied
+      404:
+        description: Analysis not found
+    """
+    analysis_id = request.args.get('analysis_id')
+    cursor = request.args.get('cursor')
+    if not analysis_id:
+        return jsonify({'error': 'analysis_id is required'}), 400
+    
+    owner_email, states, current = get_tab_states(analysis_id)
+    if owner_email is None:
+        return jsonify({'error': 'Analysis not found'}), 404
+    if owner_email != user.email:
+        return jsonify({'error': 'Access denied'}), 403
+    
+    max_wait = current_app.config.get('TAB_EVENTS_MAX_WAIT_SECONDS', 25)
+    try:
+        timeout = min(max(int(request.args.get('timeout', max_wait)), 0), max_wait)
+    except ValueError:
+        timeout = max_wait
+    
+    if cursor and cursor == current:
+        states, current = wait_for_tab_change(analysis_id, cursor, timeout)
+        if states is None:
+            return jsonify({'error': 'Analysis not found'}), 404
+    
+    response = jsonify({
+        'analysis_id': analysis_id,
+        'cursor': current,
+        'changed': current != cursor,
+        'tabs': states,
+        'timeout_seconds': PROCESSING_TIMEOUT_SECONDS
+    })
+    response.headers['Cache-Control'] = 'no-store'
+    return response
+
+
 @ai_bp.route('/regenerate-report', methods=['POST'])
 @require_auth
 def regenerate_report(user):
@@ -1062,15 +1087,11 @@ def regenerate_report(user):
     
     analysis.regeneration_context = chat_context[:2000] if chat_context else None
     
-    analysis.tab_overview = None
-    analysis.tab_market = None
-    analysis.tab_business = None
-    analysis.tab_technical = None
-    analysis.tab_financial = None
-    analysis.tab_strategy = None
-    analysis.tab_processing_started = {}
+    clear_tabs(analysis.id)
     
     db.session.commit()
+    invalidate_share_snapshots(analysis_id=analysis.id)
+    publish_tab_change(analysis.id)
     
     return jsonify({
         'success': True,
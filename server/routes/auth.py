@@ -7,13 +7,15 @@ from server.services.email_service import (
     send_referral_bonus_email_to_referrer,
     send_password_reset_code_email
 )
-import bcrypt
+from server.utils.lazy_imports import lazy_import
 import jwt
 import os
 from datetime import datetime, timedelta
 import uuid
 import secrets
 
+bcrypt = lazy_import('bcrypt')
+
 auth_bp = Blueprint('auth', __name__)
 
 JWT_SECRET = os.environ.get('JWT_SECRET_KEY', 'jwt-secret-key-change-in-production')
@@ -146,9 +148,9 @@ def register():
             status='pending'
         )
         db.session.add(referral_record)
-        db.session.commit()
     
-    email_sent = send_verification_email(email, full_name, verification_token, lang)
+    email_sent = send_verification_email(email, full_name, verification_token, lang, commit=False)
+    db.session.commit()
     
     return jsonify({
         'message': get_message('auth.register_success', lang),
@@ -270,9 +272,9 @@ def resend_verification():
     
     user.verification_token = verification_token
     user.verification_token_expires = verification_expires
-    db.session.commit()
     
-    email_sent = send_verification_email(email, user.full_name, verification_token, lang)
+    email_sent = send_verification_email(email, user.full_name, verification_token, lang, commit=False)
+    db.session.commit()
     
     return jsonify({
         'message': get_message('auth.verification_sent', lang),
@@ -561,10 +563,10 @@ def forgot_password_request():
         user.password_reset_token = reset_token
         user.password_reset_token_expires = reset_expires
         user.password_reset_attempts = 0
-        db.session.commit()
         
         user_lang = user.language or lang
-        send_password_reset_code_email(email, user.full_name, reset_token, user_lang)
+        send_password_reset_code_email(email, user.full_name, reset_token, user_lang, commit=False)
+        db.session.commit()
     
     return jsonify({
         'message': get_message('auth.reset_code_sent', lang),
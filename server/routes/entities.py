@@ -1,14 +1,23 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, current_app, request, jsonify
 from server.models import (
     db, Analysis, Transaction, CreditPackage, Payment, EmailTemplate,
     PaymentMethod, DiscountCode, Role, AuditLog, ActivityFeed, 
-    Notification, ReportShare, ChatConversation, Referral, User, SystemSettings, Partner, Currency, NGORequest, ProjectVoucher
+    Notification, ReportShare, ChatConversation, Referral, User, SystemSettings, Partner, Currency, NGORequest, ProjectVoucher,
+    AnalysisTab
 )
 from server.routes.auth import get_current_user
+from server.services.email_template_service import invalidate_template_cache
+from server.utils.public_cache import cached_public, invalidate_public_cache
+from server.utils.response import stream_json
+from server.utils.conditional import make_etag, is_not_modified, not_modified, with_etag
+from server.utils.db_engine import pool_metrics, statement_timeout
+from server.utils.db_routing import REPLICA_BIND, read_replica
+from server.services.analysis_tab_service import get_tab_status_rows, get_tab_status_rows_for_query, tabs_fingerprint
+from sqlalchemy.orm import selectinload
+from server.services.report_share_service import invalidate_share_snapshots
 from datetime import datetime
 import uuid
 import os
-import requests
 
 entities_bp = Blueprint('entities', __name__)
 
@@ -50,6 +59,16 @@ def has_permission(user, permission):
         return False
     return permission in user.role.permissions
 
+def _analysis_list_etag(query, scope):
+    """ETag for an analyses list from the version columns of each row and its tabs, without any JSON"""
+    rows = query.with_entities(Analysis.id, Analysis.updated_at, Analysis.voucher_id).all()
+    return make_etag('analyses', scope, tabs_fingerprint(get_tab_status_rows_for_query(query)),
+                     *(f'{r.id}:{r.updated_at}:{r.voucher_id}' for r in rows))
+
+def _with_tabs(query):
+    """Load current and in-flight tab rows for all listed analyses in two queries"""
+    return query.options(selectinload(Analysis.current_tabs), selectinload(Analysis.processing_tabs))
+
 # Analysis endpoints
 @entities_bp.route('/analyses', methods=['GET'])
 @require_auth
@@ -71,11 +90,16 @@ def get_analyses(user):
       401:
         description: Not authenticated
     """
-    analyses = Analysis.query.filter_by(user_email=user.email).order_by(Analysis.created_at.desc()).all()
-    return jsonify([a.to_dict() for a in analyses])
+    query = Analysis.query.filter_by(user_email=user.email).order_by(Analysis.created_at.desc())
+    etag = _analysis_list_etag(query, user.email)
+    if is_not_modified(etag):
+        return not_modified(etag)
+    return with_etag(stream_json([a.to_dict() for a in _with_tabs(query).all()]), etag)
 
 @entities_bp.route('/analyses/all', methods=['GET'])
 @require_admin
+@statement_timeout(60000)
+@read_replica
 def get_all_analyses(user):
     """
     Get all analyses (admin only)
@@ -92,8 +116,11 @@ def get_all_analyses(user):
       403:
         description: Admin access required
     """
-    analyses = Analysis.query.filter(Analysis.is_deleted != True).order_by(Analysis.created_at.desc()).all()
-    return jsonify([a.to_dict() for a in analyses])
+    query = Analysis.query.filter(Analysis.is_deleted != True).order_by(Analysis.created_at.desc())
+    etag = _analysis_list_etag(query, 'all')
+    if is_not_modified(etag):
+        return not_modified(etag)
+    return with_etag(stream_json([a.to_dict() for a in _with_tabs(query).all()]), etag)
 
 @entities_bp.route('/analyses/<id>', methods=['GET'])
 @require_auth
@@ -121,12 +148,23 @@ def get_analysis(user, id):
       404:
         description: Analysis not found
     """
+    # Check ownership and the ETag from the version columns before loading the report JSON
+    row = db.session.query(
+        Analysis.user_email, Analysis.updated_at, Analysis.voucher_id
+    ).filter(Analysis.id == id).first()
+    if not row:
+        return jsonify({'error': 'Analysis not found'}), 404
+    if row.user_email != user.email and not is_admin(user):
+        return jsonify({'error': 'Access denied'}), 403
+
+    etag = make_etag('analysis', id, row.updated_at, row.voucher_id, tabs_fingerprint(get_tab_status_rows([id])))
+    if is_not_modified(etag):
+        return not_modified(etag)
+
     analysis = Analysis.query.get(id)
     if not analysis:
         return jsonify({'error': 'Analysis not found'}), 404
-    if analysis.user_email != user.email and not is_admin(user):
-        return jsonify({'error': 'Access denied'}), 403
-    return jsonify(analysis.to_dict())
+    return with_etag(stream_json(analysis.to_dict()), etag)
 
 @entities_bp.route('/analyses/generate', methods=['POST'])
 @require_auth
@@ -283,6 +321,12 @@ def generate_analysis_entry(user):
         except Exception as e:
             print(f"Failed to send NGO report linked email: {e}")
     
+    try:
+        from server.services.duplicate_idea_service import index_analysis
+        index_analysis(analysis)
+    except Exception as e:
+        print(f"[Duplicate Ideas] Indexing failed: {e}")
+    
     response_data = analysis.to_dict()
     response_data['expected_report_type'] = expected_report_type
     
@@ -349,6 +393,130 @@ def validate_idea_inline(user):
     return jsonify(validation), 200
 
 
+@entities_bp.route('/analyses/duplicates', methods=['POST'])
+@require_auth
+def find_duplicate_ideas(user):
+    """
+    Find the user's existing analyses of a near-identical idea
+    ---
+    tags:
+      - Analyses
+    security:
+      - Bearer: []
+    parameters:
+      - name: body
+        in: body
+        required: true
+        schema:
+          type: object
+          properties:
+            business_idea:
+              type: string
+            industry:
+              type: string
+            country:
+              type: string
+            report_language:
+              type: string
+    responses:
+      200:
+        description: Matching analyses with the tabs they have completed, most similar first
+        schema:
+          type: object
+          properties:
+            duplicates:
+              type: array
+              items:
+                type: object
+                properties:
+                  id:
+                    type: string
+                  business_idea:
+                    type: string
+                  similarity:
+                    type: number
+                  completed_tabs:
+                    type: array
+                    items:
+                      type: string
+    """
+    from server.services.duplicate_idea_service import find_duplicate_analyses
+    
+    data = request.get_json() or {}
+    business_idea = data.get('business_idea', '').strip()
+    if not business_idea:
+        return jsonify({'error': 'Business idea is required'}), 400
+    
+    duplicates = find_duplicate_analyses(
+        user.email, business_idea, data.get('industry', 'Other'), data.get('country', ''),
+        data.get('report_language', 'english').lower()
+    )
+    return jsonify({'duplicates': duplicates}), 200
+
+
+@entities_bp.route('/analyses/<id>/clone-tabs', methods=['POST'])
+@require_auth
+def clone_analysis_tabs(user, id):
+    """
+    Copy generated tabs from another analysis of the same user
+    ---
+    tags:
+      - Analyses
+    security:
+      - Bearer: []
+    parameters:
+      - name: id
+        in: path
+        type: string
+        required: true
+      - name: body
+        in: body
+        required: true
+        schema:
+          type: object
+          properties:
+            source_id:
+              type: string
+              description: Analysis to copy from (e.g. a match from /analyses/duplicates)
+            tabs:
+              type: array
+              items:
+                type: string
+              description: Tabs to copy (default all); tabs the analysis already has are skipped
+    responses:
+      200:
+        description: Names of the copied tabs
+      404:
+        description: Analysis not found
+    """
+    from server.models import TAB_NAMES
+    from server.services.analysis_tab_service import copy_current_tabs
+    from server.services.tab_events_service import publish_tab_change
+    
+    data = request.get_json() or {}
+    source_id = data.get('source_id')
+    tab_names = data.get('tabs') or list(TAB_NAMES)
+    if not source_id or source_id == id:
+        return jsonify({'error': 'source_id of another analysis is required'}), 400
+    if any(name not in TAB_NAMES for name in tab_names):
+        return jsonify({'error': f'tabs must be among: {", ".join(TAB_NAMES)}'}), 400
+    
+    owners = dict(db.session.query(Analysis.id, Analysis.user_email).filter(
+        Analysis.id.in_([id, source_id]), Analysis.is_deleted == False
+    ).all())
+    if id not in owners or source_id not in owners:
+        return jsonify({'error': 'Analysis not found'}), 404
+    if owners[id] != user.email or owners[source_id] != user.email:
+        return jsonify({'error': 'Access denied'}), 403
+    
+    cloned = copy_current_tabs(source_id, id, tab_names)
+    db.session.commit()
+    if cloned:
+        invalidate_share_snapshots(analysis_id=id)
+        publish_tab_change(id)
+    return jsonify({'cloned': cloned}), 200
+
+
 @entities_bp.route('/analyses/chain', methods=['POST'])
 @require_auth
 def chain_analysis(user):
@@ -387,8 +555,8 @@ def chain_analysis(user):
         description: AI service error
     """
     import threading
-    import anthropic
-    import json
+    from server.utils.llm_client import get_anthropic_client
+    from server.utils.structured_output import create_structured, schema_from_prompt
     from server.services.analysis_service import reserve_premium_credit, finalize_transaction
     
     data = request.get_json() or {}
@@ -411,13 +579,14 @@ def chain_analysis(user):
     report_type = reserve_result['report_type']
     pending_tx_id = reserve_result.get('transaction_id')
     
+    app = current_app._get_current_object()
+    
     def run_analysis():
         import logging
         import traceback
         logger = logging.getLogger('claude_llm')
         
-        from server.app import create_app
-        app = create_app()
+        # Reuse this app (and its engine pool) rather than building a new app per analysis
         with app.app_context():
             try:
                 logger.info(f"[Claude LLM] Starting analysis for ID: {analysis_id}")
@@ -448,10 +617,7 @@ def chain_analysis(user):
                     db.session.commit()
                     return
                 
-                if base_url:
-                    client = anthropic.Anthropic(api_key=api_key, base_url=base_url)
-                else:
-                    client = anthropic.Anthropic(api_key=api_key)
+                client = get_anthropic_client()
                 
                 business_idea = data.get('business_idea') or analysis_record.business_idea
                 industry = data.get('industry') or analysis_record.industry or 'Not specified'
@@ -567,37 +733,26 @@ Be specific, actionable, and realistic. Return ONLY the JSON object, no addition
                 print(f"[Claude LLM] Calling Claude API with model: claude-sonnet-4-5")
                 print(f"[Claude LLM] Business idea: {business_idea[:100]}...")
                 
-                response = client.messages.create(
+                report, response, _ = create_structured(
+                    client, 'chain-analysis', prompt, schema_from_prompt(prompt), 'save_report',
+                    analysis_id=analysis_id, user_email=analysis_record.user_email,
                     model="claude-sonnet-4-5",
-                    max_tokens=8192,
-                    messages=[{"role": "user", "content": prompt}]
+                    max_tokens=8192
                 )
                 
                 logger.info(f"[Claude LLM] Response received - Stop reason: {response.stop_reason}, Usage: input={response.usage.input_tokens}, output={response.usage.output_tokens}")
                 print(f"[Claude LLM] Response received - Stop reason: {response.stop_reason}")
-                print(f"[Claude LLM] Token usage - Input: {response.usage.input_tokens}, Output: {response.usage.output_tokens}")
                 
                 analysis_record.progress_percent = 80
                 db.session.commit()
                 
-                response_text = response.content[0].text
-                logger.info(f"[Claude LLM] Response text length: {len(response_text)} characters")
-                print(f"[Claude LLM] Response text length: {len(response_text)} characters")
-                
-                try:
-                    if "```json" in response_text:
-                        response_text = response_text.split("```json")[1].split("```")[0]
-                    elif "```" in response_text:
-                        response_text = response_text.split("```")[1].split("```")[0]
-                    
-                    report = json.loads(response_text.strip())
+                if 'raw_response' in report:
+                    logger.warning(f"[Claude LLM] No JSON in response. Using raw response.")
+                    print(f"[Claude LLM] WARNING: No JSON in response")
+                    print(f"[Claude LLM] Raw response preview: {report['raw_response'][:500]}...")
+                else:
                     logger.info(f"[Claude LLM] Successfully parsed JSON response")
                     print(f"[Claude LLM] Successfully parsed JSON response")
-                except json.JSONDecodeError as json_err:
-                    logger.warning(f"[Claude LLM] JSON parse error: {json_err}. Using raw response.")
-                    print(f"[Claude LLM] WARNING: JSON parse error: {json_err}")
-                    print(f"[Claude LLM] Raw response preview: {response_text[:500]}...")
-                    report = {"raw_response": response_text}
                 
                 analysis_record.status = 'completed'
                 analysis_record.report = report
@@ -757,6 +912,7 @@ def delete_contact_message(user, id):
 
 # Social Media endpoints
 @entities_bp.route('/social-media', methods=['GET'])
+@cached_public('social_media')
 def get_social_media():
     from server.models import SocialMedia
     links = SocialMedia.query.filter_by(is_active=True).order_by(SocialMedia.display_order).all()
@@ -791,6 +947,7 @@ def create_social_media(user):
     )
     db.session.add(link)
     db.session.commit()
+    invalidate_public_cache('social_media')
     return jsonify(link.to_dict()), 201
 
 @entities_bp.route('/social-media/<id>', methods=['PUT'])
@@ -819,6 +976,7 @@ def update_social_media(user, id):
         link.is_active = data['is_active']
     
     db.session.commit()
+    invalidate_public_cache('social_media')
     return jsonify(link.to_dict())
 
 @entities_bp.route('/social-media/<id>', methods=['DELETE'])
@@ -834,6 +992,7 @@ def delete_social_media(user, id):
     
     db.session.delete(link)
     db.session.commit()
+    invalidate_public_cache('social_media')
     return jsonify({'success': True})
 
 @entities_bp.route('/analyses', methods=['POST'])
@@ -885,6 +1044,13 @@ def create_analysis(user):
     db.session.commit()
     return jsonify(analysis.to_dict()), 201
 
+# Columns PUT /analyses/<id> may change. Everything else (ids, billing links,
+# generated content, relationships and tab properties) is ignored.
+EDITABLE_ANALYSIS_FIELDS = (
+    'business_idea', 'industry', 'target_market', 'location', 'budget', 'report_language',
+    'regeneration_context', 'user_rating', 'user_feedback', 'is_deleted', 'deleted_at'
+)
+
 @entities_bp.route('/analyses/<id>', methods=['PUT'])
 @require_auth
 def update_analysis(user, id):
@@ -897,11 +1063,15 @@ def update_analysis(user, id):
     data = request.get_json()
     old_rating = analysis.user_rating
     
-    for key, value in data.items():
-        if hasattr(analysis, key) and key not in ['id', 'user_email', 'created_at']:
-            setattr(analysis, key, value)
+    if data.get('deleted_at'):
+        # Clients send toISOString() (UTC); stored naive like the other timestamps
+        data['deleted_at'] = datetime.fromisoformat(data['deleted_at']).replace(tzinfo=None)
+    for key in EDITABLE_ANALYSIS_FIELDS:
+        if key in data:
+            setattr(analysis, key, data[key])
     
     db.session.commit()
+    invalidate_share_snapshots(analysis_id=analysis.id)
     
     if 'user_rating' in data and data['user_rating'] and old_rating != data['user_rating']:
         from server.services.admin_notification_service import notify_new_rating
@@ -927,8 +1097,12 @@ def delete_analysis(user, id):
     if analysis.user_email != user.email and not is_admin(user):
         return jsonify({'error': 'Access denied'}), 403
     
+    owner_email = analysis.user_email
     db.session.delete(analysis)
     db.session.commit()
+    invalidate_share_snapshots(analysis_id=id)
+    from server.services.duplicate_idea_service import forget_analysis
+    forget_analysis(owner_email, id)
     return jsonify({'message': 'Analysis deleted'})
 
 @entities_bp.route('/analyses/<id>/upgrade-premium', methods=['POST'])
@@ -974,6 +1148,7 @@ def upgrade_analysis_premium(user, id):
 # Transaction endpoints
 @entities_bp.route('/transactions', methods=['GET'])
 @require_auth
+@read_replica
 def get_transactions(user):
     """
     Get transaction history
@@ -1042,6 +1217,7 @@ def create_transaction(user):
 
 # Credit Package endpoints
 @entities_bp.route('/credit-packages', methods=['GET'])
+@cached_public('credit_packages')
 def get_credit_packages():
     """
     Get all available credit packages
@@ -1081,6 +1257,7 @@ def create_credit_package(user):
     )
     db.session.add(package)
     db.session.commit()
+    invalidate_public_cache('credit_packages')
     return jsonify(package.to_dict()), 201
 
 @entities_bp.route('/credit-packages/<id>', methods=['PUT'])
@@ -1096,6 +1273,7 @@ def update_credit_package(user, id):
             setattr(package, key, value)
     
     db.session.commit()
+    invalidate_public_cache('credit_packages')
     return jsonify(package.to_dict())
 
 @entities_bp.route('/credit-packages/<id>', methods=['DELETE'])
@@ -1107,10 +1285,13 @@ def delete_credit_package(user, id):
     
     db.session.delete(package)
     db.session.commit()
+    invalidate_public_cache('credit_packages')
     return jsonify({'message': 'Package deleted'})
 
 # Landing Page Stats endpoint (public)
 @entities_bp.route('/landing-stats', methods=['GET'])
+@cached_public('landing_stats', ttl=300)
+@read_replica
 def get_landing_stats():
     """
     Get public landing page statistics
@@ -1147,15 +1328,18 @@ def get_landing_stats():
             'syrian_apps_count': syrian_apps_count
         })
     except Exception as e:
-        # Return default values on error
-        return jsonify({
+        # Return default values on error (not cached)
+        response = jsonify({
             'users_count': 500,
             'reports_count': 2000,
             'syrian_apps_count': 150
         })
+        response.headers['Cache-Control'] = 'no-store'
+        return response
 
 # Partners endpoint (public)
 @entities_bp.route('/partners', methods=['GET'])
+@cached_public('partners')
 def get_partners():
     """
     Get all active partners for landing page
@@ -1187,7 +1371,9 @@ def get_partners():
         partners = Partner.query.filter_by(is_active=True).order_by(Partner.display_order).all()
         return jsonify([p.to_dict() for p in partners])
     except Exception as e:
-        return jsonify([])
+        response = jsonify([])
+        response.headers['Cache-Control'] = 'no-store'
+        return response
 
 @entities_bp.route('/partners', methods=['POST'])
 @require_admin
@@ -1204,6 +1390,7 @@ def create_partner(user):
     )
     db.session.add(partner)
     db.session.commit()
+    invalidate_public_cache('partners')
     return jsonify(partner.to_dict()), 201
 
 @entities_bp.route('/partners/<id>', methods=['PUT'])
@@ -1219,6 +1406,7 @@ def update_partner(user, id):
             setattr(partner, key, value)
     
     db.session.commit()
+    invalidate_public_cache('partners')
     return jsonify(partner.to_dict())
 
 @entities_bp.route('/partners/<id>', methods=['DELETE'])
@@ -1230,6 +1418,7 @@ def delete_partner(user, id):
     
     db.session.delete(partner)
     db.session.commit()
+    invalidate_public_cache('partners')
     return jsonify({'message': 'Partner deleted'})
 
 # System Settings endpoints
@@ -1259,11 +1448,13 @@ def update_system_setting(user, key):
         setting.value = data.get('value')
     
     db.session.commit()
+    invalidate_public_cache('landing_stats')
     return jsonify(setting.to_dict())
 
 # Payment endpoints
 @entities_bp.route('/payments', methods=['GET'])
 @require_auth
+@read_replica
 def get_payments(user):
     """
     Get all payments for current user (or all if admin)
@@ -1414,6 +1605,7 @@ def create_email_template(user):
     )
     db.session.add(template)
     db.session.commit()
+    invalidate_template_cache(template.template_key)
     return jsonify(template.to_dict()), 201
 
 @entities_bp.route('/email-templates/<id>', methods=['PUT'])
@@ -1423,12 +1615,15 @@ def update_email_template(user, id):
     if not template:
         return jsonify({'error': 'Template not found'}), 404
     
+    previous_key = template.template_key
     data = request.get_json()
     for key, value in data.items():
         if hasattr(template, key) and key not in ['id', 'created_at']:
             setattr(template, key, value)
     
     db.session.commit()
+    invalidate_template_cache(previous_key)
+    invalidate_template_cache(template.template_key)
     return jsonify(template.to_dict())
 
 @entities_bp.route('/send-templated-email', methods=['POST'])
@@ -1436,6 +1631,7 @@ def update_email_template(user, id):
 def send_templated_email(user):
     """Send an email using a template - uses centralized email service"""
     from server.services.email_service import send_email
+    from server.services.email_template_service import render_email_template
     
     data = request.get_json()
     user_email = data.get('userEmail')
@@ -1446,17 +1642,11 @@ def send_templated_email(user):
     if not user_email or not template_key:
         return jsonify({'error': 'Missing userEmail or templateKey'}), 400
     
-    template = EmailTemplate.query.filter_by(template_key=template_key).first()
-    if not template:
+    rendered = render_email_template(template_key, variables, language, active_only=False)
+    if not rendered:
         return jsonify({'error': 'Template not found'}), 404
     
-    is_arabic = language.lower() in ['arabic', 'ar']
-    subject = template.subject_ar if is_arabic else template.subject_en
-    body = template.body_ar if is_arabic else template.body_en
-    
-    for key, value in variables.items():
-        subject = subject.replace('{{' + key + '}}', str(value))
-        body = body.replace('{{' + key + '}}', str(value))
+    subject, body = rendered
     
     success, error = send_email(user_email, user_email, subject, body)
     
@@ -1467,6 +1657,7 @@ def send_templated_email(user):
 
 # Payment Method endpoints
 @entities_bp.route('/payment-methods', methods=['GET'])
+@cached_public('payment_methods')
 def get_payment_methods():
     methods = PaymentMethod.query.filter_by(is_active=True).all()
     return jsonify([m.to_dict() for m in methods])
@@ -1490,6 +1681,7 @@ def create_payment_method(user):
     )
     db.session.add(method)
     db.session.commit()
+    invalidate_public_cache('payment_methods')
     return jsonify(method.to_dict()), 201
 
 @entities_bp.route('/payment-methods/<id>', methods=['PUT'])
@@ -1532,6 +1724,7 @@ def update_payment_method(user, id):
         method.details = details
     
     db.session.commit()
+    invalidate_public_cache('payment_methods')
     return jsonify(method.to_dict())
 
 @entities_bp.route('/payment-methods/<id>', methods=['DELETE'])
@@ -1547,6 +1740,7 @@ def delete_payment_method(user, id):
     
     db.session.delete(method)
     db.session.commit()
+    invalidate_public_cache('payment_methods')
     return jsonify({'success': True, 'message': 'Payment method deleted successfully.'})
 
 # Discount Code endpoints
@@ -1664,7 +1858,7 @@ def get_discount_code_users(user, id):
             'discount_amount': payment.discount_amount,
             'credits': payment.credits,
             'status': payment.status,
-            'created_at': payment.created_at.isoformat() if payment.created_at else None
+            'created_at': payment.created_at
         })
     
     return jsonify(users_data)
@@ -1755,6 +1949,7 @@ def create_audit_log(user):
 # API Request Logs endpoints
 @entities_bp.route('/api-request-logs', methods=['GET'])
 @require_admin
+@read_replica
 def get_api_request_logs(user):
     """
     Get API request logs (admin only)
@@ -1820,6 +2015,7 @@ def get_api_request_logs(user):
 
 @entities_bp.route('/api-request-logs/<log_id>', methods=['GET'])
 @require_admin
+@read_replica
 def get_api_request_log(user, log_id):
     """
     Get a specific API request log (admin only)
@@ -1841,6 +2037,210 @@ def get_api_request_log(user, log_id):
         return jsonify({'error': 'Log not found'}), 404
     return jsonify(log.to_dict())
 
+# LLM usage ledger endpoints
+@entities_bp.route('/llm-usage/summary', methods=['GET'])
+@require_admin
+@read_replica
+def get_llm_usage_summary(user):
+    """
+    Claude call latency and token usage per tab, endpoint, day, user or model (admin only)
+    ---
+    tags:
+      - Audit
+    security:
+      - Bearer: []
+    parameters:
+      - name: group_by
+        in: query
+        type: string
+        enum: [tab, endpoint, day, user, model]
+        default: tab
+      - name: days
+        in: query
+        type: integer
+        default: 7
+      - name: user_email
+        in: query
+        type: string
+      - name: endpoint
+        in: query
+        type: string
+    responses:
+      200:
+        description: Calls, errors, retries, token totals and avg/p50/p95 latency per group
+      400:
+        description: Invalid group_by
+    """
+    from server.services.llm_usage_service import GROUPINGS, usage_summary
+
+    group_by = request.args.get('group_by', 'tab')
+    if group_by not in GROUPINGS:
+        return jsonify({'error': f'group_by must be one of: {", ".join(GROUPINGS)}'}), 400
+    days = min(max(request.args.get('days', 7, type=int), 1), 366)
+
+    return jsonify({
+        'group_by': group_by,
+        'days': days,
+        'data': usage_summary(
+            group_by, days,
+            user_email=request.args.get('user_email'),
+            endpoint=request.args.get('endpoint')
+        )
+    })
+
+@entities_bp.route('/llm-usage/calls', methods=['GET'])
+@require_admin
+@read_replica
+def get_llm_calls(user):
+    """
+    Recorded Claude calls, newest first (admin only)
+    ---
+    tags:
+      - Audit
+    security:
+      - Bearer: []
+    parameters:
+      - name: page
+        in: query
+        type: integer
+        default: 1
+      - name: per_page
+        in: query
+        type: integer
+        default: 50
+      - name: endpoint
+        in: query
+        type: string
+      - name: tab_name
+        in: query
+        type: string
+      - name: user_email
+        in: query
+        type: string
+      - name: status
+        in: query
+        type: string
+        enum: [ok, error]
+    responses:
+      200:
+        description: Paginated list of Claude calls
+    """
+    from server.models import LlmCall
+
+    page = request.args.get('page', 1, type=int)
+    per_page = min(request.args.get('per_page', 50, type=int), 100)
+
+    query = LlmCall.query
+    for field in ('endpoint', 'tab_name', 'user_email', 'status'):
+        if request.args.get(field):
+            query = query.filter(getattr(LlmCall, field) == request.args.get(field))
+
+    total = query.count()
+    calls = query.order_by(LlmCall.created_at.desc()).offset((page - 1) * per_page).limit(per_page).all()
+
+    return jsonify({
+        'data': [c.to_dict() for c in calls],
+        'pagination': {
+            'page': page,
+            'per_page': per_page,
+            'total': total,
+            'total_pages': (total + per_page - 1) // per_page
+        }
+    })
+
+# Email Outbox endpoints
+@entities_bp.route('/email-outbox', methods=['GET'])
+@require_admin
+@read_replica
+def get_email_outbox(user):
+    """
+    List queued, sent and dead-lettered emails (admin only)
+    ---
+    tags:
+      - Email
+    security:
+      - Bearer: []
+    parameters:
+      - name: status
+        in: query
+        type: string
+        enum: [pending, sending, sent, dead]
+      - name: page
+        in: query
+        type: integer
+        default: 1
+      - name: per_page
+        in: query
+        type: integer
+        default: 50
+    responses:
+      200:
+        description: Paginated list of outbox emails
+    """
+    from server.models import EmailOutbox
+    
+    page = request.args.get('page', 1, type=int)
+    per_page = min(request.args.get('per_page', 50, type=int), 100)
+    
+    query = EmailOutbox.query
+    if request.args.get('status'):
+        query = query.filter(EmailOutbox.status == request.args.get('status'))
+    
+    total = query.count()
+    emails = query.order_by(EmailOutbox.created_at.desc()).offset((page - 1) * per_page).limit(per_page).all()
+    
+    return jsonify({
+        'data': [e.to_dict() for e in emails],
+        'pagination': {
+            'page': page,
+            'per_page': per_page,
+            'total': total,
+            'total_pages': (total + per_page - 1) // per_page
+        }
+    })
+
+@entities_bp.route('/email-outbox/<email_id>/retry', methods=['POST'])
+@require_admin
+def retry_outbox_email(user, email_id):
+    """
+    Requeue a dead-lettered email for immediate delivery (admin only)
+    ---
+    tags:
+      - Email
+    security:
+      - Bearer: []
+    responses:
+      200:
+        description: Email requeued
+      404:
+        description: Email not found or already sent
+    """
+    from server.services.email_outbox_service import retry_email
+    
+    email = retry_email(email_id)
+    if not email:
+        return jsonify({'error': 'Email not found or already sent'}), 404
+    return jsonify(email.to_dict())
+
+@entities_bp.route('/db-pool-metrics', methods=['GET'])
+@require_admin
+def get_db_pool_metrics(user):
+    """
+    Connection pool usage and checkout wait times of the serving worker (admin only)
+    ---
+    tags:
+      - Admin
+    security:
+      - Bearer: []
+    responses:
+      200:
+        description: Pool size, checked-out connections, saturation and wait percentiles for this process
+    """
+    metrics = pool_metrics(db.engine)
+    if REPLICA_BIND in db.engines:
+        metrics['replica'] = pool_metrics(db.engines[REPLICA_BIND])
+    return jsonify(metrics)
+
 # Activity Feed endpoints
 @entities_bp.route('/activity-feed', methods=['GET'])
 @require_auth
@@ -1869,7 +2269,66 @@ def create_activity(user):
 @require_auth
 def get_notifications(user):
     """
-    Get all notifications for current user
+    Get notifications for current user, newest first
+    ---
+    tags:
+      - Notifications
+    security:
+      - Bearer: []
+    parameters:
+      - name: page
+        in: query
+        type: integer
+        description: When set, returns a paginated object instead of a plain list
+      - name: per_page
+        in: query
+        type: integer
+        default: 20
+      - name: limit
+        in: query
+        type: integer
+        default: 100
+        description: Maximum items when not paginating
+      - name: unread_only
+        in: query
+        type: boolean
+        default: false
+    responses:
+      200:
+        description: List of notifications (or paginated object when page is set)
+      401:
+        description: Not authenticated
+    """
+    query = Notification.query.filter_by(user_email=user.email)
+    if request.args.get('unread_only', 'false').lower() == 'true':
+        query = query.filter(Notification.is_read == False)
+    query = query.order_by(Notification.created_at.desc())
+    
+    page = request.args.get('page', type=int)
+    if not page:
+        limit = min(max(request.args.get('limit', 100, type=int), 1), 200)
+        return jsonify([n.to_dict() for n in query.limit(limit).all()])
+    
+    per_page = min(max(request.args.get('per_page', 20, type=int), 1), 100)
+    page = max(page, 1)
+    total = query.order_by(None).count()
+    notifications = query.offset((page - 1) * per_page).limit(per_page).all()
+    
+    return jsonify({
+        'data': [n.to_dict() for n in notifications],
+        'pagination': {
+            'page': page,
+            'per_page': per_page,
+            'total': total,
+            'total_pages': (total + per_page - 1) // per_page
+        }
+    })
+
+@entities_bp.route('/notifications/unread-count', methods=['GET'])
+@require_auth
+def get_unread_notification_count(user):
+    """
+    Get the number of unread notifications for current user
     ---
     tags:
       - Notifications
@@ -1877,16 +2336,17 @@ def get_notifications(user):
       - Bearer: []
     responses:
       200:
-        description: List of notifications
+        description: Unread notification count
         schema:
-          type: array
-          items:
-            type: object
+          type: object
+          properties:
+            unread_count:
+              type: integer
       401:
         description: Not authenticated
     """
-    notifications = Notification.query.filter_by(user_email=user.email).order_by(Notification.created_at.desc()).all()
-    return jsonify([n.to_dict() for n in notifications])
+    from server.services.user_notification_service import get_unread_count
+    return jsonify({'unread_count': get_unread_count(user.email)})
 
 @entities_bp.route('/notifications', methods=['POST'])
 @require_auth
@@ -1986,6 +2446,7 @@ def update_report_share(user, share_id):
         share.expires_at = datetime.fromisoformat(data['expires_at']) if data['expires_at'] else None
     
     db.session.commit()
+    invalidate_share_snapshots(token=share.share_token)
     return jsonify(share.to_dict())
 
 @entities_bp.route('/report-shares/<share_id>', methods=['DELETE'])
@@ -1999,39 +2460,19 @@ def delete_report_share(user, share_id):
     
     share.is_active = False
     db.session.commit()
+    invalidate_share_snapshots(token=share.share_token)
     return jsonify({'success': True})
 
 @entities_bp.route('/report-shares/public/<token>', methods=['GET'])
 def get_shared_report(token):
-    share = ReportShare.query.filter_by(share_token=token, is_active=True).first()
-    if not share:
-        return jsonify({'error': 'Share not found'}), 404
+    from server.services.report_share_service import get_share_snapshot, record_share_view
     
-    if share.expires_at and datetime.utcnow() > share.expires_at:
-        return jsonify({'error': 'Share link has expired'}), 403
+    snapshot, error, status_code = get_share_snapshot(token)
+    if not snapshot:
+        return jsonify({'error': error}), status_code
     
-    analysis = Analysis.query.get(share.analysis_id)
-    if not analysis:
-        return jsonify({'error': 'Analysis not found'}), 404
-    
-    share.access_count = (share.access_count or 0) + 1
-    db.session.commit()
-    
-    from server.services.user_notification_service import notify_shared_report_opened
-    try:
-        notify_shared_report_opened(
-            share.created_by,
-            share.id,
-            analysis.business_idea or 'Unknown',
-            share.access_count
-        )
-    except Exception as notify_error:
-        print(f"User notification error: {notify_error}")
-    
-    return jsonify({
-        'share': share.to_dict(),
-        'analysis': analysis.to_dict()
-    })
+    record_share_view(snapshot)
+    return current_app.response_class(snapshot.response_body(), mimetype='application/json')
 
 # Chat Conversation endpoints
 @entities_bp.route('/chat-conversations', methods=['GET'])
@@ -2131,6 +2572,7 @@ def apply_referral(user):
 # Admin user management
 @entities_bp.route('/users', methods=['GET'])
 @require_admin
+@read_replica
 def get_users(user):
     """
     Get all users (admin only)
@@ -2152,6 +2594,7 @@ def get_users(user):
 
 @entities_bp.route('/users/import', methods=['POST'])
 @require_admin
+@statement_timeout(120000)
 def import_users_from_excel(user):
     """
     Import users from Excel file (admin only)
@@ -2264,6 +2707,7 @@ def get_import_template_info(user):
 
 @entities_bp.route('/reports/import', methods=['POST'])
 @require_admin
+@statement_timeout(120000)
 def import_reports_from_excel(user):
     """
     Import reports from Excel file (admin only)
@@ -2550,6 +2994,7 @@ def update_settings(user):
             setting = SystemSettings(key=key, value=str(value))
             db.session.add(setting)
     db.session.commit()
+    invalidate_public_cache('landing_stats')
     settings = SystemSettings.query.all()
     result = {'price_per_credit': '1.99'}
     for s in settings:
@@ -2558,6 +3003,7 @@ def update_settings(user):
 
 # Currency endpoints
 @entities_bp.route('/currencies', methods=['GET'])
+@cached_public('currencies', vary_on_args=('active_only',))
 def get_currencies():
     """
     Get all active currencies
@@ -2631,6 +3077,7 @@ def create_currency(user):
     )
     db.session.add(currency)
     db.session.commit()
+    invalidate_public_cache('currencies')
     return jsonify(currency.to_dict()), 201
 
 @entities_bp.route('/currencies/<id>', methods=['PUT'])
@@ -2676,6 +3123,7 @@ def update_currency(user, id):
         currency.sort_order = data['sort_order']
     
     db.session.commit()
+    invalidate_public_cache('currencies')
     return jsonify(currency.to_dict())
 
 @entities_bp.route('/currencies/<id>', methods=['DELETE'])
@@ -2701,6 +3149,7 @@ def delete_currency(user, id):
     
     db.session.delete(currency)
     db.session.commit()
+    invalidate_public_cache('currencies')
     return jsonify({'success': True})
 
 @entities_bp.route('/ngo/request', methods=['POST'])
@@ -2757,6 +3206,7 @@ def get_my_ngo_request(user):
 
 @entities_bp.route('/ngo/requests', methods=['GET'])
 @require_admin
+@read_replica
 def get_all_ngo_requests(user):
     if not has_permission(user, 'view_ngo_requests') and not has_permission(user, 'manage_ngo_requests'):
         return jsonify({'error': 'Permission denied'}), 403
@@ -2817,6 +3267,7 @@ def update_ngo_request(user, id):
 
 @entities_bp.route('/ngo/stats', methods=['GET'])
 @require_auth
+@read_replica
 def get_ngo_stats(user):
     if user.ngo_status != 'approved':
         return jsonify({'error': 'NGO access required'}), 403
@@ -2848,6 +3299,7 @@ def get_ngo_stats(user):
 
 @entities_bp.route('/ngo/vouchers', methods=['GET'])
 @require_auth
+@read_replica
 def get_ngo_vouchers(user):
     if user.ngo_status != 'approved':
         return jsonify({'error': 'NGO access required'}), 403
@@ -2866,6 +3318,7 @@ def get_ngo_vouchers(user):
 
 @entities_bp.route('/ngo/vouchers/<voucher_id>/analyses', methods=['GET'])
 @require_auth
+@read_replica
 def get_voucher_analyses(user, voucher_id):
     if user.ngo_status != 'approved':
         return jsonify({'error': 'NGO access required'}), 403
@@ -2882,7 +3335,9 @@ def get_voucher_analyses(user, voucher_id):
     query = Analysis.query.filter_by(voucher_id=voucher_id, is_deleted=False)
     if not show_archived:
         query = query.filter_by(is_ngo_archived=False)
-    analyses = query.order_by(Analysis.created_at.desc()).all()
+    analyses = query.options(
+        selectinload(Analysis.current_tabs.and_(AnalysisTab.tab_name == 'overview'))
+    ).order_by(Analysis.created_at.desc()).all()
     
     result = []
     for a in analyses:
@@ -2894,7 +3349,7 @@ def get_voucher_analyses(user, voucher_id):
             'industry': a.industry,
             'report_type': a.report_type,
             'status': a.status,
-            'created_at': a.created_at.isoformat() if a.created_at else None,
+            'created_at': a.created_at,
             'market_fit_score': overview.get('market_fit_score'),
             'time_to_build_months': overview.get('time_to_build_months'),
             'competitors_count': overview.get('competitors_count'),
@@ -3007,8 +3462,8 @@ def get_available_vouchers(user):
             'name': v.name,
             'description': v.description,
             'ngo_name': ngo_request.organization_name if ngo_request else None,
-            'activation_start': v.activation_start.isoformat() if v.activation_start else None,
-            'activation_end': v.activation_end.isoformat() if v.activation_end else None,
+            'activation_start': v.activation_start,
+            'activation_end': v.activation_end,
             'remaining_slots': remaining
         })
     
@@ -0,0 +1,219 @@
+"""
+Versioned schema changes for existing databases.
+`db.create_all()` creates missing tables but never alters existing ones, so
+indexes and columns added to models after a table exists are applied here.
+Every statement is idempotent (IF NOT EXISTS, or `add_column()` and
+`drop_column()` for columns, which SQLite cannot guard in SQL) so a fresh
+database created by `create_all()` can run the whole list safely. The applied version is tracked in
+`seed_versions` under the name 'schema', like the data seeds in seed.py.
+
+Under FAST_BOOT, workers only check the recorded version (one query) and skip
+`create_all()` when it is current, so a new model table needs a migration
+entry to get created on existing databases (an empty statement list is
+enough: `create_all()` runs whenever a migration is pending). Deploy steps can apply everything explicitly:
+    python -m server.schema_migrations
+"""
+from datetime import datetime
+
+from sqlalchemy import LargeBinary, bindparam, column as sql_column, inspect, table as sql_table, text
+from sqlalchemy.exc import SQLAlchemyError
+
+from server.models import db, SeedVersion
+from server.services.analysis_tab_service import backfill_analysis_tabs
+from server.utils.compressed_json import compress_json_bytes, decompress_json_bytes, is_compressed
+
+SCHEMA_VERSION_NAME = 'schema'
+
+
+def add_column(table, column, ddl_type):
+    """Migration step that adds a column only if the table lacks it"""
+    def step():
+        existing = {c['name'] for c in inspect(db.session.connection()).get_columns(table)}
+        if column not in existing:
+            db.session.execute(text(f"ALTER TABLE {table} ADD COLUMN {column} {ddl_type}"))
+    return step
+
+
+def drop_column(table, column):
+    """Migration step that drops a column only if the table has it (SQLite needs 3.35+)"""
+    def step():
+        existing = {c['name'] for c in inspect(db.session.connection()).get_columns(table)}
+        if column in existing:
+            db.session.execute(text(f"ALTER TABLE {table} DROP COLUMN {column}"))
+    return step
+
+
+def compress_json_column(table, column, batch_size=200):
+    """
+    Migration step that moves a JSON column to CompressedJSON storage: on
+    Postgres the column becomes bytea (holding the plain JSON text, which
+    CompressedJSON still reads), then rows are recompressed in id-ordered
+    batches. Already compressed rows are skipped, so an interrupted run resumes.
+    """
+    def step():
+        if db.engine.dialect.name == 'postgresql':
+            columns = {c['name']: c['type'] for c in inspect(db.session.connection()).get_columns(table)}
+            if not isinstance(columns.get(column), LargeBinary):
+                db.session.execute(text(
+                    f"ALTER TABLE {table} ALTER COLUMN {column} TYPE bytea USING convert_to({column}::text, 'UTF8')"
+                ))
+            # Values are compressed already; keep TOAST from trying again
+            db.session.execute(text(f"ALTER TABLE {table} ALTER COLUMN {column} SET STORAGE EXTERNAL"))
+
+        rows_table = sql_table(table, sql_column('id'), sql_column(column, LargeBinary))
+        value_column = rows_table.c[column]
+        update = rows_table.update().where(rows_table.c.id == bindparam('row_id')).values(
+            {column: bindparam('stored')}
+        )
+        last_id = ''
+        recompressed = 0
+        while True:
+            rows = db.session.execute(
+                db.select(rows_table.c.id, value_column)
+                .where(rows_table.c.id > last_id, value_column.isnot(None))
+                .order_by(rows_table.c.id)
+                .limit(batch_size)
+            ).all()
+            if not rows:
+                break
+            last_id = rows[-1][0]
+
+            changes = []
+            for row_id, stored in rows:
+                if is_compressed(stored):
+                    continue
+                compressed = compress_json_bytes(decompress_json_bytes(stored))
+                if compressed != stored:
+                    changes.append({'row_id': row_id, 'stored': compressed})
+            if changes:
+                db.session.execute(update, changes)
+                recompressed += len(changes)
+
+        if recompressed:
+            print(f"Compressed {recompressed} value(s) in {table}.{column}")
+    return step
+
+
+# (version, description, [SQL strings or callables]) - append only, never edit an applied entry
+MIGRATIONS = [
+    (1, 'notification history and unread-count indexes', [
+        "CREATE INDEX IF NOT EXISTS ix_notifications_user_created ON notifications (user_email, created_at)",
+        "CREATE INDEX IF NOT EXISTS ix_notifications_user_unread ON notifications (user_email) WHERE is_read = false",
+    ]),
+    (2, 'per-tab content versions for analysis ETags', [
+        add_column('analyses', 'tab_versions', 'JSON'),
+    ]),
+    (3, 'move report tabs into analysis_tabs', [
+        backfill_analysis_tabs,
+        "DROP TABLE IF EXISTS tab_generation_leases",
+    ]),
+    (4, 'compressed storage for report JSON columns', [
+        compress_json_column('analysis_tabs', 'content'),
+        compress_json_column('analyses', 'report'),
+        compress_json_column('analyses', 'market_analysis'),
+        compress_json_column('analyses', 'financial_projections'),
+        compress_json_column('analyses', 'risk_assessment'),
+        compress_json_column('analyses', 'recommendations'),
+    ]),
+    (5, 'indexes for per-user lists and hot lookups', [
+        "CREATE INDEX IF NOT EXISTS ix_users_role ON users (role_id)",
+        "CREATE INDEX IF NOT EXISTS ix_analyses_user_created ON analyses (user_email, created_at)",
+        "CREATE INDEX IF NOT EXISTS ix_analyses_voucher_live ON analyses (voucher_id, created_at) WHERE is_deleted = false",
+        "CREATE INDEX IF NOT EXISTS ix_transactions_user_created ON transactions (user_email, created_at)",
+        "CREATE INDEX IF NOT EXISTS ix_payments_user_created ON payments (user_email, created_at)",
+        "CREATE INDEX IF NOT EXISTS ix_payments_discount_approved ON payments (discount_code, created_at) WHERE status = 'approved'",
+        "CREATE INDEX IF NOT EXISTS ix_api_request_logs_user_created ON api_request_logs (user_email, created_at)",
+        "CREATE INDEX IF NOT EXISTS ix_activity_feed_user_created ON activity_feed (user_email, created_at)",
+        "CREATE INDEX IF NOT EXISTS ix_report_shares_created_by ON report_shares (created_by, created_at)",
+        "CREATE INDEX IF NOT EXISTS ix_report_shares_analysis ON report_shares (analysis_id)",
+        "CREATE INDEX IF NOT EXISTS ix_chat_conversations_user_updated ON chat_conversations (user_email, updated_at)",
+        "CREATE INDEX IF NOT EXISTS ix_referrals_referrer_created ON referrals (referrer_email, created_at)",
+        "CREATE INDEX IF NOT EXISTS ix_referrals_referred_pending ON referrals (referred_email) WHERE status = 'pending'",
+        "CREATE INDEX IF NOT EXISTS ix_ngo_requests_user_status ON ngo_requests (user_id, status)",
+        "CREATE INDEX IF NOT EXISTS ix_project_vouchers_ngo_request ON project_vouchers (ngo_request_id, created_at)",
+    ]),
+    (6, 'LLM usage ledger (llm_calls, created by create_all)', []),
+    (7, 'idea validation outcomes (idea_validations, created by create_all)', []),
+    (8, 'drop tab state columns superseded by analysis_tabs', [
+        drop_column('analyses', 'tab_versions'),
+        drop_column('analyses', 'tab_processing_started'),
+    ]),
+]
+
+# Arbitrary constant used for pg_advisory_xact_lock so only one worker migrates at a time
+_ADVISORY_LOCK_ID = 7311001
+
+
+def get_schema_version():
+    record = SeedVersion.query.filter_by(seed_name=SCHEMA_VERSION_NAME).first()
+    return record.version if record else 0
+
+
+def _set_schema_version(version):
+    record = SeedVersion.query.filter_by(seed_name=SCHEMA_VERSION_NAME).first()
+    if record:
+        record.version = version
+        record.applied_at = datetime.utcnow()
+    else:
+        db.session.add(SeedVersion(seed_name=SCHEMA_VERSION_NAME, version=version))
+
+
+def latest_schema_version():
+    return MIGRATIONS[-1][0] if MIGRATIONS else 0
+
+
+def schema_is_current():
+    """True when the database has every migration applied (False if it has no tables yet)"""
+    try:
+        current = get_schema_version()
+    except SQLAlchemyError:
+        current = 0
+    db.session.rollback()
+    return current >= latest_schema_version()
+
+
+def initialize_database():
+    """Create missing tables and apply pending migrations"""
+    db.create_all()
+    return run_schema_migrations()
+
+
+def run_schema_migrations():
+    """Apply pending migrations. Must run inside an app context after create_all()."""
+    latest = latest_schema_version()
+
+    try:
+        if db.engine.dialect.name == 'postgresql':
+            # Table rewrites and backfills may outlast the per-statement limit
+            db.session.execute(text("SET LOCAL statement_timeout = 0"))
+            db.session.execute(text("SELECT pg_advisory_xact_lock(:id)"), {'id': _ADVISORY_LOCK_ID})
+
+        current = get_schema_version()
+        if current >= latest:
+            db.session.commit()
+            return current
+
+        for version, description, statements in MIGRATIONS:
+            if version <= current:
+                continue
+            print(f"Applying schema migration {version}: {description}")
+            for statement in statements:
+                if callable(statement):
+                    statement()
+                else:
+                    db.session.execute(text(statement))
+            _set_schema_version(version)
+
+        db.session.commit()
+        return latest
+    except Exception as e:
+        db.session.rollback()
+        print(f"Schema migration failed: {e}")
+        raise
+
+
+if __name__ == '__main__':
+    from server.app import create_app
+
+    with create_app().app_context():
+        print(f"Schema at version {initialize_database()}")
@@ -2,10 +2,14 @@ import os
 import sys
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+import time
+import uuid
 from datetime import datetime
 from server.app import create_app
 from server.models import SocialMedia, db, User, Role, CreditPackage, PaymentMethod, EmailTemplate, SystemSettings, Partner, SeedVersion, Currency
-import bcrypt
+from server.utils.lazy_imports import lazy_import
+
+bcrypt = lazy_import('bcrypt')
 
 PERMISSIONS = {
     'VIEW_PAYMENTS': 'view_payments',
@@ -40,33 +44,85 @@ SEED_VERSIONS = {
     'currencies': 1,
 }
 
-def get_applied_version(seed_name):
-    try:
-        record = SeedVersion.query.filter_by(seed_name=seed_name).first()
-        return record.version if record else 0
-    except Exception:
-        return 0
+# Arbitrary constant for pg_advisory_xact_lock: concurrent seed runs (several
+# workers or deploy hooks) queue behind each other instead of racing
+_ADVISORY_LOCK_ID = 7311002
+
+def get_applied_versions():
+    """Applied version of every seed, in one query"""
+    return dict(db.session.execute(db.select(SeedVersion.seed_name, SeedVersion.version)).all())
+
+def set_applied_versions(versions):
+    """Record applied seed versions in one upsert"""
+    if not versions:
+        return
+    now = datetime.utcnow()
+    rows = [
+        {'id': str(uuid.uuid4()), 'seed_name': name, 'version': version, 'applied_at': now}
+        for name, version in versions.items()
+    ]
+    stmt = _dialect_insert(SeedVersion)
+    db.session.execute(
+        stmt.on_conflict_do_update(
+            index_elements=['seed_name'],
+            set_={'version': stmt.excluded.version, 'applied_at': stmt.excluded.applied_at}
+        ),
+        rows
+    )
+
+def _dialect_insert(model):
+    if db.engine.dialect.name == 'postgresql':
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert
+    return insert(model.__table__)
+
+def insert_missing(model, key, rows):
+    """
+    Insert the seed rows whose `key` value is not in the table yet, as one
+    multi-row INSERT. Existing rows are left untouched so admin edits survive
+    reseeding. Columns with a unique constraint use ON CONFLICT DO NOTHING;
+    others skip keys found by a single lookup (the seed advisory lock keeps
+    concurrent runs from racing between the two).
+
+    Returns:
+        list: `key` values of the inserted rows
+    """
+    if not rows:
+        return []
+    table = model.__table__
+    key_column = table.c[key]
+
+    # executemany needs the same keys in every row: fill gaps with column defaults
+    columns = {name for row in rows for name in row}
+    rows = [
+        {name: row.get(name, _column_default(table.c[name])) for name in columns}
+        for row in rows
+    ]
 
-def set_applied_version(seed_name, version):
-    record = SeedVersion.query.filter_by(seed_name=seed_name).first()
-    if record:
-        record.version = version
-        record.applied_at = datetime.utcnow()
+    if key_column.unique:
+        stmt = _dialect_insert(model).on_conflict_do_nothing(index_elements=[key])
     else:
-        record = SeedVersion(seed_name=seed_name, version=version)
-        db.session.add(record)
-    db.session.commit()
+        existing = set(db.session.scalars(
+            db.select(key_column).where(key_column.in_([row[key] for row in rows]))
+        ))
+        rows = [row for row in rows if row[key] not in existing]
+        if not rows:
+            return []
+        stmt = table.insert()
+    return list(db.session.scalars(stmt.returning(key_column), rows))
 
-def should_run_seed(seed_name):
-    current_version = SEED_VERSIONS.get(seed_name, 1)
-    applied_version = get_applied_version(seed_name)
-    return applied_version < current_version
+def _column_default(column):
+    default = column.default
+    if default is None:
+        return None
+    if default.is_scalar:
+        return default.arg
+    if default.is_callable:
+        return default.arg(None)
+    return None
 
 def seed_roles():
-    if not should_run_seed('roles'):
-        print("Roles seed already applied (version up to date), skipping...")
-        return
-    
     roles_data = [
         {
             'name': 'super_admin',
@@ -99,24 +155,12 @@ def seed_roles():
         }
     ]
     
-    for role_data in roles_data:
-        existing_role = Role.query.filter_by(name=role_data['name']).first()
-        if not existing_role:
-            role = Role(
-                name=role_data['name'],
-                description=role_data['description'],
-                permissions=role_data['permissions']
-            )
-            db.session.add(role)
-            print(f"Created role: {role_data['name']}")
-        else:
-            print(f"Role already exists: {role_data['name']}")
-    
-    db.session.commit()
-    set_applied_version('roles', SEED_VERSIONS['roles'])
-    print("Roles seeded successfully!")
+    created = insert_missing(Role, 'name', roles_data)
+    for name in created:
+        print(f"Created role: {name}")
+    print(f"Roles: {len(created)} created, {len(roles_data) - len(created)} already present")
 
-def create_super_admin(email, password=None, full_name="Super Admin"):
+def create_super_admin(email, password=None, full_name="Super Admin", commit=True):
     super_admin_role = Role.query.filter_by(name='super_admin').first()
     if not super_admin_role:
         print("Error: super_admin role not found. Please run seed_roles() first.")
@@ -147,14 +191,13 @@ def create_super_admin(email, password=None, full_name="Super Admin"):
         db.session.add(user)
         print(f"Created super admin user: {email}")
     
-    db.session.commit()
+    if commit:
+        db.session.commit()
+    else:
+        db.session.flush()
     return user
 
 def seed_credit_packages():
-    if not should_run_seed('credit_packages'):
-        print("Credit packages seed already applied (version up to date), skipping...")
-        return
-    
     packages_data = [
         {
             'name': 'Entrepreneurial',
@@ -210,24 +253,12 @@ def seed_credit_packages():
         }
     ]
     
-    for pkg_data in packages_data:
-        existing = CreditPackage.query.filter_by(name=pkg_data['name']).first()
-        if not existing:
-            package = CreditPackage(**pkg_data)
-            db.session.add(package)
-            print(f"Created credit package: {pkg_data['name']}")
-        else:
-            print(f"Credit package already exists: {pkg_data['name']}")
-    
-    db.session.commit()
-    set_applied_version('credit_packages', SEED_VERSIONS['credit_packages'])
-    print("Credit packages seeded successfully!")
+    created = insert_missing(CreditPackage, 'name', packages_data)
+    for name in created:
+        print(f"Created credit package: {name}")
+    print(f"Credit packages: {len(created)} created, {len(packages_data) - len(created)} already present")
 
 def seed_payment_methods():
-    if not should_run_seed('payment_methods'):
-        print("Payment methods seed already applied (version up to date), skipping...")
-        return
-    
     methods_data = [
         {
             'name': 'Bank Transfer',
@@ -245,24 +276,12 @@ def seed_payment_methods():
         }
     ]
     
-    for method_data in methods_data:
-        existing = PaymentMethod.query.filter_by(name=method_data['name']).first()
-        if not existing:
-            method = PaymentMethod(**method_data)
-            db.session.add(method)
-            print(f"Created payment method: {method_data['name']}")
-        else:
-            print(f"Payment method already exists: {method_data['name']}")
-    
-    db.session.commit()
-    set_applied_version('payment_methods', SEED_VERSIONS['payment_methods'])
-    print("Payment methods seeded successfully!")
+    created = insert_missing(PaymentMethod, 'name', methods_data)
+    for name in created:
+        print(f"Created payment method: {name}")
+    print(f"Payment methods: {len(created)} created, {len(methods_data) - len(created)} already present")
 
 def seed_email_templates():
-    if not should_run_seed('email_templates'):
-        print("Email templates seed already applied (version up to date), skipping...")
-        return
-    
     templates_data = [
         {
             'template_key': 'shared_report_accessed',
@@ -628,24 +647,12 @@ def seed_email_templates():
         }
     ]
     
-    for template_data in templates_data:
-        existing = EmailTemplate.query.filter_by(template_key=template_data['template_key']).first()
-        if not existing:
-            template = EmailTemplate(**template_data)
-            db.session.add(template)
-            print(f"Created email template: {template_data['template_key']}")
-        else:
-            print(f"Email template already exists: {template_data['template_key']}")
-    
-    db.session.commit()
-    set_applied_version('email_templates', SEED_VERSIONS['email_templates'])
-    print("Email templates seeded successfully!")
+    created = insert_missing(EmailTemplate, 'template_key', templates_data)
+    for template_key in created:
+        print(f"Created email template: {template_key}")
+    print(f"Email templates: {len(created)} created, {len(templates_data) - len(created)} already present")
 
 def seed_system_settings():
-    if not should_run_seed('system_settings'):
-        print("System settings seed already applied (version up to date), skipping...")
-        return
-    
     settings_data = [
         {
             'key': 'syrian_apps_count',
@@ -664,44 +671,20 @@ def seed_system_settings():
         }
     ]
     
-    for setting_data in settings_data:
-        existing = SystemSettings.query.filter_by(key=setting_data['key']).first()
-        if not existing:
-            setting = SystemSettings(**setting_data)
-            db.session.add(setting)
-            print(f"Created system setting: {setting_data['key']}")
-        else:
-            print(f"System setting already exists: {setting_data['key']}")
-    
-    db.session.commit()
-    set_applied_version('system_settings', SEED_VERSIONS['system_settings'])
-    print("System settings seeded successfully!")
+    created = insert_missing(SystemSettings, 'key', settings_data)
+    for key in created:
+        print(f"Created system setting: {key}")
+    print(f"System settings: {len(created)} created, {len(settings_data) - len(created)} already present")
 
 def seed_partners():
-    if not should_run_seed('partners'):
-        print("Partners seed already applied (version up to date), skipping...")
-        return
-    
     partners_data = []
     
-    for partner_data in partners_data:
-        existing = Partner.query.filter_by(name=partner_data['name']).first()
-        if not existing:
-            partner = Partner(**partner_data)
-            db.session.add(partner)
-            print(f"Created partner: {partner_data['name']}")
-        else:
-            print(f"Partner already exists: {partner_data['name']}")
-    
-    db.session.commit()
-    set_applied_version('partners', SEED_VERSIONS['partners'])
-    print("Partners seeded successfully!")
+    created = insert_missing(Partner, 'name', partners_data)
+    for name in created:
+        print(f"Created partner: {name}")
+    print(f"Partners: {len(created)} created, {len(partners_data) - len(created)} already present")
 
 def seed_social_media():
-    if not should_run_seed('social_media'):
-        print("Social media seed already applied (version up to date), skipping...")
-        return
-
     social_media_data = [
         { 
             'platform': "Facebook",
@@ -742,24 +725,12 @@ def seed_social_media():
         }
     ]
 
-    for social_media_data in social_media_data:
-        existing = SocialMedia.query.filter_by(platform=social_media_data['platform']).first()
-        if not existing:
-            social_media = SocialMedia(**social_media_data)
-            db.session.add(social_media)
-            print(f"Created social media: {social_media_data['platform']}")
-        else:
-            print(f"Social media already exists: {social_media_data['platform']}")
-
-    db.session.commit()
-    set_applied_version('social_media', SEED_VERSIONS['social_media'])
-    print("Social media seeded successfully!")    
+    created = insert_missing(SocialMedia, 'platform', social_media_data)
+    for platform in created:
+        print(f"Created social media: {platform}")
+    print(f"Social media: {len(created)} created, {len(social_media_data) - len(created)} already present")
 
 def seed_currencies():
-    if not should_run_seed('currencies'):
-        print("Currencies seed already applied (version up to date), skipping...")
-        return
-    
     currencies_data = [
         {
             'code': 'USD',
@@ -783,18 +754,57 @@ def seed_currencies():
         }
     ]
     
-    for currency_data in currencies_data:
-        existing = Currency.query.filter_by(code=currency_data['code']).first()
-        if not existing:
-            currency = Currency(**currency_data)
-            db.session.add(currency)
-            print(f"Created currency: {currency_data['code']}")
+    created = insert_missing(Currency, 'code', currencies_data)
+    for code in created:
+        print(f"Created currency: {code}")
+    print(f"Currencies: {len(created)} created, {len(currencies_data) - len(created)} already present")
+
+SEEDS = [
+    ('roles', seed_roles),
+    ('credit_packages', seed_credit_packages),
+    ('payment_methods', seed_payment_methods),
+    ('email_templates', seed_email_templates),
+    ('system_settings', seed_system_settings),
+    ('partners', seed_partners),
+    ('social_media', seed_social_media),
+    ('currencies', seed_currencies),
+]
+
+def seed_all():
+    """
+    Apply every seed whose version is behind, plus the admin user, in one
+    transaction. On PostgreSQL an advisory lock serializes concurrent runs;
+    the versions are read after taking it, so a run that waited sees the
+    first run's work and does nothing.
+    """
+    started = time.perf_counter()
+    try:
+        if db.engine.dialect.name == 'postgresql':
+            db.session.execute(db.text("SELECT pg_advisory_xact_lock(:id)"), {'id': _ADVISORY_LOCK_ID})
+
+        applied = get_applied_versions()
+        pending = {}
+        for seed_name, seed in SEEDS:
+            if applied.get(seed_name, 0) >= SEED_VERSIONS[seed_name]:
+                print(f"{seed_name}: v{applied[seed_name]} already applied, skipping")
+                continue
+            seed()
+            pending[seed_name] = SEED_VERSIONS[seed_name]
+        set_applied_versions(pending)
+
+        admin_email = os.environ.get('ADMIN_EMAIL', 'info@planlyze.com')
+        admin_password = os.environ.get('ADMIN_PASSWORD', 'Admin@123')
+        existing_admin = db.session.scalar(db.select(User.id).where(User.email == admin_email))
+        if not existing_admin:
+            create_super_admin(admin_email, admin_password, "Super Admin", commit=False)
         else:
-            print(f"Currency already exists: {currency_data['code']}")
-    
-    db.session.commit()
-    set_applied_version('currencies', SEED_VERSIONS['currencies'])
-    print("Currencies seeded successfully!")
+            print(f"Admin user already exists: {admin_email}")
+
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        raise
+    return (time.perf_counter() - started) * 1000
 
 def run_seed():
     """Run all seed operations with versioning"""
@@ -803,27 +813,10 @@ def run_seed():
         print("Starting seed process with versioning...")
         print("=" * 50)
         
-        db.create_all()
-        
-        seed_roles()
-        seed_credit_packages()
-        seed_payment_methods()
-        seed_email_templates()
-        seed_system_settings()
-        seed_partners()
-        seed_social_media()
-        seed_currencies()
-        
-        admin_email = os.environ.get('ADMIN_EMAIL', 'info@planlyze.com')
-        admin_password = os.environ.get('ADMIN_PASSWORD', 'Admin@123')
-        existing_admin = User.query.filter_by(email=admin_email).first()
-        if not existing_admin:
-            create_super_admin(admin_email, admin_password, "Super Admin")
-        else:
-            print(f"Admin user already exists: {admin_email}")
+        elapsed_ms = seed_all()
         
         print("=" * 50)
-        print("Seed process completed!")
+        print(f"Seed process completed in {elapsed_ms:.1f} ms!")
         
         versions = SeedVersion.query.all()
         print("\nApplied seed versions:")
@@ -0,0 +1,149 @@
+"""
+Coalesced admin alerting.
+Alerts are grouped in memory by (type, method, endpoint, error signature) and
+flushed once per window by a background thread: one bulk insert of admin
+notifications and one digest email with counts, instead of a DB write and an
+email per event.
+Recording an alert never touches the database, so it is safe to call from an
+error handler while the system is under stress.
+"""
+import re
+import hashlib
+import threading
+from datetime import datetime
+
+# Cap on distinct groups per window; anything beyond is folded into one overflow group
+MAX_GROUPS_PER_WINDOW = 200
+
+_SIGNATURE_NOISE = [
+    (re.compile(r'[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}', re.I), '<uuid>'),
+    (re.compile(r'0x[0-9a-f]+', re.I), '<addr>'),
+    (re.compile(r'\d+'), '<n>'),
+    (re.compile(r"'[^']*'"), "'?'"),
+]
+
+_groups = {}
+_groups_lock = threading.Lock()
+
+
+def error_signature(error_message):
+    """Reduce an error message to a stable signature (ids, numbers and quoted values stripped)"""
+    text = (error_message or 'Unknown error').strip().splitlines()[0][:300]
+    for pattern, replacement in _SIGNATURE_NOISE:
+        text = pattern.sub(replacement, text)
+    return hashlib.sha1(text.encode('utf-8')).hexdigest()[:12]
+
+
+def record_alert(alert_type, endpoint, error_message, method=None, user_email=None, meta_data=None):
+    """Add an alert occurrence to the current window. In-memory only."""
+    signature = error_signature(error_message)
+    key = (alert_type, method, endpoint, signature)
+    now = datetime.utcnow()
+
+    with _groups_lock:
+        group = _groups.get(key)
+        if group is None:
+            if len(_groups) >= MAX_GROUPS_PER_WINDOW:
+                key = (alert_type, None, '*', 'overflow')
+                group = _groups.get(key)
+            if group is None:
+                group = {
+                    'type': alert_type,
+                    'method': key[1],
+                    'endpoint': key[2],
+                    'signature': key[3],
+                    'sample_error': (error_message or 'Unknown error')[:500],
+                    'count': 0,
+                    'users': set(),
+                    'first_seen': now,
+                    'last_seen': now,
+                    'meta_data': meta_data or {}
+                }
+                _groups[key] = group
+        group['count'] += 1
+        group['last_seen'] = now
+        if user_email and len(group['users']) < 20:
+            group['users'].add(user_email)
+
+
+def _drain_groups():
+    global _groups
+    with _groups_lock:
+        groups, _groups = _groups, {}
+    return list(groups.values())
+
+
+def flush_alerts():
+    """
+    Write the current window as admin notifications (one bulk insert) and send
+    one digest email. Must run inside an app context.
+
+    Returns:
+        int: number of alert groups flushed
+    """
+    from server.models import db, Notification
+    from server.services.admin_notification_service import (
+        NOTIFICATION_TYPES, get_admin_emails, send_admin_email
+    )
+
+    groups = _drain_groups()
+    if not groups:
+        return 0
+
+    groups.sort(key=lambda g: g['count'], reverse=True)
+
+    try:
+        admin_emails = get_admin_emails()
+        rows = []
+        for group in groups:
+            type_config = NOTIFICATION_TYPES.get(group['type'], {})
+            title = type_config.get('title_en', group['type'])
+            where = f"{group['method']} {group['endpoint']}" if group['method'] else group['endpoint']
+            message = f"{group['count']}x on {where}: {group['sample_error'][:200]}"
+            meta_data = dict(group['meta_data'])
+            meta_data.update({
+                'endpoint': group['endpoint'],
+                'method': group['method'],
+                'signature': group['signature'],
+                'count': group['count'],
+                'first_seen': group['first_seen'].isoformat(),
+                'last_seen': group['last_seen'].isoformat(),
+                'users': sorted(group['users'])
+            })
+            for admin_email in admin_emails:
+                rows.append({
+                    'user_email': admin_email,
+                    'type': group['type'],
+                    'title': title,
+                    'message': message,
+                    'is_read': False,
+                    'meta_data': meta_data
+                })
+
+        if rows:
+            db.session.bulk_insert_mappings(Notification, rows)
+            db.session.commit()
+    except Exception as e:
+        db.session.rollback()
+        print(f"Error writing admin alert digest: {e}")
+
+    total = sum(g['count'] for g in groups)
+    details = {}
+    for group in groups:
+        where = f"{group['method']} {group['endpoint']}" if group['method'] else group['endpoint']
+        details[f"{group['count']}x {where}"] = group['sample_error']
+    send_admin_email('server_error', f"{total} alert(s) in {len(groups)} group(s)", details)
+
+    return len(groups)
+
+
+def start_alert_flusher(app):
+    """Start the background flusher thread once per process"""
+    from server.utils.background import start_periodic_task
+
+    return start_periodic_task(
+        app,
+        'admin-alert-flusher',
+        app.config.get('ADMIN_ALERT_WINDOW_SECONDS', 60),
+        flush_alerts
+    )
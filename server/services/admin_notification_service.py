@@ -38,11 +38,11 @@ NOTIFICATION_TYPES = {
 def get_admin_emails():
     """Get all admin and super_admin user emails"""
     from server.models import Role
-    admins = User.query.join(Role).filter(
+    rows = db.session.query(User.email).join(Role).filter(
         Role.name.in_(['admin', 'super_admin']),
         User.email_verified == True
     ).all()
-    return [admin.email for admin in admins]
+    return [row.email for row in rows]
 
 
 def create_admin_notification(notification_type, message, meta_data=None):
@@ -53,26 +53,20 @@ def create_admin_notification(notification_type, message, meta_data=None):
         notification_type: One of the NOTIFICATION_TYPES keys
         message: The notification message
         meta_data: Optional metadata dict
+
+    Returns:
+        bool: True when every admin got the notification (or there are none)
     """
+    from server.services.user_notification_service import create_bulk_notifications
+    
     try:
         type_config = NOTIFICATION_TYPES.get(notification_type, {})
         title = type_config.get('title_en', notification_type)
         
         admin_emails = get_admin_emails()
-        
-        for admin_email in admin_emails:
-            notification = Notification(
-                user_email=admin_email,
-                type=notification_type,
-                title=title,
-                message=message,
-                is_read=False,
-                meta_data=meta_data or {}
-            )
-            db.session.add(notification)
-        
-        db.session.commit()
-        return True
+        # create_bulk_notifications() handles its own errors and reports them as 0 rows
+        created = create_bulk_notifications(admin_emails, notification_type, title, message, meta_data)
+        return created == len(set(admin_emails))
     except Exception as e:
         print(f"Error creating admin notification: {e}")
         db.session.rollback()
@@ -205,17 +199,19 @@ def notify_new_payment(user_email, amount_usd, package_name, payment_method):
 
 
 def notify_server_error(endpoint, method, error_message, user_email=None):
-    """Notify admin about a server error (500)"""
-    notify_admin(
+    """
+    Notify admin about a server error (500).
+    Errors are coalesced by endpoint and error signature and sent as a periodic
+    digest (see admin_alert_service) rather than one email per request.
+    """
+    from server.services.admin_alert_service import record_alert
+    
+    record_alert(
         'server_error',
-        f"Server error on {method} {endpoint}",
-        {
-            'Endpoint': endpoint,
-            'Method': method,
-            'User': user_email or 'Unknown',
-            'Error': error_message[:500] if error_message else 'Unknown error'
-        },
-        {'endpoint': endpoint, 'method': method, 'user_email': user_email}
+        endpoint,
+        error_message,
+        method=method,
+        user_email=user_email
     )
 
 
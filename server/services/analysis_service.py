@@ -2,16 +2,73 @@ import json
 import re
 import traceback
 from datetime import datetime
-from anthropic import Anthropic
 from server.models import db, User, Analysis, Transaction
 from server.services.settings_service import get_premium_report_cost
 from server.services.referral_service import check_and_award_referral_bonus
+from server.services.idea_classifier import classify_idea, record_validation_outcome
+from server.utils.llm_client import get_anthropic_client, create_message
 from flask import current_app
 
+_NO_LETTERS = re.compile(r'^[^a-zA-Z\u0600-\u06FF]+$')
+_NON_LATIN = re.compile(r'[^a-z]')
+_KEYBOARD_PATTERNS = [re.compile(pattern) for pattern in (
+    r'([a-z])\1{3,}',
+    r'qwerty|asdf|zxcv|qazwsx|poiuy|lkjh|mnbv',
+    r'^[bcdfghjklmnpqrstvwxyz]{6,}$',
+    r'^[aeiou]{5,}$',
+)]
+_CODE_FENCE_START = re.compile(r'^```json?\n?')
+_CODE_FENCE_END = re.compile(r'\n?```$')
 
-def get_anthropic_client():
-    """Get the Anthropic client using Replit AI Integrations."""
-    return Anthropic()
+COMMON_WORDS = frozenset({
+    'a', 'an', 'the', 'is', 'are', 'was', 'were', 'be', 'been', 'being',
+    'have', 'has', 'had', 'do', 'does', 'did', 'will', 'would', 'could',
+    'should', 'may', 'might', 'must', 'can', 'and', 'or', 'but', 'if',
+    'then', 'else', 'when', 'where', 'why', 'how', 'what', 'which', 'who',
+    'this', 'that', 'these', 'those', 'i', 'you', 'he', 'she', 'it', 'we',
+    'they', 'my', 'your', 'his', 'her', 'its', 'our', 'their', 'for', 'to',
+    'of', 'in', 'on', 'at', 'by', 'with', 'about', 'from', 'as', 'into',
+    'app', 'application', 'service', 'platform', 'business', 'company',
+    'product', 'online', 'mobile', 'web', 'software', 'shop', 'store',
+    'delivery', 'food', 'restaurant', 'market', 'marketplace', 'ecommerce',
+    'startup', 'tech', 'technology', 'ai', 'machine', 'learning', 'data',
+    'cloud', 'saas', 'rental', 'booking', 'hotel', 'travel', 'health',
+    'fitness', 'education', 'finance', 'payment', 'social', 'media',
+    'coffee', 'cafe', 'consulting', 'agency', 'freelance', 'tutoring'
+})
+
+
+def _is_gibberish_text(text):
+    """Detect gibberish using multiple heuristics."""
+    text_lower = text.lower()
+    
+    letters_only = _NON_LATIN.sub('', text_lower)
+    if len(letters_only) >= 5:
+        vowels = sum(1 for c in letters_only if c in 'aeiou')
+        vowel_ratio = vowels / len(letters_only)
+        if vowel_ratio < 0.1 or vowel_ratio > 0.8:
+            return True
+    
+    for pattern in _KEYBOARD_PATTERNS:
+        if pattern.search(letters_only):
+            return True
+    
+    words_to_check = text_lower.split()
+    
+    if len(words_to_check) >= 1:
+        recognized_words = sum(1 for w in words_to_check if w in COMMON_WORDS or len(w) <= 2)
+        if recognized_words == 0 and len(words_to_check) <= 3:
+            long_words = [w for w in words_to_check if len(w) > 4]
+            if long_words:
+                for word in long_words:
+                    word_letters = _NON_LATIN.sub('', word)
+                    if len(word_letters) >= 5:
+                        word_vowels = sum(1 for c in word_letters if c in 'aeiou')
+                        word_vowel_ratio = word_vowels / len(word_letters)
+                        if word_vowel_ratio < 0.15 or word_vowel_ratio > 0.75:
+                            return True
+    
+    return False
 
 
 def validate_business_idea(business_idea: str, language: str = 'en', industry: str = None) -> dict:
@@ -54,8 +111,7 @@ def validate_business_idea(business_idea: str, language: str = 'en', industry: s
             'confidence': 0.9
         }
     
-    gibberish_pattern = r'^[^a-zA-Z\u0600-\u06FF]+$'
-    if re.match(gibberish_pattern, cleaned):
+    if _NO_LETTERS.match(cleaned):
         return {
             'valid': False,
             'reason': 'Please provide a valid business idea in text format.' if language == 'en'
@@ -63,61 +119,7 @@ def validate_business_idea(business_idea: str, language: str = 'en', industry: s
             'confidence': 0.95
         }
     
-    def is_gibberish_text(text):
-        """Detect gibberish using multiple heuristics."""
-        text_lower = text.lower()
-        
-        letters_only = re.sub(r'[^a-zA-Z]', '', text_lower)
-        if len(letters_only) >= 5:
-            vowels = sum(1 for c in letters_only if c in 'aeiou')
-            vowel_ratio = vowels / len(letters_only)
-            if vowel_ratio < 0.1 or vowel_ratio > 0.8:
-                return True
-        
-        keyboard_patterns = [
-            r'([a-z])\1{3,}',
-            r'qwerty|asdf|zxcv|qazwsx|poiuy|lkjh|mnbv',
-            r'^[bcdfghjklmnpqrstvwxyz]{6,}$',
-            r'^[aeiou]{5,}$',
-        ]
-        for pattern in keyboard_patterns:
-            if re.search(pattern, letters_only):
-                return True
-        
-        words_to_check = text_lower.split()
-        common_words = {
-            'a', 'an', 'the', 'is', 'are', 'was', 'were', 'be', 'been', 'being',
-            'have', 'has', 'had', 'do', 'does', 'did', 'will', 'would', 'could',
-            'should', 'may', 'might', 'must', 'can', 'and', 'or', 'but', 'if',
-            'then', 'else', 'when', 'where', 'why', 'how', 'what', 'which', 'who',
-            'this', 'that', 'these', 'those', 'i', 'you', 'he', 'she', 'it', 'we',
-            'they', 'my', 'your', 'his', 'her', 'its', 'our', 'their', 'for', 'to',
-            'of', 'in', 'on', 'at', 'by', 'with', 'about', 'from', 'as', 'into',
-            'app', 'application', 'service', 'platform', 'business', 'company',
-            'product', 'online', 'mobile', 'web', 'software', 'shop', 'store',
-            'delivery', 'food', 'restaurant', 'market', 'marketplace', 'ecommerce',
-            'startup', 'tech', 'technology', 'ai', 'machine', 'learning', 'data',
-            'cloud', 'saas', 'rental', 'booking', 'hotel', 'travel', 'health',
-            'fitness', 'education', 'finance', 'payment', 'social', 'media',
-            'coffee', 'cafe', 'consulting', 'agency', 'freelance', 'tutoring'
-        }
-        
-        if len(words_to_check) >= 1:
-            recognized_words = sum(1 for w in words_to_check if w in common_words or len(w) <= 2)
-            if recognized_words == 0 and len(words_to_check) <= 3:
-                long_words = [w for w in words_to_check if len(w) > 4]
-                if long_words:
-                    for word in long_words:
-                        word_letters = re.sub(r'[^a-z]', '', word)
-                        if len(word_letters) >= 5:
-                            word_vowels = sum(1 for c in word_letters if c in 'aeiou')
-                            word_vowel_ratio = word_vowels / len(word_letters)
-                            if word_vowel_ratio < 0.15 or word_vowel_ratio > 0.75:
-                                return True
-        
-        return False
-    
-    if is_gibberish_text(cleaned):
+    if _is_gibberish_text(cleaned):
         return {
             'valid': False,
             'reason': 'This doesn\'t appear to be a valid business idea. Please describe a product or service.' if language == 'en'
@@ -125,8 +127,23 @@ def validate_business_idea(business_idea: str, language: str = 'en', industry: s
             'confidence': 0.9
         }
     
+    # Confident cases are settled locally; only uncertain ones cost a Claude call
+    if current_app.config.get('IDEA_CLASSIFIER_ENABLED', True):
+        verdict, confidence = classify_idea(cleaned, industry)
+        if verdict is True:
+            return {'valid': True, 'reason': '', 'confidence': confidence, 'industry_match': True}
+        if verdict is False:
+            return {
+                'valid': False,
+                'reason': 'This doesn\'t appear to be a valid business idea. Please describe a product or service.' if language == 'en'
+                          else 'هذا لا يبدو أنه فكرة عمل صالحة. يرجى وصف منتج أو خدمة.',
+                'confidence': confidence
+            }
+    
     try:
         client = get_anthropic_client()
+        if client is None:
+            raise RuntimeError('AI service not configured - no API key found')
         
         industry_context = ""
         if industry:
@@ -193,7 +210,8 @@ Respond ONLY with the JSON object, no other text."""
 
         current_app.logger.info(f"[Idea Validation] Validating business idea: {cleaned[:100]}...")
         
-        response = client.messages.create(
+        response = create_message(
+            client, 'validate-idea',
             model="claude-sonnet-4-5",
             max_tokens=200,
             messages=[{"role": "user", "content": validation_prompt}]
@@ -202,13 +220,15 @@ Respond ONLY with the JSON object, no other text."""
         response_text = response.content[0].text.strip()
         
         if response_text.startswith('```'):
-            response_text = re.sub(r'^```json?\n?', '', response_text)
-            response_text = re.sub(r'\n?```$', '', response_text)
+            response_text = _CODE_FENCE_START.sub('', response_text)
+            response_text = _CODE_FENCE_END.sub('', response_text)
         
         result = json.loads(response_text)
         
         industry_match = result.get('industry_match', True)
         current_app.logger.info(f"[Idea Validation] Result: valid={result.get('valid')}, confidence={result.get('confidence')}, industry_match={industry_match}")
+        record_validation_outcome(cleaned, language, industry, result.get('valid', False), industry_match,
+                                  result.get('confidence'))
         
         response = {
             'valid': result.get('valid', False),
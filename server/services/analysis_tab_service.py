@@ -0,0 +1,199 @@
+"""
+Report tab storage helpers.
+Tabs live in `analysis_tabs`, one row per (analysis, tab, version), so reading
+or writing one tab never touches the wide `analyses` row. `Analysis.tab_<name>`
+properties keep the old attribute API working on top of these rows; this module
+holds the narrow, column-only queries used by polling endpoints and the one-off
+backfill from the legacy inline columns.
+"""
+from datetime import datetime
+
+from server.models import db, Analysis, AnalysisTab, TAB_NAMES, generate_uuid
+
+STATUS_COLUMNS = (
+    AnalysisTab.analysis_id, AnalysisTab.tab_name, AnalysisTab.version, AnalysisTab.status,
+    AnalysisTab.is_current, AnalysisTab.error, AnalysisTab.started_at, AnalysisTab.lease_expires_at,
+    AnalysisTab.updated_at
+)
+
+
+def get_tab_status_rows(analysis_ids):
+    """Status columns (no content) of every tab row of the given analyses"""
+    if not analysis_ids:
+        return []
+    return db.session.query(*STATUS_COLUMNS).filter(AnalysisTab.analysis_id.in_(analysis_ids)).all()
+
+
+def get_tab_status_rows_for_query(analysis_query):
+    """Like get_tab_status_rows() for every analysis matched by an Analysis query"""
+    ids = analysis_query.with_entities(Analysis.id).order_by(None).subquery()
+    return db.session.query(*STATUS_COLUMNS).filter(AnalysisTab.analysis_id.in_(db.select(ids.c.id))).all()
+
+
+def summarize_tabs(rows, now=None):
+    """
+    Fold status rows of one analysis into {tab_name: state}. A completed tab wins
+    over an in-flight regeneration, then processing ('stuck' once the lease has
+    expired), then a failure if it is the newest version of the tab.
+    """
+    now = now or datetime.utcnow()
+    by_tab = {}
+    for row in rows:
+        by_tab.setdefault(row.tab_name, []).append(row)
+
+    states = {}
+    for name in TAB_NAMES:
+        tab_rows = by_tab.get(name, [])
+        current = next((r for r in tab_rows if r.is_current), None)
+        processing = next((r for r in tab_rows if r.status == 'processing'), None)
+        latest = max(tab_rows, key=lambda r: r.version, default=None)
+
+        if current is not None:
+            state = {'status': 'completed', 'version': current.version}
+        elif processing is not None:
+            expired = processing.lease_expires_at is not None and processing.lease_expires_at < now
+            state = {'status': 'stuck' if expired else 'processing', 'version': 0,
+                     'started_at': processing.started_at.isoformat() if processing.started_at else None}
+        elif latest is not None and latest.status == 'failed':
+            state = {'status': 'failed', 'version': 0, 'error': latest.error,
+                     'failed_at': latest.updated_at.isoformat() if latest.updated_at else None}
+        else:
+            state = {'status': 'pending', 'version': 0}
+        states[name] = state
+
+    return states
+
+
+def tabs_fingerprint(rows):
+    """Stable string over tab rows, for ETags and change cursors"""
+    return ','.join(sorted(f'{r.analysis_id}:{r.tab_name}:{r.version}:{r.status}:{int(r.is_current)}' for r in rows))
+
+
+def get_current_tab(analysis_id, tab_name):
+    """Current row of a tab including its content, or None"""
+    return AnalysisTab.query.filter_by(analysis_id=analysis_id, tab_name=tab_name, is_current=True).first()
+
+
+def next_tab_versions(analysis_id):
+    """{tab_name: next free version number}"""
+    rows = db.session.query(AnalysisTab.tab_name, db.func.max(AnalysisTab.version)).filter(
+        AnalysisTab.analysis_id == analysis_id
+    ).group_by(AnalysisTab.tab_name).all()
+    latest = dict(rows)
+    return {name: (latest.get(name) or 0) + 1 for name in TAB_NAMES}
+
+
+def clear_tabs(analysis_id, tab_names=TAB_NAMES):
+    """
+    Retire the current version of the given tabs and record a 'cleared' version,
+    so the tabs read as pending (not as an older failure). History rows are kept.
+    """
+    AnalysisTab.query.filter(
+        AnalysisTab.analysis_id == analysis_id,
+        AnalysisTab.tab_name.in_(tab_names),
+        AnalysisTab.is_current == True
+    ).update({'is_current': False}, synchronize_session=False)
+
+    versions = next_tab_versions(analysis_id)
+    now = datetime.utcnow()
+    db.session.execute(AnalysisTab.__table__.insert(), [{
+        'id': generate_uuid(),
+        'analysis_id': analysis_id,
+        'tab_name': name,
+        'version': versions[name],
+        'is_current': False,
+        'status': 'cleared',
+        'created_at': now,
+        'updated_at': now
+    } for name in tab_names])
+
+
+def copy_current_tabs(source_id, target_id, tab_names=TAB_NAMES):
+    """
+    Copy the current content of `source_id`'s tabs into `target_id` as new
+    current versions. Tabs the target already has (or is generating) are left
+    alone. Token usage is not copied, since no Claude call was made. Caller commits.
+
+    Returns:
+        list: names of the copied tabs
+    """
+    target_states = summarize_tabs(get_tab_status_rows([target_id]))
+    open_tabs = [name for name in tab_names if target_states[name]['status'] in ('pending', 'failed', 'stuck')]
+    if not open_tabs:
+        return []
+
+    sources = db.session.query(AnalysisTab.tab_name, AnalysisTab.content, AnalysisTab.model).filter(
+        AnalysisTab.analysis_id == source_id,
+        AnalysisTab.tab_name.in_(open_tabs),
+        AnalysisTab.is_current == True
+    ).all()
+    sources = [row for row in sources if row.content]
+    if not sources:
+        return []
+
+    versions = next_tab_versions(target_id)
+    now = datetime.utcnow()
+    db.session.execute(AnalysisTab.__table__.insert(), [{
+        'id': generate_uuid(),
+        'analysis_id': target_id,
+        'tab_name': row.tab_name,
+        'version': versions[row.tab_name],
+        'is_current': True,
+        'status': 'completed',
+        'content': row.content,
+        'model': row.model,
+        'completed_at': now,
+        'created_at': now,
+        'updated_at': now
+    } for row in sources])
+    return [row.tab_name for row in sources]
+
+
+def backfill_analysis_tabs(batch_size=200):
+    """
+    Move content from the legacy analyses.tab_* columns into analysis_tabs as
+    version 1 rows, and null the legacy columns. Idempotent; used by schema
+    migration 3.
+    """
+    table = Analysis.__table__
+    moved = 0
+
+    for name in TAB_NAMES:
+        column = table.c[f'tab_{name}']
+        while True:
+            rows = db.session.execute(
+                db.select(table.c.id, table.c.updated_at, column)
+                .where(column.isnot(None))
+                .limit(batch_size)
+            ).all()
+            if not rows:
+                break
+
+            ids = [row.id for row in rows]
+            existing = {
+                analysis_id for (analysis_id,) in db.session.query(AnalysisTab.analysis_id).filter(
+                    AnalysisTab.analysis_id.in_(ids), AnalysisTab.tab_name == name
+                )
+            }
+            now = datetime.utcnow()
+            inserts = [{
+                'id': generate_uuid(),
+                'analysis_id': row.id,
+                'tab_name': name,
+                'version': 1,
+                'is_current': True,
+                'status': 'completed',
+                'content': row[2],
+                'completed_at': row.updated_at or now,
+                'created_at': now,
+                'updated_at': now
+            } for row in rows if row.id not in existing and row[2]]
+
+            if inserts:
+                db.session.execute(AnalysisTab.__table__.insert(), inserts)
+            db.session.execute(table.update().where(table.c.id.in_(ids)).values({column.name: db.null()}))
+            moved += len(inserts)
+
+    if moved:
+        print(f"Moved {moved} tab(s) into analysis_tabs")
+    return moved
@@ -0,0 +1,380 @@
+"""
+Near-duplicate business idea detection.
+Users often resubmit an idea they already analysed (a typo fix, a rewording),
+and every resubmission pays for six fresh tab generations. Each worker keeps a
+MinHash/LSH index per user over the normalized idea text of recent analyses,
+partitioned by industry, location and report language; a lookup hashes the new
+idea once and only compares it with analyses sharing an LSH band, so it takes
+well under a millisecond. Matches are offered to the client, which can open the
+existing report or copy its tabs (POST /api/analyses/<id>/clone-tabs).
+
+Each user's index is loaded on their first lookup in a worker (one query on
+ix_analyses_user_created for the last DUPLICATE_IDEA_WINDOW_DAYS), topped up
+with newer analyses once DUPLICATE_IDEA_REFRESH_SECONDS old so analyses created
+by other workers are seen, and dropped least-recently-used once the worker
+holds DUPLICATE_IDEA_MAX_ENTRIES analyses (a few KB each). Entries are
+never trusted on their own: callers re-read matched analyses, so deleted ones
+simply drop out.
+
+Benchmark: python -m server.services.duplicate_idea_service benchmark
+"""
+import hashlib
+import random
+import threading
+from array import array
+from collections import OrderedDict
+from datetime import datetime, timedelta
+
+from flask import current_app
+
+from server.models import db, Analysis
+from server.services.analysis_tab_service import get_tab_status_rows, summarize_tabs
+from server.services.idea_classifier import normalize
+
+SHINGLE_SIZE = 3
+BANDS = 20
+ROWS_PER_BAND = 3
+NUM_PERM = BANDS * ROWS_PER_BAND
+
+# One SHAKE-128 digest per shingle yields all NUM_PERM 32-bit hash values at once
+_DIGEST_SIZE = NUM_PERM * 4
+
+# Re-read this far back on refresh so rows committed slightly out of order are not missed
+_REFRESH_OVERLAP = timedelta(minutes=2)
+
+_INDEX_COLUMNS = (
+    Analysis.id, Analysis.user_email, Analysis.business_idea, Analysis.industry,
+    Analysis.location, Analysis.report_language, Analysis.created_at
+)
+
+
+class DuplicateIndex:
+    """MinHash signatures plus LSH band buckets, partitioned by scope"""
+
+    def __init__(self):
+        self.entries = {}   # analysis_id -> (scope, signature, created_at)
+        self.buckets = {}   # scope -> {band key: set of analysis ids}
+
+    def __len__(self):
+        return len(self.entries)
+
+    def add(self, analysis_id, scope, signature, created_at):
+        if analysis_id in self.entries:
+            return
+        self.entries[analysis_id] = (scope, signature, created_at)
+        bands = self.buckets.setdefault(scope, {})
+        for key in band_keys(signature):
+            bands.setdefault(key, set()).add(analysis_id)
+
+    def remove(self, analysis_id):
+        entry = self.entries.pop(analysis_id, None)
+        if entry is None:
+            return
+        scope, signature, _ = entry
+        bands = self.buckets.get(scope, {})
+        for key in band_keys(signature):
+            ids = bands.get(key)
+            if ids is not None:
+                ids.discard(analysis_id)
+                if not ids:
+                    del bands[key]
+        if not bands:
+            self.buckets.pop(scope, None)
+
+    def evict_before(self, cutoff):
+        expired = [analysis_id for analysis_id, (_, _, created_at) in self.entries.items()
+                   if created_at is not None and created_at < cutoff]
+        for analysis_id in expired:
+            self.remove(analysis_id)
+        return len(expired)
+
+    def query(self, scope, signature, threshold, exclude=None):
+        """[(analysis_id, estimated similarity)] at or above `threshold`, most similar first"""
+        bands = self.buckets.get(scope)
+        if not bands:
+            return []
+        candidates = set()
+        for key in band_keys(signature):
+            ids = bands.get(key)
+            if ids:
+                candidates |= ids
+        candidates.discard(exclude)
+
+        matches = []
+        for analysis_id in candidates:
+            similarity = estimate_similarity(signature, self.entries[analysis_id][1])
+            if similarity >= threshold:
+                matches.append((analysis_id, similarity))
+        matches.sort(key=lambda match: match[1], reverse=True)
+        return matches
+
+
+def shingles(text):
+    """Character shingles of the normalized idea (across word boundaries, so word order counts)"""
+    text = ' '.join(normalize(text or '').split())
+    if len(text) <= SHINGLE_SIZE:
+        return {text} if text else set()
+    return {text[i:i + SHINGLE_SIZE] for i in range(len(text) - SHINGLE_SIZE + 1)}
+
+
+def signature(text):
+    """MinHash signature of the idea text, or None when it has no letters"""
+    hashes = [array('I', hashlib.shake_128(shingle.encode('utf-8')).digest(_DIGEST_SIZE))
+              for shingle in shingles(text)]
+    if not hashes:
+        return None
+    return array('I', map(min, zip(*hashes)))
+
+
+def band_keys(sig):
+    for band in range(BANDS):
+        start = band * ROWS_PER_BAND
+        yield hash((band, *sig[start:start + ROWS_PER_BAND]))
+
+
+def estimate_similarity(sig, other):
+    """Estimated Jaccard similarity of two signatures"""
+    return sum(1 for x, y in zip(sig, other) if x == y) / NUM_PERM
+
+
+def idea_scope(user_email, industry, location, report_language):
+    """Only analyses with the same owner and report inputs count as duplicates"""
+    return (
+        user_email,
+        (industry or '').strip().lower(),
+        (location or '').strip().lower(),
+        (report_language or 'english').strip().lower(),
+    )
+
+
+class _UserIndex:
+    __slots__ = ('index', 'loaded_at')
+
+    def __init__(self, index, loaded_at):
+        self.index = index
+        self.loaded_at = loaded_at
+
+
+_users = OrderedDict()  # user_email -> _UserIndex, least recently used first
+_users_lock = threading.Lock()
+_entry_count = 0
+
+
+def user_ideas_query(user_email, since):
+    """A user's recent ideas, newest first (served by ix_analyses_user_created)"""
+    return db.session.query(*_INDEX_COLUMNS).filter(
+        Analysis.user_email == user_email, Analysis.created_at >= since, Analysis.is_deleted == False
+    ).order_by(Analysis.created_at.desc())
+
+
+def _add_rows(index, rows):
+    added = 0
+    for row in rows:
+        sig = signature(row.business_idea)
+        if sig is None or row.id in index.entries:
+            continue
+        index.add(row.id, idea_scope(row.user_email, row.industry, row.location, row.report_language),
+                  sig, row.created_at)
+        added += 1
+    return added
+
+
+def _evict_users():
+    """Drop least recently used users until the entry cap holds. Caller holds _users_lock."""
+    global _entry_count
+    max_entries = current_app.config.get('DUPLICATE_IDEA_MAX_ENTRIES', 5000)
+    while _entry_count > max_entries and len(_users) > 1:
+        _, evicted = _users.popitem(last=False)
+        _entry_count -= len(evicted.index)
+
+
+def _user_index(user_email):
+    """
+    This user's index: loaded on first use with one indexed query (newest
+    DUPLICATE_IDEA_MAX_PER_USER analyses of the window), topped up with
+    analyses created since the last load once it is DUPLICATE_IDEA_REFRESH_SECONDS
+    old, so analyses created by other workers are seen.
+    """
+    global _entry_count
+    config = current_app.config
+    now = datetime.utcnow()
+    with _users_lock:
+        cached = _users.get(user_email)
+        if cached is not None:
+            _users.move_to_end(user_email)
+            if now - cached.loaded_at < timedelta(seconds=config.get('DUPLICATE_IDEA_REFRESH_SECONDS', 30)):
+                return cached.index
+
+    window_start = now - timedelta(days=config.get('DUPLICATE_IDEA_WINDOW_DAYS', 90))
+    if cached is None:
+        index = DuplicateIndex()
+        added = _add_rows(index, user_ideas_query(user_email, window_start)
+                          .limit(config.get('DUPLICATE_IDEA_MAX_PER_USER', 200)))
+    else:
+        index = cached.index
+        since = max(cached.loaded_at - _REFRESH_OVERLAP, window_start)
+        rows = user_ideas_query(user_email, since).all()
+        with _users_lock:
+            added = _add_rows(index, rows)
+            dropped = index.evict_before(window_start)
+        added -= dropped
+
+    with _users_lock:
+        if _users.get(user_email) is not cached:
+            return index  # loaded concurrently; keep the other copy
+        _users[user_email] = _UserIndex(index, now)
+        _users.move_to_end(user_email)
+        _entry_count += added
+        _evict_users()
+    return index
+
+
+def index_analysis(analysis):
+    """Add a newly created analysis to its owner's index, if this worker holds it"""
+    global _entry_count
+    sig = signature(analysis.business_idea)
+    if sig is None:
+        return
+    scope = idea_scope(analysis.user_email, analysis.industry, analysis.location, analysis.report_language)
+    with _users_lock:
+        cached = _users.get(analysis.user_email)
+        if cached is not None and analysis.id not in cached.index.entries:
+            cached.index.add(analysis.id, scope, sig, analysis.created_at or datetime.utcnow())
+            _entry_count += 1
+            _evict_users()
+
+
+def forget_analysis(user_email, analysis_id):
+    global _entry_count
+    with _users_lock:
+        cached = _users.get(user_email)
+        if cached is not None and analysis_id in cached.index.entries:
+            cached.index.remove(analysis_id)
+            _entry_count -= 1
+
+
+def find_duplicate_ids(user_email, business_idea, industry=None, location=None, report_language=None,
+                       exclude_id=None, limit=5):
+    """
+    Analyses of the same user whose idea is a near-duplicate of `business_idea`.
+    Index lookup only, apart from loading or topping up the user's index.
+
+    Returns:
+        list: [(analysis_id, similarity)], most similar first
+    """
+    if not current_app.config.get('DUPLICATE_IDEA_DETECTION_ENABLED', True):
+        return []
+    sig = signature(business_idea)
+    if sig is None:
+        return []
+    index = _user_index(user_email)
+    threshold = current_app.config.get('DUPLICATE_IDEA_THRESHOLD', 0.6)
+    scope = idea_scope(user_email, industry, location, report_language)
+    with _users_lock:
+        return index.query(scope, sig, threshold, exclude=exclude_id)[:limit]
+
+
+def find_duplicate_analyses(user_email, business_idea, industry=None, location=None, report_language=None,
+                            exclude_id=None, limit=5):
+    """
+    Like find_duplicate_ids(), re-read from the database with each match's
+    completed tabs, for offering reuse to the client. Deleted analyses are dropped.
+    """
+    matches = find_duplicate_ids(user_email, business_idea, industry, location, report_language,
+                                 exclude_id=exclude_id, limit=limit)
+    if not matches:
+        return []
+
+    ids = [analysis_id for analysis_id, _ in matches]
+    rows = {
+        row.id: row for row in db.session.query(
+            Analysis.id, Analysis.business_idea, Analysis.report_type, Analysis.created_at
+        ).filter(Analysis.id.in_(ids), Analysis.user_email == user_email, Analysis.is_deleted == False)
+    }
+    tab_rows = {}
+    for row in get_tab_status_rows(list(rows)):
+        tab_rows.setdefault(row.analysis_id, []).append(row)
+
+    duplicates = []
+    for analysis_id, similarity in matches:
+        row = rows.get(analysis_id)
+        if row is None:
+            forget_analysis(user_email, analysis_id)
+            continue
+        states = summarize_tabs(tab_rows.get(analysis_id, []))
+        duplicates.append({
+            'id': row.id,
+            'business_idea': row.business_idea,
+            'report_type': row.report_type,
+            'created_at': row.created_at,
+            'similarity': round(similarity, 2),
+            'completed_tabs': [name for name, state in states.items() if state['status'] == 'completed'],
+        })
+    return duplicates
+
+
+def benchmark(size=20000, seed=7311):
+    """
+    Index `size` synthetic analyses spread over 200 users (seed ideas with
+    random suffixes), then look up typo'd and reworded copies of indexed ideas
+    and unrelated ideas. Reports recall, false matches and lookup latency.
+    """
+    import time
+    from server.services.idea_samples import IDEAS_AR, IDEAS_EN
+
+    rng = random.Random(seed)
+    ideas = IDEAS_EN + IDEAS_AR
+    suffixes = ['in Riyadh', 'for students', 'for families', 'with home delivery', 'for small shops',
+                'في الرياض', 'للطلاب', 'للعائلات', 'مع توصيل للمنازل']
+
+    def typo(text):
+        i = rng.randrange(len(text))
+        return text[:i] + text[i + 1:]
+
+    index = DuplicateIndex()
+    stored = []
+    build_started = time.perf_counter()
+    for n in range(size):
+        text = f'{rng.choice(ideas)} {rng.choice(suffixes)}'
+        scope = idea_scope(f'user{n % 200}@example.com', 'Other', '', 'english')
+        index.add(str(n), scope, signature(text), None)
+        stored.append((str(n), scope, text))
+    build_seconds = time.perf_counter() - build_started
+
+    lookups = []
+    for analysis_id, scope, text in rng.sample(stored, 500):
+        lookups.append(('typo', analysis_id, scope, typo(typo(text))))
+        lookups.append(('reworded', analysis_id, scope, text.replace(' for ', ' aimed at ').replace(' with ', ' and ')))
+        lookups.append(('unrelated', None, scope, f'{rng.choice(ideas)} {rng.choice(suffixes)} {rng.randrange(10**6)}'))
+
+    found = {'typo': 0, 'reworded': 0}
+    false_matches = 0
+    timings = []
+    for kind, analysis_id, scope, text in lookups:
+        started = time.perf_counter()
+        matches = index.query(scope, signature(text), 0.6)
+        timings.append((time.perf_counter() - started) * 1e6)
+        matched = {match_id for match_id, _ in matches}
+        if analysis_id is not None:
+            found[kind] += analysis_id in matched
+        else:
+            # Same seed idea and suffix in the same scope is a genuine duplicate, not a false match
+            false_matches += sum(1 for match_id in matched
+                                 if stored[int(match_id)][2].split()[:3] != text.split()[:3])
+
+    timings.sort()
+    print(f"Indexed {size} analyses in {build_seconds:.2f}s")
+    print(f"Recall: typo {found['typo'] / 500:.3f}, reworded {found['reworded'] / 500:.3f}")
+    print(f"Unrelated ideas matched to a different idea: {false_matches}")
+    print(f"Lookup latency (signature + query): p50 {timings[len(timings) // 2]:.0f} us, "
+          f"p95 {timings[int(len(timings) * 0.95)]:.0f} us, max {timings[-1]:.0f} us")
+
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Near-duplicate idea index')
+    parser.add_argument('command', choices=['benchmark'])
+    parser.add_argument('--size', type=int, default=20000)
+    args = parser.parse_args()
+    benchmark(args.size)
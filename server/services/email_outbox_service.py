@@ -0,0 +1,180 @@
+"""
+Transactional email outbox.
+Emails are written to the `email_outbox` table in the same transaction as the
+business change that triggers them, then delivered by a background dispatcher
+in batches over a pooled keep-alive HTTP session. Failed sends are retried with
+exponential backoff and dead-lettered once they run out of attempts.
+"""
+import threading
+from datetime import datetime, timedelta
+
+from sqlalchemy import event
+
+from server.models import db, EmailOutbox
+
+# How long a claimed row stays reserved before another dispatcher may pick it up again
+CLAIM_LEASE_SECONDS = 120
+
+_dispatcher_thread = None
+_dispatcher_lock = threading.Lock()
+_wake_event = threading.Event()
+
+
+def queue_email(to_email, to_name, subject, html_body, commit=True):
+    """
+    Add an email to the outbox.
+
+    With commit=True (the default) the session is committed, including any
+    changes the caller has pending, and the dispatcher is woken. Inside a
+    request that is still building its own changes pass commit=False; the
+    email is then sent only if the caller commits.
+
+    Returns:
+        tuple: (success: bool, error_message: str or None)
+    """
+    try:
+        db.session.add(EmailOutbox(
+            to_email=to_email,
+            to_name=to_name,
+            subject=subject,
+            html_body=html_body,
+            status='pending',
+            next_attempt_at=datetime.utcnow()
+        ))
+        if commit:
+            db.session.commit()
+            wake_dispatcher()
+        else:
+            event.listen(db.session(), 'after_commit', lambda session: wake_dispatcher(), once=True)
+        return True, None
+    except Exception as e:
+        if commit:
+            db.session.rollback()
+        error_msg = f"Failed to queue email: {str(e)}"
+        print(error_msg)
+        return False, error_msg
+
+
+def wake_dispatcher():
+    """Ask the dispatcher to run a batch now instead of waiting for the next tick"""
+    _wake_event.set()
+
+
+def _retry_delay(attempts, base_seconds):
+    return timedelta(seconds=base_seconds * (2 ** max(attempts - 1, 0)))
+
+
+def _claim_batch(batch_size):
+    """Reserve due rows so concurrent dispatchers (other workers) skip them"""
+    now = datetime.utcnow()
+    query = EmailOutbox.query.filter(
+        EmailOutbox.status.in_(['pending', 'sending']),
+        EmailOutbox.next_attempt_at <= now
+    ).order_by(EmailOutbox.next_attempt_at).limit(batch_size)
+
+    if db.engine.dialect.name == 'postgresql':
+        query = query.with_for_update(skip_locked=True)
+
+    rows = query.all()
+    lease_until = now + timedelta(seconds=CLAIM_LEASE_SECONDS)
+    for row in rows:
+        row.status = 'sending'
+        row.next_attempt_at = lease_until
+    db.session.commit()
+    return rows
+
+
+def dispatch_pending_emails(batch_size=None):
+    """
+    Deliver one batch of due emails. Must run inside an app context.
+
+    Returns:
+        dict: counts of sent, retried and dead-lettered emails
+    """
+    from flask import current_app
+    from server.services.email_service import deliver_email
+
+    config = current_app.config
+    batch_size = batch_size or config.get('EMAIL_DISPATCH_BATCH_SIZE', 25)
+    max_attempts = config.get('EMAIL_MAX_ATTEMPTS', 6)
+    base_seconds = config.get('EMAIL_RETRY_BASE_SECONDS', 30)
+
+    result = {'sent': 0, 'retried': 0, 'dead': 0}
+    rows = _claim_batch(batch_size)
+
+    for row in rows:
+        success, error, retryable = deliver_email(row.to_email, row.to_name, row.subject, row.html_body)
+        row.attempts = (row.attempts or 0) + 1
+        now = datetime.utcnow()
+
+        if success:
+            row.status = 'sent'
+            row.sent_at = now
+            row.last_error = None
+            result['sent'] += 1
+        elif retryable and row.attempts < max_attempts:
+            row.status = 'pending'
+            row.last_error = error
+            row.next_attempt_at = now + _retry_delay(row.attempts, base_seconds)
+            result['retried'] += 1
+        else:
+            row.status = 'dead'
+            row.last_error = error
+            result['dead'] += 1
+            print(f"Email to {row.to_email} dead-lettered after {row.attempts} attempt(s): {error}")
+
+        db.session.commit()
+
+    return result
+
+
+def retry_email(email_id):
+    """Requeue a dead or pending email for immediate delivery"""
+    row = EmailOutbox.query.get(email_id)
+    if not row or row.status == 'sent':
+        return None
+    row.status = 'pending'
+    row.next_attempt_at = datetime.utcnow()
+    db.session.commit()
+    wake_dispatcher()
+    return row
+
+
+def _dispatcher_loop(app):
+    interval = app.config.get('EMAIL_DISPATCH_INTERVAL_SECONDS', 2)
+    batch_size = app.config.get('EMAIL_DISPATCH_BATCH_SIZE', 25)
+
+    while True:
+        _wake_event.wait(interval)
+        _wake_event.clear()
+
+        with app.app_context():
+            try:
+                # Keep draining while full batches come back
+                while True:
+                    result = dispatch_pending_emails(batch_size)
+                    if sum(result.values()) < batch_size:
+                        break
+            except Exception as e:
+                db.session.rollback()
+                print(f"Email dispatcher error: {str(e)}")
+            finally:
+                db.session.remove()
+
+
+def start_email_dispatcher(app):
+    """Start the background dispatcher thread once per process"""
+    global _dispatcher_thread
+
+    with _dispatcher_lock:
+        if _dispatcher_thread is not None and _dispatcher_thread.is_alive():
+            return _dispatcher_thread
+
+        _dispatcher_thread = threading.Thread(
+            target=_dispatcher_loop,
+            args=(app,),
+            name='email-dispatcher',
+            daemon=True
+        )
+        _dispatcher_thread.start()
+        return _dispatcher_thread
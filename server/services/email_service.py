@@ -1,29 +1,47 @@
 import os
-import requests
 import json
+from server.utils.lazy_imports import lazy_import
+
+requests = lazy_import('requests')
 
 ZEPTOMAIL_API_URL =  os.environ.get('ZEPTOMAIL_API_URL')
 ZEPTOMAIL_API_KEY = os.environ.get('ZEPTOMAIL_API_KEY')
 SENDER_EMAIL = os.environ.get('ZEPTOMAIL_SENDER_EMAIL', 'no.reply@planlyze.com')
 SENDER_NAME = os.environ.get('ZEPTOMAIL_SENDER_NAME', 'Planlyze')
 
-def send_email(to_email, to_name, subject, html_body):
+_http_session = None
+
+
+def get_http_session():
     """
-    Centralized email sending function used across the platform.
-    All email sending should go through this function.
+    Shared keep-alive HTTP session for the mail provider.
+    Reusing the connection pool avoids a TLS handshake per email.
+    """
+    global _http_session
+    if _http_session is None:
+        session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(pool_connections=2, pool_maxsize=10)
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        session.headers.update({
+            'Accept': "application/json",
+            'Content-Type': "application/json",
+        })
+        _http_session = session
+    return _http_session
+
+
+def deliver_email(to_email, to_name, subject, html_body):
+    """
+    Post a single email to ZeptoMail right now, bypassing the outbox.
+    Used by the outbox dispatcher and as a fallback when the outbox is disabled.
     
-    Args:
-        to_email: Recipient email address
-        to_name: Recipient name (optional)
-        subject: Email subject
-        html_body: HTML content of the email
-        
     Returns:
-        tuple: (success: bool, error_message: str or None)
+        tuple: (success: bool, error_message: str or None, retryable: bool)
     """
     if not ZEPTOMAIL_API_KEY:
         print("Warning: ZEPTOMAIL_API_KEY not configured, skipping email send")
-        return False, "Email provider not configured"
+        return False, "Email provider not configured", False
     
     payload = {
         "from": {
@@ -43,37 +61,67 @@ def send_email(to_email, to_name, subject, html_body):
     }
     
     headers = {
-        'Accept': "application/json",
-        'Content-Type': "application/json",
         'Authorization': ZEPTOMAIL_API_KEY
     }
     
     try:
-        response = requests.post(
+        response = get_http_session().post(
             ZEPTOMAIL_API_URL, 
             json=payload, 
             headers=headers,
-            timeout=30
+            timeout=(5, 30)
         )
         
         if response.status_code in [200, 201]:
             print(f"Email sent successfully to {to_email}")
-            return True, None
+            return True, None, False
         else:
             error_msg = f"ZeptoMail error {response.status_code}: {response.text}"
             print(error_msg)
-            return False, error_msg
+            retryable = response.status_code == 429 or response.status_code >= 500
+            return False, error_msg, retryable
     except requests.exceptions.Timeout:
         error_msg = "Email sending timed out"
         print(error_msg)
-        return False, error_msg
+        return False, error_msg, True
     except Exception as e:
         error_msg = f"Email send error: {str(e)}"
         print(error_msg)
-        return False, error_msg
+        return False, error_msg, True
+
+
+def send_email(to_email, to_name, subject, html_body, commit=True):
+    """
+    Centralized email sending function used across the platform.
+    All email sending should go through this function.
+    
+    When the outbox is enabled the email is written to the `email_outbox` table
+    and delivered by the background dispatcher, so the caller never waits on the
+    mail provider. Pass commit=False to enlist the email in the caller's
+    transaction; it is then only sent if the caller commits.
+    
+    Args:
+        to_email: Recipient email address
+        to_name: Recipient name (optional)
+        subject: Email subject
+        html_body: HTML content of the email
+        commit: Commit the session after queueing (default True). This
+            commits everything pending in the session, not just the email.
+        
+    Returns:
+        tuple: (success: bool, error_message: str or None)
+    """
+    from flask import current_app, has_app_context
+    
+    if not has_app_context() or not current_app.config.get('EMAIL_OUTBOX_ENABLED', False):
+        success, error, _ = deliver_email(to_email, to_name, subject, html_body)
+        return success, error
+    
+    from server.services.email_outbox_service import queue_email
+    return queue_email(to_email, to_name, subject, html_body, commit=commit)
 
 
-def send_verification_email(to_email, to_name, otp_code, lang='en'):
+def send_verification_email(to_email, to_name, otp_code, lang='en', commit=True):
     """Send OTP verification email"""
     if lang == 'ar':
         subject = "رمز التحقق الخاص بك - Planlyze"
@@ -118,11 +166,11 @@ def send_verification_email(to_email, to_name, otp_code, lang='en'):
         </div>
         """
     
-    success, error = send_email(to_email, to_name, subject, html_body)
+    success, error = send_email(to_email, to_name, subject, html_body, commit=commit)
     return success
 
 
-def send_password_reset_code_email(to_email, to_name, reset_code, lang='en'):
+def send_password_reset_code_email(to_email, to_name, reset_code, lang='en', commit=True):
     """Send password reset code email"""
     if lang == 'ar':
         subject = "رمز إعادة تعيين كلمة المرور - Planlyze"
@@ -167,7 +215,7 @@ def send_password_reset_code_email(to_email, to_name, reset_code, lang='en'):
         </div>
         """
     
-    success, error = send_email(to_email, to_name, subject, html_body)
+    success, error = send_email(to_email, to_name, subject, html_body, commit=commit)
     return success
 
 
@@ -343,34 +391,15 @@ def send_referral_bonus_email_to_referrer(referrer_email, referrer_name, referre
 
 
 def get_template_and_send(template_key, to_email, to_name, variables, lang='en'):
-    """Get email template from database and send email with variable substitution"""
-    import re
-    from server.models import EmailTemplate
+    """Render a cached, precompiled email template and send it"""
+    from server.services.email_template_service import render_email_template
     
-    template = EmailTemplate.query.filter_by(template_key=template_key, is_active=True).first()
-    if not template:
+    rendered = render_email_template(template_key, variables, lang)
+    if not rendered:
         print(f"Email template '{template_key}' not found or inactive")
         return False, f"Template '{template_key}' not found"
     
-    subject = template.subject_ar if lang == 'ar' else template.subject_en
-    body = template.body_ar if lang == 'ar' else template.body_en
-    
-    for key, value in variables.items():
-        subject = subject.replace('{{' + key + '}}', str(value) if value else '')
-        body = body.replace('{{' + key + '}}', str(value) if value else '')
-    
-    def process_conditionals(text, vars_dict):
-        pattern = r'\{\{#if (\w+)\}\}(.*?)\{\{/if\}\}'
-        def replacer(match):
-            condition_var = match.group(1)
-            content = match.group(2)
-            if vars_dict.get(condition_var):
-                return content
-            return ''
-        return re.sub(pattern, replacer, text, flags=re.DOTALL)
-    
-    body = process_conditionals(body, variables)
-    
+    subject, body = rendered
     return send_email(to_email, to_name, subject, body)
 
 
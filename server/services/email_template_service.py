@@ -0,0 +1,143 @@
+"""
+Compiled email template cache.
+Templates are parsed once into a list of text / placeholder / {{#if}} nodes and
+cached per (template_key, language), so rendering an email is a single pass over
+pre-split parts with no database read and no regex work. The cache is cleared
+when templates are created or updated through the admin endpoints; a TTL acts
+as a backstop for other worker processes.
+"""
+import re
+import threading
+import time
+
+# {{#if var}} ... {{/if}} blocks (not nested) and {{var}} placeholders
+_TOKEN_PATTERN = re.compile(r'\{\{#if (\w+)\}\}(.*?)\{\{/if\}\}|\{\{([^{}#/][^{}]*)\}\}', re.DOTALL)
+
+_cache = {}
+_cache_lock = threading.Lock()
+
+
+def normalize_language(lang):
+    """Map 'ar' / 'arabic' to 'ar' and everything else to 'en'"""
+    return 'ar' if (lang or '').lower() in ['ar', 'arabic'] else 'en'
+
+
+def _format_value(value):
+    return str(value) if value else ''
+
+
+def compile_template(text):
+    """
+    Parse template text into a render function.
+    The function takes a variables dict and returns the rendered string;
+    placeholders without a matching variable are left as-is.
+    """
+    nodes = _parse(text or '')
+
+    def render(variables):
+        return ''.join(_render_nodes(nodes, variables))
+
+    return render
+
+
+def _parse(text, allow_blocks=True):
+    nodes = []
+    pos = 0
+    for match in _TOKEN_PATTERN.finditer(text):
+        if match.start() > pos:
+            nodes.append(('text', text[pos:match.start()]))
+        if match.group(1) is not None:
+            if allow_blocks:
+                nodes.append(('if', match.group(1), _parse(match.group(2), allow_blocks=False)))
+            else:
+                nodes.append(('text', match.group(0)))
+        else:
+            nodes.append(('var', match.group(3), match.group(0)))
+        pos = match.end()
+    if pos < len(text):
+        nodes.append(('text', text[pos:]))
+    return nodes
+
+
+def _render_nodes(nodes, variables):
+    for node in nodes:
+        kind = node[0]
+        if kind == 'text':
+            yield node[1]
+        elif kind == 'var':
+            if node[1] in variables:
+                yield _format_value(variables[node[1]])
+            else:
+                yield node[2]
+        elif variables.get(node[1]):
+            yield from _render_nodes(node[2], variables)
+
+
+class CompiledEmailTemplate:
+    """Subject and body render functions for one template in one language"""
+
+    def __init__(self, template_key, subject, body, is_active):
+        self.template_key = template_key
+        self.is_active = is_active
+        self._subject = compile_template(subject)
+        self._body = compile_template(body)
+
+    def render(self, variables=None):
+        """Return (subject, html_body)"""
+        variables = variables or {}
+        return self._subject(variables), self._body(variables)
+
+
+def _cache_ttl():
+    from flask import current_app, has_app_context
+    if has_app_context():
+        return current_app.config.get('EMAIL_TEMPLATE_CACHE_TTL_SECONDS', 300)
+    return 300
+
+
+def get_compiled_template(template_key, lang='en'):
+    """
+    Get the compiled template for a key and language, loading it from the
+    database on first use. Returns None if the template does not exist.
+    """
+    from server.models import EmailTemplate
+
+    lang = normalize_language(lang)
+    cache_key = (template_key, lang)
+    now = time.monotonic()
+
+    entry = _cache.get(cache_key)
+    if entry and entry[0] > now:
+        return entry[1]
+
+    template = EmailTemplate.query.filter_by(template_key=template_key).first()
+    compiled = None
+    if template:
+        subject = template.subject_ar if lang == 'ar' else template.subject_en
+        body = template.body_ar if lang == 'ar' else template.body_en
+        compiled = CompiledEmailTemplate(template_key, subject, body, template.is_active)
+
+    with _cache_lock:
+        _cache[cache_key] = (now + _cache_ttl(), compiled)
+    return compiled
+
+
+def render_email_template(template_key, variables=None, lang='en', active_only=True):
+    """
+    Render a template to (subject, html_body).
+    Returns None if the template is missing (or inactive when active_only).
+    """
+    compiled = get_compiled_template(template_key, lang)
+    if not compiled or (active_only and not compiled.is_active):
+        return None
+    return compiled.render(variables)
+
+
+def invalidate_template_cache(template_key=None):
+    """Drop cached templates, either for one key or all of them"""
+    with _cache_lock:
+        if template_key is None:
+            _cache.clear()
+        else:
+            for cache_key in [k for k in _cache if k[0] == template_key]:
+                _cache.pop(cache_key, None)
@@ -0,0 +1,377 @@
+"""
+Local fast path for business idea validation.
+A character n-gram Naive Bayes classifier (English and Arabic) scores an idea
+before any Claude call. Ideas scoring above the accept threshold, or below
+the reject threshold, are answered locally in well under a millisecond; only
+the uncertain middle goes to the model. The thresholds are chosen from
+cross-validated scores so that local decisions keep TARGET_PRECISION, and
+the measured precision is reported as the verdict's confidence.
+
+The trained model is a JSON file (server/data/idea_classifier.json), loaded
+on the first validation. Claude's verdicts are recorded in
+`idea_validations`, so the model can be retrained on real outcomes:
+
+    python -m server.services.idea_classifier train [--from-db] [--out PATH]
+    python -m server.services.idea_classifier benchmark [--folds 5] [--from-db]
+
+The seed corpus is services/idea_samples.py. --from-db adds the recorded
+verdicts and needs DATABASE_URL.
+"""
+import json
+import math
+import os
+import random
+import re
+import threading
+
+MODEL_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data', 'idea_classifier.json')
+
+NGRAM_SIZES = (2, 3, 4)
+SMOOTHING = 0.5
+MIN_NGRAM_COUNT = 2
+TARGET_PRECISION = 0.99
+
+_ARABIC_MARKS = re.compile('[\u0610-\u061a\u064b-\u065f\u0670\u06d6-\u06ed\u0640]')  # harakat, tatweel
+_ARABIC_FOLD = str.maketrans({'أ': 'ا', 'إ': 'ا', 'آ': 'ا', 'ى': 'ي', 'ة': 'ه', 'ؤ': 'و', 'ئ': 'ي'})
+_NON_LETTERS = re.compile('[^a-z\u0621-\u064a]+')
+
+# Idea accepted locally only if it names its selected industry; otherwise Claude checks the match
+INDUSTRY_KEYWORDS = {
+    'Delivery': ['deliver', 'courier', 'parcel', 'package', 'shipping', 'logistic', 'توصيل', 'شحن', 'طرود', 'نقل'],
+    'BeautyEcommerce': ['beauty', 'cosmetic', 'skincare', 'makeup', 'perfume', 'salon', 'تجميل', 'مكياج', 'عطور', 'بشره', 'صالون'],
+    'ClothesEcommerce': ['cloth', 'fashion', 'apparel', 'dress', 'shoe', 'wear', 'ملابس', 'ازياء', 'فساتين', 'احذيه', 'تيشيرت'],
+    'ElectronicsEcommerce': ['electronic', 'phone', 'laptop', 'gadget', 'computer', 'الكترونيات', 'موبايل', 'لابتوب', 'جوال', 'كمبيوتر'],
+    'FoodEcommerce': ['food', 'meal', 'bakery', 'sweets', 'snack', 'honey', 'spice', 'طعام', 'وجبات', 'اكلات', 'حلويات', 'مخبز', 'عسل', 'بهارات'],
+    'MedicineEcommerce': ['medicine', 'pharmac', 'drug', 'medical', 'ادويه', 'دواء', 'صيدلي', 'طبي'],
+    'StuffEcommerce': ['store', 'shop', 'marketplace', 'ecommerce', 'متجر', 'سوق', 'محل'],
+    'SupermarketEcommerce': ['supermarket', 'grocer', 'سوبرماركت', 'بقاله', 'خضار'],
+    'GeneralHealth': ['health', 'clinic', 'doctor', 'medical', 'therap', 'fitness', 'صحه', 'صحي', 'عياده', 'طبيب', 'اطباء', 'علاج'],
+    'SellRentCars': ['car', 'vehicle', 'automotive', 'سيار', 'مركبات'],
+    'SellRentRealestate': ['real estate', 'apartment', 'property', 'rent', 'house', 'عقار', 'شقق', 'شقه', 'منازل', 'ايجار', 'تاجير'],
+    'ServicesTaxi': ['taxi', 'ride', 'driver', 'transport', 'تكسي', 'تاكسي', 'سائق', 'نقل', 'ركاب'],
+    'JobOppurtunity': ['job', 'recruit', 'hiring', 'career', 'freelanc', 'employ', 'وظائف', 'وظيفه', 'توظيف', 'عمل'],
+}
+
+
+def normalize(text):
+    """Lowercase, Arabic letter variants folded, marks and non-letters dropped"""
+    text = _ARABIC_MARKS.sub('', text.lower()).translate(_ARABIC_FOLD)
+    return _NON_LETTERS.sub(' ', text).strip()
+
+
+def ngrams(text):
+    """Character n-grams of each word, padded with spaces at the word edges"""
+    grams = []
+    for word in normalize(text).split():
+        padded = f' {word} '
+        for n in NGRAM_SIZES:
+            grams.extend(padded[i:i + n] for i in range(len(padded) - n + 1))
+    return grams
+
+
+def industry_matches(text, industry):
+    """True when the idea mentions a keyword of the selected industry"""
+    keywords = INDUSTRY_KEYWORDS.get(industry)
+    if not keywords:
+        return False
+    normalized = normalize(text)
+    words = normalized.split()
+    for keyword in keywords:
+        if ' ' in keyword or not keyword.isascii():
+            # Arabic words carry prefixes (ال، و، ب...), so match inside words
+            if keyword in normalized:
+                return True
+        elif any(word.startswith(keyword) for word in words):
+            return True
+    return False
+
+
+class IdeaClassifier:
+    """Mean per-n-gram log-likelihood ratio (idea vs not an idea) with two thresholds"""
+
+    def __init__(self, weights, unseen_weight, accept_at=math.inf, reject_at=-math.inf,
+                 accept_precision=None, reject_precision=None, meta=None):
+        self.weights = weights
+        self.unseen_weight = unseen_weight
+        self.accept_at = accept_at
+        self.reject_at = reject_at
+        self.accept_precision = accept_precision
+        self.reject_precision = reject_precision
+        self.meta = meta or {}
+
+    def score(self, text):
+        grams = ngrams(text)
+        if not grams:
+            return None
+        weights = self.weights
+        unseen = self.unseen_weight
+        return sum(weights.get(gram, unseen) for gram in grams) / len(grams)
+
+    def classify(self, text):
+        """
+        Returns:
+            tuple: (True, confidence) to accept, (False, confidence) to reject,
+            or (None, score) when the text should go to Claude
+        """
+        score = self.score(text)
+        if score is None:
+            return None, None
+        if score >= self.accept_at:
+            return True, self.accept_precision
+        if score <= self.reject_at:
+            return False, self.reject_precision
+        return None, score
+
+    @classmethod
+    def train(cls, samples, min_count=MIN_NGRAM_COUNT):
+        """Multinomial Naive Bayes weights from (text, is_idea) pairs; thresholds unset"""
+        counts = {True: {}, False: {}}
+        for text, label in samples:
+            table = counts[bool(label)]
+            for gram in ngrams(text):
+                table[gram] = table.get(gram, 0) + 1
+
+        vocabulary = {gram for table in counts.values() for gram, count in table.items()}
+        vocabulary = {gram for gram in vocabulary
+                      if counts[True].get(gram, 0) + counts[False].get(gram, 0) >= min_count}
+        size = len(vocabulary) + 1  # +1 for the unseen bucket
+        totals = {label: sum(table.get(gram, 0) for gram in vocabulary) + SMOOTHING * size
+                  for label, table in counts.items()}
+
+        def log_ratio(idea_count, other_count):
+            return (math.log((idea_count + SMOOTHING) / totals[True])
+                    - math.log((other_count + SMOOTHING) / totals[False]))
+
+        weights = {gram: round(log_ratio(counts[True].get(gram, 0), counts[False].get(gram, 0)), 4)
+                   for gram in vocabulary}
+        return cls(weights, round(log_ratio(0, 0), 4))
+
+    @classmethod
+    def fit(cls, samples, folds=5, seed=7311):
+        """Train on all samples, with thresholds chosen from out-of-fold scores"""
+        scored = cross_validated_scores(samples, folds, seed)
+        model = cls.train(samples)
+        model.accept_at, model.accept_precision = _threshold(scored, True)
+        model.reject_at, model.reject_precision = _threshold(scored, False)
+        if model.reject_at >= model.accept_at:
+            model.reject_at = model.accept_at - 1e-9
+        model.meta = {
+            'samples': len(samples),
+            'ideas': sum(1 for _, label in samples if label),
+            'ngram_sizes': list(NGRAM_SIZES),
+            'target_precision': TARGET_PRECISION,
+        }
+        return model
+
+    def to_dict(self):
+        return {
+            'meta': self.meta,
+            'accept_at': self.accept_at,
+            'reject_at': self.reject_at,
+            'accept_precision': self.accept_precision,
+            'reject_precision': self.reject_precision,
+            'unseen_weight': self.unseen_weight,
+            'weights': self.weights,
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data['weights'], data['unseen_weight'], data['accept_at'], data['reject_at'],
+                   data.get('accept_precision'), data.get('reject_precision'), data.get('meta'))
+
+    def save(self, path=MODEL_PATH):
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f, ensure_ascii=False, separators=(',', ':'), sort_keys=True)
+
+
+def _folds(samples, folds, seed):
+    order = list(range(len(samples)))
+    random.Random(seed).shuffle(order)
+    return [order[k::folds] for k in range(folds)]
+
+
+def cross_validated_scores(samples, folds=5, seed=7311):
+    """(score, is_idea) for every sample, each scored by a model that did not see it"""
+    scored = []
+    for held_out in _folds(samples, folds, seed):
+        held = set(held_out)
+        model = IdeaClassifier.train([s for i, s in enumerate(samples) if i not in held])
+        for i in held_out:
+            text, label = samples[i]
+            score = model.score(text)
+            if score is not None:
+                scored.append((score, bool(label)))
+    return scored
+
+
+def _threshold(scored, label):
+    """
+    Loosest threshold whose side (>= for ideas, <= for non-ideas) still has
+    TARGET_PRECISION. Returns (threshold, precision); an infinite threshold
+    disables that side.
+    """
+    ordered = sorted(scored, key=lambda item: item[0], reverse=label)
+    best = (math.inf if label else -math.inf, None)
+    correct = 0
+    for decided, (score, truth) in enumerate(ordered, start=1):
+        correct += truth == label
+        precision = correct / decided
+        if precision >= TARGET_PRECISION and decided >= 10:
+            best = (score, round(precision, 3))
+    return best
+
+
+_model = None
+_model_lock = threading.Lock()
+
+
+def get_classifier():
+    """The trained model, loaded once per process; None if the file is missing"""
+    global _model
+    if _model is None:
+        with _model_lock:
+            if _model is None:
+                try:
+                    with open(MODEL_PATH, encoding='utf-8') as f:
+                        _model = IdeaClassifier.from_dict(json.load(f))
+                except FileNotFoundError:
+                    _model = False
+    return _model or None
+
+
+def classify_idea(text, industry=None):
+    """
+    Local verdict for an idea that passed the gibberish heuristics.
+
+    Returns:
+        tuple: (True/False, confidence) when confident, (None, None) to ask Claude.
+        An accept needs the idea to name its industry (when one is selected).
+    """
+    model = get_classifier()
+    if model is None:
+        return None, None
+    verdict, confidence = model.classify(text)
+    if verdict is None:
+        return None, None
+    if verdict and industry and not industry_matches(text, industry):
+        return None, None
+    return verdict, confidence
+
+
+def record_validation_outcome(business_idea, language, industry, valid, industry_match, confidence):
+    """Keep Claude's verdict as training data. Never raises."""
+    from server.models import db, IdeaValidation
+
+    try:
+        db.session.add(IdeaValidation(
+            business_idea=business_idea[:2000],
+            language=language,
+            industry=industry,
+            valid=bool(valid),
+            industry_match=industry_match,
+            confidence=confidence,
+        ))
+        db.session.commit()
+    except Exception as e:
+        db.session.rollback()
+        print(f"Error recording idea validation: {e}")
+
+
+def load_samples(from_db=False):
+    """Seed corpus, plus recorded Claude verdicts with --from-db"""
+    from server.services.idea_samples import seed_samples
+
+    samples = seed_samples()
+    if from_db:
+        from server.app import create_app
+        from server.models import db, IdeaValidation
+
+        with create_app().app_context():
+            rows = db.session.execute(
+                db.select(IdeaValidation.business_idea, IdeaValidation.valid)
+                .where(db.or_(IdeaValidation.confidence.is_(None), IdeaValidation.confidence >= 0.8))
+            ).all()
+        samples += [(text, valid) for text, valid in rows]
+    return samples
+
+
+def benchmark(samples, folds=5, seed=7311):
+    """
+    Held-out accuracy and coverage of local decisions, per language, and
+    classification latency. Each fold is judged by a model (thresholds
+    included) fitted on the other folds only.
+    """
+    import time
+
+    def language(text):
+        return 'ar' if re.search('[\u0600-\u06ff]', text) else 'en'
+
+    results = []  # (language, truth, verdict)
+    for held_out in _folds(samples, folds, seed):
+        held = set(held_out)
+        model = IdeaClassifier.fit([s for i, s in enumerate(samples) if i not in held], folds, seed)
+        for i in held_out:
+            text, label = samples[i]
+            verdict, _ = model.classify(text)
+            results.append((language(text), bool(label), verdict))
+
+    model = IdeaClassifier.fit(samples, folds, seed)
+    timings = []
+    for text, _ in samples:
+        started = time.perf_counter()
+        model.classify(text)
+        timings.append((time.perf_counter() - started) * 1e6)
+    timings.sort()
+
+    def summary(rows):
+        accepted = [truth for _, truth, verdict in rows if verdict is True]
+        rejected = [truth for _, truth, verdict in rows if verdict is False]
+        decided = len(accepted) + len(rejected)
+        correct = sum(accepted) + sum(1 for truth in rejected if not truth)
+        return {
+            'samples': len(rows),
+            'decided_locally': round(decided / len(rows), 3) if rows else 0.0,
+            'accuracy_of_local': round(correct / decided, 3) if decided else None,
+            'accept_precision': round(sum(accepted) / len(accepted), 3) if accepted else None,
+            'reject_precision': round(1 - sum(rejected) / len(rejected), 3) if rejected else None,
+            'ideas_accepted': round(len(accepted) / max(1, sum(1 for _, truth, _ in rows if truth)), 3),
+        }
+
+    return {
+        'all': summary(results),
+        'en': summary([r for r in results if r[0] == 'en']),
+        'ar': summary([r for r in results if r[0] == 'ar']),
+        'latency_us_p50': round(timings[len(timings) // 2], 1),
+        'latency_us_p95': round(timings[int(len(timings) * 0.95)], 1),
+    }
+
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Train or benchmark the local idea classifier')
+    parser.add_argument('command', choices=['train', 'benchmark'])
+    parser.add_argument('--from-db', action='store_true', help='add Claude verdicts from idea_validations')
+    parser.add_argument('--folds', type=int, default=5)
+    parser.add_argument('--out', default=MODEL_PATH)
+    args = parser.parse_args()
+
+    samples = load_samples(args.from_db)
+    if args.command == 'train':
+        model = IdeaClassifier.fit(samples, args.folds)
+        model.save(args.out)
+        print(f"Trained on {len(samples)} samples ({model.meta['ideas']} ideas), {len(model.weights)} n-grams")
+        print(f"  accept at score >= {model.accept_at:.3f} (precision {model.accept_precision})")
+        print(f"  reject at score <= {model.reject_at:.3f} (precision {model.reject_precision})")
+        print(f"  written to {args.out}")
+    else:
+        report = benchmark(samples, args.folds)
+        print(f"Held-out results, {args.folds}-fold, {len(samples)} samples")
+        print(f"  {'':<5}{'samples':>9}{'local':>8}{'acc':>8}{'acc+':>8}{'acc-':>8}{'ideas ok':>10}")
+        for name in ('all', 'en', 'ar'):
+            row = report[name]
+            cells = [row['decided_locally'], row['accuracy_of_local'], row['accept_precision'],
+                     row['reject_precision'], row['ideas_accepted']]
+            print(f"  {name:<5}{row['samples']:>9}" + ''.join(
+                f"{'-' if v is None else f'{v:.3f}':>{w}}" for v, w in zip(cells, (8, 8, 8, 8, 10))))
+        print(f"  classify latency: p50 {report['latency_us_p50']} us, p95 {report['latency_us_p95']} us")
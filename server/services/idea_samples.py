@@ -0,0 +1,445 @@
+"""
+Seed corpus for the local idea classifier (idea_classifier.py), in English
+and Arabic. Labels follow the rules of the Claude validation prompt in
+analysis_service: any product, service or business concept is an idea, even
+a brief one; greetings, test messages, chit-chat and filler are not.
+Keyboard mashing and random letters are generated (`generate_gibberish`)
+rather than listed. Validation outcomes recorded in production
+(`idea_validations`) are added on top when retraining with --from-db.
+"""
+import random
+
+IDEAS_EN = [
+    "A coffee shop with a coworking space for students in Damascus",
+    "Mobile app for booking football pitches by the hour",
+    "Online store selling handmade soap and natural cosmetics",
+    "Food delivery platform for home cooks who sell traditional meals",
+    "A car rental service with delivery to the customer's door",
+    "Subscription box for healthy snacks delivered monthly",
+    "Tutoring marketplace connecting university students with high school pupils",
+    "An app that lets pharmacies list medicine availability so patients can find scarce drugs",
+    "Real estate website for renting furnished apartments to expats",
+    "Laundry pickup and delivery service for busy families",
+    "A bakery that sells gluten free bread and pastries online",
+    "Ride hailing app for women drivers and women passengers",
+    "Online platform for freelance translators between Arabic and English",
+    "Solar panel installation company for homes and small shops",
+    "Grocery delivery from local supermarkets within one hour",
+    "A job board for remote software developers in the Middle East",
+    "Veterinary clinic with home visits for pets",
+    "Mobile app to track personal expenses and budgets in Syrian pounds",
+    "Used car marketplace with inspection reports from certified mechanics",
+    "Wedding planning service that coordinates venues, catering and photographers",
+    "A gym with personal training programs tailored for beginners",
+    "Online courses teaching graphic design in Arabic",
+    "Electronics repair shop for phones and laptops with express service",
+    "A platform where farmers sell vegetables directly to restaurants",
+    "Courier service for documents and small parcels between cities",
+    "An ecommerce store for second hand children's clothes",
+    "Home cleaning service booked through a mobile app",
+    "A restaurant serving Syrian street food with a delivery menu",
+    "Telemedicine app for online consultations with doctors",
+    "Clothing brand selling modest fashion online",
+    "A marketplace for renting construction equipment",
+    "Language school offering evening English classes for adults",
+    "Smart parking app showing free spots in the city center",
+    "Event ticketing platform for concerts and theatre shows",
+    "A printing shop offering business cards, flyers and banners",
+    "Water filter sales and maintenance for households",
+    "Online pharmacy delivering prescription medicine",
+    "Travel agency specialised in religious tourism trips",
+    "An accounting software for small retail shops",
+    "A daycare center for toddlers with an app for parents",
+    "Furniture store selling custom made wooden furniture online",
+    "Mobile car wash that comes to your location",
+    "Hotel booking website for small family run guesthouses",
+    "Digital marketing agency for local restaurants",
+    "Platform to order spare parts for cars and motorcycles",
+    "A chain of juice bars using fresh local fruit",
+    "Bicycle rental stations across university campuses",
+    "An app for ordering water gallons and gas cylinders",
+    "Handmade jewelry sold through Instagram and a web shop",
+    "Recruitment agency for nurses and caregivers",
+    "A cloud based point of sale system for cafes",
+    "Organic honey farm that sells directly to consumers",
+    "Moving company with packing and storage services",
+    "Photography studio offering product photos for online sellers",
+    "A phone accessories kiosk in shopping malls",
+    "Electric scooter sharing service",
+    "Meal prep service delivering weekly healthy lunches to offices",
+    "A marketplace for freelance electricians and plumbers",
+    "Online bookstore for Arabic novels and textbooks",
+    "Physiotherapy clinic with home sessions for elderly patients",
+    "A SaaS tool that schedules social media posts for small businesses",
+    "Taxi booking app with fixed prices between neighbourhoods",
+    "Beauty salon booking platform with customer reviews",
+    "Selling refurbished laptops with a one year warranty",
+    "A bakery franchise serving fresh manakish",
+    "Language exchange app connecting native speakers",
+    "Supermarket ecommerce website with scheduled delivery slots",
+    "Pet food and accessories online shop",
+    "Insurance comparison website for car and health insurance",
+    "Co-living residences for young professionals",
+    "Crowdfunding platform for local community projects",
+    "An ice cream parlour with homemade flavours",
+    "Driving school with online theory lessons",
+    "Sports equipment store with rentals for tourists",
+    "Mobile app for restaurant table reservations",
+    "Logistics company offering cold chain transport for food",
+    "A website that sells spices and herbs in bulk",
+    "Kids coding academy with weekend workshops",
+    "Dental clinic chain with affordable checkups",
+    "Tailoring service that takes measurements at home",
+    "Platform for buying and selling used furniture",
+    "Medical equipment rental for patients recovering at home",
+    "A social network for local hobby groups",
+    "Catering company for corporate events and weddings",
+    "An AI chatbot that answers customer questions for online shops",
+    "Inventory management software for warehouses",
+    "Greenhouse farming of strawberries for export",
+    "Bus ticket booking app for intercity travel",
+    "A barber shop with online appointment booking",
+    "Home gardening kits sold online with video guides",
+    "Flower shop delivering bouquets the same day",
+    "Cybersecurity consulting for banks and small companies",
+    "Payment app that lets shops accept QR code payments",
+    "Interior design studio offering 3D room previews",
+    "Cosmetics store focused on halal skincare products",
+    "A library cafe where customers can borrow books",
+    "Student housing finder for university cities",
+    "Car maintenance subscription with pickup and return",
+    "Vending machines selling healthy snacks in offices",
+    "Online marketplace for local artisans and crafts",
+    "Fitness app with home workout plans and a diet tracker",
+    "Mobile clinic providing checkups in rural villages",
+    "Recycling company that collects plastic from households",
+    "Private tutoring center for math and physics",
+    "Freight forwarding service between Syria and Lebanon",
+    "A platform for renting wedding dresses",
+    "Home bakery selling birthday cakes through WhatsApp orders",
+    "Hostel for backpackers in the old city",
+    "Data analytics consulting for retail chains",
+    "Cleaning products manufacturing with eco friendly packaging",
+    "Electronics ecommerce store selling phones in installments",
+    "An app that matches blood donors with hospitals",
+    "Rooftop restaurant with live music",
+    "Shoe repair and custom leather goods workshop",
+    "Drone photography services for real estate listings",
+    "Mobile app for ordering from nearby bakeries",
+    "Affordable web hosting for small businesses",
+    "Olive oil production and export business",
+    "Elderly care home with medical staff",
+    "A platform selling digital gift cards",
+    "Printing 3D models for engineering students",
+    "Apartment sales listings with virtual tours",
+    "App for tracking school buses in real time",
+    "Sweets shop selling traditional baklava online",
+    "Pharmacy delivery in Aleppo within 30 minutes",
+    "Online marketplace for buying and selling sheep and livestock",
+    "Car sharing app for daily commuters",
+    "Legal advice platform connecting users with lawyers",
+    "A kiosk selling coffee and sandwiches near universities",
+    "Small poultry farm supplying eggs to supermarkets",
+    "Mobile app for finding and booking doctors nearby",
+    "Renting out camping gear for weekend trips",
+    "A marketplace for homemade pickles and preserves",
+    "Clothing alterations shop inside a shopping mall",
+    "Solar powered phone charging stations in public places",
+    "An online academy for accounting certifications",
+    "Courier app for restaurants that do not have their own drivers",
+    "Eyewear store with online prescription glasses",
+    "Hydroponic vegetable farm inside the city",
+    "Kindergarten with bilingual Arabic English curriculum",
+    "Electric vehicle charging stations",
+    "HR software for payroll and attendance",
+    "Second hand textbook exchange for students",
+    "Print on demand t-shirts with local designs",
+    "Moving boxes and packing supplies delivered to your home",
+    "Snack food brand making roasted chickpeas",
+    "A platform for booking chalets and farm houses for holidays",
+    "Quick service restaurant selling shawarma wraps",
+]
+
+IDEAS_AR = [
+    "مقهى مع مساحة عمل مشتركة للطلاب في دمشق",
+    "تطبيق لحجز ملاعب كرة القدم بالساعة",
+    "متجر إلكتروني لبيع الصابون المصنوع يدوياً ومستحضرات التجميل الطبيعية",
+    "منصة توصيل طعام للطباخين المنزليين الذين يبيعون الأكلات التقليدية",
+    "خدمة تأجير سيارات مع التوصيل إلى باب الزبون",
+    "اشتراك شهري لصندوق وجبات خفيفة صحية",
+    "منصة تعليم خصوصي تربط طلاب الجامعة بطلاب الثانوية",
+    "تطبيق يعرض توفر الأدوية في الصيدليات ليجد المرضى الأدوية المفقودة",
+    "موقع عقاري لتأجير الشقق المفروشة",
+    "خدمة استلام وتوصيل الغسيل للعائلات",
+    "مخبز يبيع الخبز والمعجنات الخالية من الغلوتين عبر الإنترنت",
+    "تطبيق نقل بسائقات نساء للراكبات",
+    "منصة للمترجمين المستقلين بين العربية والإنجليزية",
+    "شركة تركيب ألواح طاقة شمسية للمنازل والمحلات الصغيرة",
+    "توصيل البقالة من السوبرماركت خلال ساعة",
+    "موقع وظائف للمبرمجين عن بعد في الشرق الأوسط",
+    "عيادة بيطرية مع زيارات منزلية للحيوانات الأليفة",
+    "تطبيق لتتبع المصاريف الشخصية والميزانية",
+    "سوق للسيارات المستعملة مع تقارير فحص من ميكانيكيين معتمدين",
+    "خدمة تنظيم حفلات الأعراس تنسق الصالات والضيافة والتصوير",
+    "نادي رياضي مع برامج تدريب شخصية للمبتدئين",
+    "دورات أونلاين لتعليم التصميم الغرافيكي باللغة العربية",
+    "محل صيانة موبايلات ولابتوبات مع خدمة سريعة",
+    "منصة يبيع فيها المزارعون الخضار مباشرة للمطاعم",
+    "خدمة شحن للوثائق والطرود الصغيرة بين المدن",
+    "متجر إلكتروني لملابس الأطفال المستعملة",
+    "خدمة تنظيف منازل تحجز عبر تطبيق",
+    "مطعم وجبات شعبية سورية مع قائمة توصيل",
+    "تطبيق استشارات طبية أونلاين مع الأطباء",
+    "علامة تجارية لبيع الأزياء المحتشمة عبر الإنترنت",
+    "سوق لتأجير معدات البناء",
+    "معهد لغات يقدم دروس إنجليزي مسائية للكبار",
+    "تطبيق مواقف ذكية يعرض الأماكن الفارغة في وسط المدينة",
+    "منصة لبيع تذاكر الحفلات والمسرح",
+    "مطبعة لطباعة الكروت والبروشورات واللافتات",
+    "بيع وصيانة فلاتر المياه للمنازل",
+    "صيدلية أونلاين لتوصيل الأدوية",
+    "وكالة سفر متخصصة برحلات السياحة الدينية",
+    "برنامج محاسبة للمحلات التجارية الصغيرة",
+    "حضانة أطفال مع تطبيق لمتابعة الأهل",
+    "متجر أثاث خشبي حسب الطلب عبر الإنترنت",
+    "غسيل سيارات متنقل يأتي إلى موقعك",
+    "موقع حجز فنادق للبيوت العائلية الصغيرة",
+    "وكالة تسويق رقمي للمطاعم المحلية",
+    "منصة لطلب قطع غيار السيارات والدراجات النارية",
+    "سلسلة محلات عصير طبيعي من الفواكه المحلية",
+    "محطات تأجير دراجات هوائية في الجامعات",
+    "تطبيق لطلب غالونات المياه وجرار الغاز",
+    "بيع الإكسسوارات المصنوعة يدوياً عبر انستغرام",
+    "شركة توظيف للممرضات ومقدمي الرعاية",
+    "نظام نقاط بيع سحابي للمقاهي",
+    "مزرعة عسل عضوي تبيع مباشرة للمستهلك",
+    "شركة نقل أثاث مع خدمات التغليف والتخزين",
+    "استوديو تصوير منتجات للبائعين أونلاين",
+    "كشك لبيع إكسسوارات الموبايل في المولات",
+    "خدمة مشاركة سكوترات كهربائية",
+    "توصيل وجبات صحية أسبوعية للمكاتب",
+    "سوق للكهربائيين والسباكين المستقلين",
+    "مكتبة إلكترونية للروايات والكتب الجامعية",
+    "عيادة علاج فيزيائي مع جلسات منزلية لكبار السن",
+    "أداة لجدولة منشورات وسائل التواصل الاجتماعي للشركات الصغيرة",
+    "تطبيق تكسي بأسعار ثابتة بين الأحياء",
+    "منصة حجز صالونات التجميل مع تقييمات الزبائن",
+    "بيع لابتوبات مجددة مع كفالة سنة",
+    "فرن مناقيش بنظام الامتياز التجاري",
+    "تطبيق تبادل لغات بين المتحدثين الأصليين",
+    "متجر سوبرماركت إلكتروني مع مواعيد توصيل محددة",
+    "متجر أونلاين لطعام وإكسسوارات الحيوانات الأليفة",
+    "موقع مقارنة أسعار التأمين الصحي وتأمين السيارات",
+    "سكن مشترك للشباب الموظفين",
+    "منصة تمويل جماعي لمشاريع المجتمع المحلي",
+    "محل بوظة بنكهات منزلية",
+    "مدرسة تعليم قيادة مع دروس نظرية أونلاين",
+    "تطبيق لحجز الطاولات في المطاعم",
+    "شركة نقل مبرد للمواد الغذائية",
+    "موقع لبيع البهارات والأعشاب بالجملة",
+    "أكاديمية برمجة للأطفال مع ورشات نهاية الأسبوع",
+    "سلسلة عيادات أسنان بأسعار مناسبة",
+    "خدمة خياطة تأخذ القياسات في المنزل",
+    "منصة لبيع وشراء الأثاث المستعمل",
+    "تأجير معدات طبية للمرضى في المنزل",
+    "شركة ضيافة للمناسبات والأعراس",
+    "روبوت محادثة بالذكاء الاصطناعي يجيب على أسئلة زبائن المتاجر الإلكترونية",
+    "برنامج إدارة مخزون للمستودعات",
+    "زراعة الفريز في البيوت البلاستيكية للتصدير",
+    "تطبيق حجز تذاكر البولمان بين المحافظات",
+    "صالون حلاقة مع حجز مواعيد أونلاين",
+    "محل ورود يوصل الباقات في نفس اليوم",
+    "تطبيق دفع يسمح للمحلات بقبول الدفع عبر رمز QR",
+    "مكتب تصميم داخلي مع عرض ثلاثي الأبعاد للغرف",
+    "مقهى ومكتبة يمكن للزبائن استعارة الكتب منها",
+    "منصة للبحث عن سكن طلابي",
+    "آلات بيع وجبات صحية في الشركات",
+    "سوق إلكتروني للحرفيين المحليين",
+    "تطبيق لياقة مع خطط تمارين منزلية وحمية غذائية",
+    "عيادة متنقلة لتقديم الفحوصات في القرى",
+    "شركة إعادة تدوير تجمع البلاستيك من المنازل",
+    "مركز دروس خصوصية للرياضيات والفيزياء",
+    "منصة لتأجير فساتين الأعراس",
+    "بيع قوالب الكيك من المنزل عبر طلبات واتساب",
+    "نزل للسياح في المدينة القديمة",
+    "متجر إلكترونيات يبيع الموبايلات بالتقسيط",
+    "تطبيق يربط المتبرعين بالدم بالمستشفيات",
+    "مطعم على السطح مع موسيقى حية",
+    "تصوير عقارات بالدرون للإعلانات",
+    "إنتاج زيت الزيتون وتصديره",
+    "دار رعاية للمسنين مع كادر طبي",
+    "تطبيق لتتبع باصات المدارس مباشرة",
+    "محل حلويات يبيع البقلاوة أونلاين",
+    "توصيل أدوية في حلب خلال ثلاثين دقيقة",
+    "سوق إلكتروني لبيع وشراء المواشي",
+    "منصة استشارات قانونية تربط المستخدمين بالمحامين",
+    "مزرعة دواجن صغيرة لتزويد السوبرماركت بالبيض",
+    "تطبيق لحجز مواعيد الأطباء القريبين",
+    "تأجير معدات التخييم لرحلات نهاية الأسبوع",
+    "بيع المخللات والمربيات المنزلية",
+    "محطات شحن للسيارات الكهربائية",
+    "برنامج رواتب وحضور للموارد البشرية",
+    "طباعة تيشيرتات حسب الطلب بتصاميم محلية",
+    "حجز شاليهات ومزارع للعطل",
+    "مطعم وجبات سريعة يبيع الشاورما",
+]
+
+NOT_IDEAS_EN = [
+    "hello how are you today",
+    "test test test test",
+    "this is just a test message",
+    "I don't know what to write here",
+    "nothing really, just checking",
+    "whatever, I have no idea",
+    "hi there, good morning",
+    "what is the weather like tomorrow",
+    "my cat is sleeping on the sofa",
+    "I am bored and want to chat",
+    "can you tell me a joke please",
+    "who won the football match yesterday",
+    "I like pizza and ice cream",
+    "the sky is blue and the grass is green",
+    "please help me with my homework",
+    "lorem ipsum dolor sit amet",
+    "testing the form to see if it works",
+    "just typing random words here",
+    "good night everyone",
+    "I love my family very much",
+    "where is the nearest mosque",
+    "how old are you",
+    "thank you very much for your help",
+    "this website is nice",
+    "ok ok ok fine",
+    "yes no maybe",
+    "I want to sleep now",
+    "hello hello hello",
+    "what time is it now",
+    "my name is Ahmad and I live in Homs",
+    "the movie last night was really good",
+    "I forgot my password",
+    "can I have more credits for free",
+    "translate this sentence to French",
+    "write me a poem about the sea",
+    "nice to meet you",
+    "see you later",
+    "it is raining outside",
+    "I don't have any idea yet",
+    "something something something",
+    "sample text for testing purposes",
+    "asking a question about nothing",
+    "happy birthday to my friend",
+    "I have a headache today",
+    "let me think about it",
+    "no comment",
+    "please ignore this",
+    "the quick brown fox jumps over the lazy dog",
+    "random sentence with no meaning at all",
+    "my favorite color is green",
+    "what should I eat for dinner",
+    "how do I change my profile picture",
+    "I am a student at the university",
+    "tell me about the history of Rome",
+    "goodbye and take care",
+    "why is the page loading slowly",
+    "I will tell you later",
+    "is anyone reading this",
+    "blah blah blah blah",
+    "hmm I am not sure",
+]
+
+NOT_IDEAS_AR = [
+    "مرحبا كيف حالك اليوم",
+    "تجربة تجربة تجربة",
+    "هذه مجرد رسالة تجريبية",
+    "لا أعرف ماذا أكتب هنا",
+    "لا شيء فقط أجرب",
+    "أي شيء ما عندي فكرة",
+    "السلام عليكم صباح الخير",
+    "كيف سيكون الطقس غدا",
+    "قطتي نائمة على الكنبة",
+    "أنا زهقان وبدي احكي مع حدا",
+    "احكيلي نكتة لو سمحت",
+    "مين ربح المباراة مبارح",
+    "بحب البيتزا والبوظة",
+    "السماء زرقاء والعشب أخضر",
+    "ساعدني بحل الوظيفة",
+    "عم جرب الفورم إذا بيشتغل",
+    "عم اكتب كلام عشوائي",
+    "تصبحون على خير",
+    "بحب عيلتي كتير",
+    "وين أقرب جامع",
+    "قديش عمرك",
+    "شكرا كتير على المساعدة",
+    "الموقع حلو",
+    "طيب طيب ماشي",
+    "نعم لا ربما",
+    "بدي نام هلق",
+    "مرحبا مرحبا مرحبا",
+    "قديش الساعة هلق",
+    "اسمي أحمد وساكن بحمص",
+    "الفيلم مبارح كان حلو كتير",
+    "نسيت كلمة السر",
+    "بدي رصيد مجاني",
+    "ترجم هالجملة للفرنسي",
+    "اكتبلي قصيدة عن البحر",
+    "تشرفنا",
+    "بشوفك بعدين",
+    "عم تشتي برا",
+    "لسا ما عندي فكرة",
+    "شي شي شي شي",
+    "نص تجريبي للاختبار",
+    "كل عام وأنت بخير يا صديقي",
+    "راسي عم يوجعني اليوم",
+    "خليني فكر فيها",
+    "بلا تعليق",
+    "تجاهل هالرسالة",
+    "جملة عشوائية بدون معنى",
+    "لوني المفضل الأخضر",
+    "شو بدي اطبخ عالعشا",
+    "كيف بغير صورة البروفايل",
+    "أنا طالب بالجامعة",
+    "احكيلي عن تاريخ روما",
+    "مع السلامة",
+    "ليش الصفحة بطيئة",
+    "بقلك بعدين",
+    "في حدا عم يقرأ",
+    "ما بعرف والله",
+    "يا هلا ويا مرحبا",
+    "هلا والله كيفكم",
+]
+
+_KEYBOARD_ROWS = ['qwertyuiop', 'asdfghjkl', 'zxcvbnm']
+_LATIN = 'abcdefghijklmnopqrstuvwxyz'
+_ARABIC = 'ابتثجحخدذرزسشصضطظعغفقكلمنهوي'
+_ARABIC_KEYBOARD_ROWS = ['ضصثقفغعهخحجد', 'شسيبلاتنمكط', 'ئءؤرلاىةوزظ']
+
+
+def generate_gibberish(count, seed=7311):
+    """Keyboard mashing, random letters and repeated fragments in both scripts"""
+    rng = random.Random(seed)
+
+    def mash(rows):
+        row = rng.choice(rows)
+        start = rng.randrange(len(row) - 3)
+        return ''.join(rng.choice(row[start:start + 5]) for _ in range(rng.randint(4, 9)))
+
+    def random_word(letters):
+        return ''.join(rng.choice(letters) for _ in range(rng.randint(3, 9)))
+
+    makers = [
+        lambda: ' '.join(mash(_KEYBOARD_ROWS) for _ in range(rng.randint(1, 4))),
+        lambda: ' '.join(random_word(_LATIN) for _ in range(rng.randint(2, 6))),
+        lambda: ' '.join(mash(_ARABIC_KEYBOARD_ROWS) for _ in range(rng.randint(1, 4))),
+        lambda: ' '.join(random_word(_ARABIC) for _ in range(rng.randint(2, 6))),
+        lambda: ' '.join([random_word(_LATIN)[:4]] * rng.randint(3, 6)),
+        lambda: ' '.join([random_word(_ARABIC)[:4]] * rng.randint(3, 6)),
+    ]
+    return [makers[i % len(makers)]() for i in range(count)]
+
+
+def seed_samples(gibberish=300):
+    """(text, is_idea) pairs"""
+    samples = [(text, True) for text in IDEAS_EN + IDEAS_AR]
+    samples += [(text, False) for text in NOT_IDEAS_EN + NOT_IDEAS_AR]
+    samples += [(text, False) for text in generate_gibberish(gibberish)]
+    return samples
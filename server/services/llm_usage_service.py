@@ -0,0 +1,172 @@
+"""
+LLM usage ledger.
+Every Claude call made through utils/llm_client.create_message() is recorded
+here: endpoint, tab, model, input/output/cache tokens, stop reason, latency
+and SDK retries. Recording only appends to an in-memory buffer, so a request
+never waits on the ledger; a background thread writes the buffer with one
+bulk insert every LLM_USAGE_FLUSH_SECONDS. Calls still buffered when a worker
+exits are lost, which is acceptable for analytics.
+
+`usage_summary()` aggregates the ledger per tab, endpoint, day, user or model
+with p50/p95 latency and token totals (admin: GET /api/llm-usage/summary).
+"""
+import threading
+import uuid
+from collections import deque
+from datetime import datetime, timedelta
+
+from server.models import db, LlmCall
+
+# Oldest calls are dropped beyond this if the database stays unreachable
+MAX_PENDING_CALLS = 10000
+
+_calls = LlmCall.__table__
+
+# Calls outside tab generation are grouped under their endpoint for 'tab'
+GROUPINGS = {
+    'tab': db.func.coalesce(_calls.c.tab_name, _calls.c.endpoint),
+    'endpoint': _calls.c.endpoint,
+    'day': db.func.date(_calls.c.created_at),
+    'user': _calls.c.user_email,
+    'model': _calls.c.model,
+}
+
+_pending = deque(maxlen=MAX_PENDING_CALLS)
+_pending_lock = threading.Lock()
+
+
+def record_llm_call(endpoint, tab_name=None, analysis_id=None, user_email=None, model=None,
+                    input_tokens=0, output_tokens=0, cache_read_tokens=0, cache_creation_tokens=0,
+                    stop_reason=None, latency_ms=None, retries=0, status='ok', error=None):
+    """Buffer one call for the next flush. In-memory only."""
+    row = {
+        'id': str(uuid.uuid4()),
+        'endpoint': endpoint,
+        'tab_name': tab_name,
+        'analysis_id': analysis_id,
+        'user_email': user_email,
+        'model': model,
+        'input_tokens': input_tokens or 0,
+        'output_tokens': output_tokens or 0,
+        'cache_read_tokens': cache_read_tokens or 0,
+        'cache_creation_tokens': cache_creation_tokens or 0,
+        'stop_reason': stop_reason,
+        'latency_ms': latency_ms,
+        'retries': retries or 0,
+        'status': status,
+        'error': error[:500] if error else None,
+        'created_at': datetime.utcnow(),
+    }
+    with _pending_lock:
+        _pending.append(row)
+
+
+def flush_llm_calls():
+    """
+    Write buffered calls in one bulk insert. Must run inside an app context.
+
+    Returns:
+        int: number of calls written
+    """
+    with _pending_lock:
+        rows = list(_pending)
+        _pending.clear()
+    if not rows:
+        return 0
+
+    try:
+        db.session.execute(_calls.insert(), rows)
+        db.session.commit()
+    except Exception as e:
+        db.session.rollback()
+        # Put the calls back (ahead of newer ones) so the next flush retries them
+        with _pending_lock:
+            newer = list(_pending)
+            _pending.clear()
+            _pending.extend(rows + newer)
+        print(f"Error flushing LLM usage: {e}")
+        return 0
+    return len(rows)
+
+
+def start_llm_usage_flusher(app):
+    """Start the background ledger writer once per process"""
+    from server.utils.background import start_periodic_task
+
+    return start_periodic_task(
+        app,
+        'llm-usage-flusher',
+        app.config.get('LLM_USAGE_FLUSH_SECONDS', 5),
+        flush_llm_calls
+    )
+
+
+def _latency_percentiles(key, filters):
+    """{group: (p50, p95)} computed in Python, for databases without percentile_cont"""
+    latencies = {}
+    rows = db.session.execute(
+        db.select(key, _calls.c.latency_ms).where(*filters, _calls.c.latency_ms.isnot(None))
+    )
+    for group, latency in rows:
+        latencies.setdefault(group, []).append(latency)
+
+    def percentile(values, p):
+        return values[min(len(values) - 1, int(len(values) * p))]
+
+    percentiles = {}
+    for group, values in latencies.items():
+        values.sort()
+        percentiles[group] = (percentile(values, 0.50), percentile(values, 0.95))
+    return percentiles
+
+
+def usage_summary(group_by='tab', days=7, user_email=None, endpoint=None):
+    """
+    Calls, errors, token totals and latency percentiles per group over the
+    last `days` days. Days are listed in order, other groupings by total
+    tokens (the most expensive first).
+    """
+    key = GROUPINGS[group_by].label('key')
+    filters = [_calls.c.created_at >= datetime.utcnow() - timedelta(days=days)]
+    if user_email:
+        filters.append(_calls.c.user_email == user_email)
+    if endpoint:
+        filters.append(_calls.c.endpoint == endpoint)
+
+    columns = [
+        key,
+        db.func.count().label('calls'),
+        db.func.sum(db.case((_calls.c.status == 'error', 1), else_=0)).label('errors'),
+        db.func.sum(_calls.c.input_tokens).label('input_tokens'),
+        db.func.sum(_calls.c.output_tokens).label('output_tokens'),
+        db.func.sum(_calls.c.cache_read_tokens).label('cache_read_tokens'),
+        db.func.sum(_calls.c.cache_creation_tokens).label('cache_creation_tokens'),
+        db.func.sum(_calls.c.retries).label('retries'),
+        db.func.avg(_calls.c.latency_ms).label('latency_ms_avg'),
+    ]
+    postgres = db.engine.dialect.name == 'postgresql'
+    if postgres:
+        columns += [
+            db.func.percentile_cont(0.50).within_group(_calls.c.latency_ms).label('latency_ms_p50'),
+            db.func.percentile_cont(0.95).within_group(_calls.c.latency_ms).label('latency_ms_p95'),
+        ]
+    rows = db.session.execute(db.select(*columns).where(*filters).group_by(key)).mappings().all()
+    percentiles = {} if postgres else _latency_percentiles(key, filters)
+
+    summary = []
+    for row in rows:
+        item = dict(row)
+        item['key'] = str(item['key']) if item['key'] is not None else None
+        if not postgres:
+            item['latency_ms_p50'], item['latency_ms_p95'] = percentiles.get(row['key'], (None, None))
+        for name in ('latency_ms_avg', 'latency_ms_p50', 'latency_ms_p95'):
+            if item[name] is not None:
+                item[name] = round(float(item[name]), 1)
+        item['avg_output_tokens'] = round((item['output_tokens'] or 0) / item['calls'], 1)
+        summary.append(item)
+
+    if group_by == 'day':
+        summary.sort(key=lambda item: item['key'] or '')
+    else:
+        summary.sort(key=lambda item: -((item['input_tokens'] or 0) + (item['output_tokens'] or 0)))
+    return summary
@@ -1,10 +1,12 @@
 import re
 import json
-from openpyxl import load_workbook
 from io import BytesIO
 from server.models import db, Analysis, User
+from server.utils.lazy_imports import lazy_import
 import uuid
 
+openpyxl = lazy_import('openpyxl')
+
 REQUIRED_COLUMNS = ['user_email', 'business_idea']
 OPTIONAL_COLUMNS = [
     'industry', 'target_market', 'location', 'budget', 
@@ -120,7 +122,7 @@ def normalize_column_name(col):
 
 def parse_excel_file(file_data):
     try:
-        wb = load_workbook(filename=BytesIO(file_data), read_only=True, data_only=True)
+        wb = openpyxl.load_workbook(filename=BytesIO(file_data), read_only=True, data_only=True)
         ws = wb.active
         
         rows = list(ws.iter_rows(values_only=True))
@@ -0,0 +1,224 @@
+"""
+Public shared report serving.
+Each share token maps to a cached snapshot holding the pre-serialized analysis
+JSON, so repeat views of a share link only read the share's active/expiry
+state (an indexed lookup by token) and never reload the report. Views are
+counted in memory and flushed to `report_shares.access_count` in batches by a
+background task, and the owner is notified at most once per share per window.
+Up to one flush interval of view counts can be lost if a worker dies.
+
+Snapshots are kept in an LRU of at most SHARED_REPORT_CACHE_MAX_ENTRIES per
+worker; each flush also drops snapshots past their TTL and notification
+times older than the notify window.
+"""
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+
+from flask import current_app
+
+from server.models import db, Analysis, ReportShare
+from server.utils.json_provider import dumps_bytes
+
+_snapshots = OrderedDict()  # token -> ShareSnapshot, least recently used first
+_snapshots_lock = threading.Lock()
+
+_pending_views = {}
+_views_lock = threading.Lock()
+
+# share_id -> monotonic time of the last owner notification
+_last_notified = {}
+
+
+class ShareSnapshot:
+    __slots__ = ('token', 'share', 'analysis_id', 'owner_email', 'business_idea',
+                 'expires_at', 'analysis_json', 'cached_until')
+
+    def __init__(self, share, analysis, ttl):
+        self.token = share.share_token
+        self.share = share.to_dict()
+        self.analysis_id = analysis.id
+        self.owner_email = share.created_by
+        self.business_idea = analysis.business_idea or 'Unknown'
+        self.expires_at = share.expires_at
+        self.analysis_json = dumps_bytes(analysis.to_dict())
+        self.cached_until = time.monotonic() + ttl
+
+    def is_expired(self):
+        return bool(self.expires_at) and datetime.utcnow() > self.expires_at
+
+    def response_body(self):
+        """Assemble {"share": ..., "analysis": ...} around the pre-serialized analysis"""
+        share = dict(self.share)
+        with _views_lock:
+            pending = _pending_views.get(share['id'], 0)
+        share['access_count'] = (share.get('access_count') or 0) + pending
+        return b'{"share":' + dumps_bytes(share) + b',"analysis":' + self.analysis_json + b'}'
+
+
+def get_share_snapshot(token):
+    """
+    Get the snapshot for a share token. The share row itself is checked on
+    every call (one lookup on the unique token index), so a share revoked or
+    shortened in any worker stops being served at once; only the analysis
+    JSON is cached.
+
+    Returns:
+        tuple: (snapshot or None, error_message or None, status_code)
+    """
+    state = db.session.query(
+        ReportShare.id, ReportShare.is_active, ReportShare.expires_at
+    ).filter_by(share_token=token).first()
+    if not state or not state.is_active:
+        _drop_snapshot(token)
+        return None, 'Share not found', 404
+
+    with _snapshots_lock:
+        snapshot = _snapshots.get(token)
+        if snapshot is not None:
+            _snapshots.move_to_end(token)
+    if snapshot is None or snapshot.cached_until <= time.monotonic() or snapshot.expires_at != state.expires_at:
+        share = ReportShare.query.get(state.id)
+        if not share:
+            _drop_snapshot(token)
+            return None, 'Share not found', 404
+
+        analysis = Analysis.query.get(share.analysis_id)
+        if not analysis:
+            return None, 'Analysis not found', 404
+
+        snapshot = ShareSnapshot(share, analysis, current_app.config.get('SHARED_REPORT_CACHE_TTL_SECONDS', 300))
+        _store_snapshot(token, snapshot, current_app.config.get('SHARED_REPORT_CACHE_MAX_ENTRIES', 100))
+
+    if snapshot.is_expired():
+        return None, 'Share link has expired', 403
+
+    return snapshot, None, 200
+
+
+def _store_snapshot(token, snapshot, max_entries):
+    """Insert a snapshot, then drop expired ones and the least recently used beyond the cap"""
+    with _snapshots_lock:
+        _snapshots[token] = snapshot
+        _snapshots.move_to_end(token)
+        _drop_expired_snapshots(time.monotonic())
+        while len(_snapshots) > max(max_entries, 1):
+            _snapshots.popitem(last=False)
+
+
+def _drop_expired_snapshots(now):
+    """Caller holds _snapshots_lock"""
+    for key in [k for k, s in _snapshots.items() if s.cached_until <= now]:
+        del _snapshots[key]
+
+
+def _prune(now):
+    """Forget snapshots past their TTL and notification times outside the window"""
+    with _snapshots_lock:
+        _drop_expired_snapshots(now)
+    window = current_app.config.get('SHARED_REPORT_NOTIFY_WINDOW_SECONDS', 3600)
+    for share_id in [k for k, notified in _last_notified.items() if now - notified >= window]:
+        _last_notified.pop(share_id, None)
+
+
+def _drop_snapshot(token):
+    with _snapshots_lock:
+        _snapshots.pop(token, None)
+
+
+def invalidate_share_snapshots(token=None, analysis_id=None):
+    """Drop cached snapshots for a token, for every share of an analysis, or all"""
+    with _snapshots_lock:
+        if token is None and analysis_id is None:
+            _snapshots.clear()
+            return
+        for key in [k for k, s in _snapshots.items()
+                    if k == token or (analysis_id and s.analysis_id == analysis_id)]:
+            _snapshots.pop(key, None)
+
+
+def record_share_view(snapshot):
+    """Count a view in memory; persisted by flush_share_views()"""
+    share_id = snapshot.share['id']
+    with _views_lock:
+        _pending_views[share_id] = _pending_views.get(share_id, 0) + 1
+
+
+def flush_share_views():
+    """
+    Persist buffered view counts in one batched UPDATE and send throttled
+    owner notifications, then prune the in-memory caches. Must run inside an
+    app context.
+
+    Returns:
+        int: number of shares updated
+    """
+    global _pending_views
+
+    _prune(time.monotonic())
+    with _views_lock:
+        pending, _pending_views = _pending_views, {}
+    if not pending:
+        return 0
+
+    try:
+        db.session.execute(
+            ReportShare.__table__.update()
+            .where(ReportShare.__table__.c.id == db.bindparam('share_id'))
+            .values(access_count=db.func.coalesce(ReportShare.__table__.c.access_count, 0) + db.bindparam('views')),
+            [{'share_id': share_id, 'views': views} for share_id, views in pending.items()]
+        )
+        db.session.commit()
+    except Exception as e:
+        db.session.rollback()
+        # Put the counts back so the next flush retries them
+        with _views_lock:
+            for share_id, views in pending.items():
+                _pending_views[share_id] = _pending_views.get(share_id, 0) + views
+        print(f"Error flushing share views: {e}")
+        return 0
+
+    _notify_owners(pending.keys())
+    return len(pending)
+
+
+def _notify_owners(share_ids):
+    from server.services.user_notification_service import notify_shared_report_opened
+
+    window = current_app.config.get('SHARED_REPORT_NOTIFY_WINDOW_SECONDS', 3600)
+    now = time.monotonic()
+    due = [share_id for share_id in share_ids
+           if now - _last_notified.get(share_id, float('-inf')) >= window]
+    if not due:
+        return
+
+    rows = db.session.query(ReportShare, Analysis.business_idea).join(
+        Analysis, Analysis.id == ReportShare.analysis_id
+    ).filter(ReportShare.id.in_(due)).all()
+
+    for share, business_idea in rows:
+        _last_notified[share.id] = now
+        if not share.created_by:
+            continue
+        try:
+            notify_shared_report_opened(
+                share.created_by,
+                share.id,
+                business_idea or 'Unknown',
+                share.access_count
+            )
+        except Exception as notify_error:
+            print(f"User notification error: {notify_error}")
+
+
+def start_share_view_flusher(app):
+    """Start the background view-count flusher once per process"""
+    from server.utils.background import start_periodic_task
+
+    return start_periodic_task(
+        app,
+        'share-view-flusher',
+        app.config.get('SHARED_REPORT_VIEW_FLUSH_SECONDS', 10),
+        flush_share_views
+    )
@@ -60,4 +60,7 @@ def set_setting(key: str, value: str, description: str = None):
         if description:
             setting.description = description
     db.session.commit()
+    
+    from server.utils.public_cache import invalidate_public_cache
+    invalidate_public_cache('landing_stats')
     return setting
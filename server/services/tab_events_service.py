@@ -0,0 +1,126 @@
+"""
+Tab status change notifications for report pages.
+Clients long-poll `/api/ai/tab-events` with the cursor from their last response;
+the request returns as soon as any tab of the analysis completes, fails, starts,
+or times out, instead of the page polling every tab every few seconds.
+
+Tab states are derived from the `analysis_tabs` status columns. Publishing is
+in-process: the worker that changes a tab wakes its own waiters immediately.
+As a stand-in for a cross-worker bus, a watcher thread in each worker re-reads
+the status columns of analyses that have waiters (one query per interval for
+all of them) and wakes waiters whose state changed, so changes made by other
+workers arrive within TAB_EVENTS_WATCH_SECONDS.
+"""
+import threading
+from datetime import datetime
+
+from server.models import db, Analysis
+from server.services.analysis_tab_service import get_tab_status_rows, summarize_tabs
+from server.utils.conditional import make_etag
+
+PROCESSING_TIMEOUT_SECONDS = 600  # 10 minutes
+
+_waiters = {}  # analysis_id -> set of threading.Event
+_waiters_lock = threading.Lock()
+
+# Last cursor seen by the watcher per watched analysis
+_watched_cursors = {}
+
+
+def _cursor(states):
+    return make_etag(*(f"{name}:{s['status']}:{s['version']}" for name, s in sorted(states.items())))
+
+
+def get_tab_states(analysis_id):
+    """
+    Read the status of every tab without loading tab content.
+
+    Returns:
+        tuple: (owner_email, states, cursor), or (None, None, None) if not found
+    """
+    owner_email = db.session.query(Analysis.user_email).filter(Analysis.id == analysis_id).scalar()
+    if owner_email is None:
+        return None, None, None
+    states = summarize_tabs(get_tab_status_rows([analysis_id]))
+    return owner_email, states, _cursor(states)
+
+
+def wait_for_tab_change(analysis_id, cursor, timeout):
+    """
+    Block until the tab states of an analysis differ from `cursor` or `timeout`
+    seconds pass. The DB session is closed while waiting so a parked request
+    does not hold a pooled connection.
+
+    Returns:
+        tuple: (states, new_cursor)
+    """
+    _, states, current = get_tab_states(analysis_id)
+    if current != cursor or timeout <= 0:
+        return states, current
+
+    event = threading.Event()
+    with _waiters_lock:
+        _waiters.setdefault(analysis_id, set()).add(event)
+        _watched_cursors.setdefault(analysis_id, current)
+    db.session.close()
+
+    try:
+        event.wait(timeout)
+    finally:
+        with _waiters_lock:
+            events = _waiters.get(analysis_id)
+            if events is not None:
+                events.discard(event)
+                if not events:
+                    _waiters.pop(analysis_id, None)
+                    _watched_cursors.pop(analysis_id, None)
+
+    _, states, current = get_tab_states(analysis_id)
+    return states, current
+
+
+def _wake(analysis_id):
+    with _waiters_lock:
+        for event in _waiters.get(analysis_id, ()):
+            event.set()
+
+
+def publish_tab_change(analysis_id):
+    """Wake local waiters after a tab row of the analysis changed (call after commit)"""
+    _wake(analysis_id)
+
+
+def watch_tab_changes():
+    """Re-read watched analyses in one query and wake waiters whose state changed"""
+    with _waiters_lock:
+        watched = dict(_watched_cursors)
+    if not watched:
+        return 0
+
+    rows_by_analysis = {analysis_id: [] for analysis_id in watched}
+    for row in get_tab_status_rows(list(watched)):
+        rows_by_analysis[row.analysis_id].append(row)
+
+    changed = 0
+    now = datetime.utcnow()
+    for analysis_id, rows in rows_by_analysis.items():
+        current = _cursor(summarize_tabs(rows, now))
+        if current != watched[analysis_id]:
+            with _waiters_lock:
+                if analysis_id in _watched_cursors:
+                    _watched_cursors[analysis_id] = current
+            _wake(analysis_id)
+            changed += 1
+    return changed
+
+
+def start_tab_event_watcher(app):
+    """Start the cross-worker change watcher once per process"""
+    from server.utils.background import start_periodic_task
+
+    return start_periodic_task(
+        app,
+        'tab-event-watcher',
+        app.config.get('TAB_EVENTS_WATCH_SECONDS', 1),
+        watch_tab_changes
+    )
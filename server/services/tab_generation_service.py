@@ -0,0 +1,286 @@
+"""
+Single-flight generation of analysis tabs.
+A generation is an `analysis_tabs` row with status 'processing' that carries a
+lease. The partial unique index on in-flight rows means only one generation per
+(analysis, tab) can exist, so concurrent requests never pay for the same Claude
+call twice; an expired lease is taken over with one conditional UPDATE. The
+holder renews the lease with heartbeats while the call runs; callers in the same
+worker wait for the in-flight result, callers in other workers get 'processing'
+and follow the tab through /api/ai/tab-events. A periodic reaper fails
+generations whose holder stopped heartbeating (crashed worker, killed request),
+so a stuck tab is noticed within one lease TTL.
+"""
+import os
+import socket
+import threading
+import uuid
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+
+from flask import current_app
+from sqlalchemy import and_
+from sqlalchemy.exc import IntegrityError
+
+from server.models import db, AnalysisTab
+from server.services.analysis_tab_service import next_tab_versions
+from server.services.tab_events_service import publish_tab_change
+from server.utils.llm_client import release_db_connection
+
+WORKER_ID = f'{socket.gethostname()}:{os.getpid()}'
+
+_tabs = AnalysisTab.__table__
+
+_flights = {}  # (analysis_id, tab_name) -> _Flight led by this worker
+_flights_lock = threading.Lock()
+
+
+class TabLease:
+    __slots__ = ('row_id', 'analysis_id', 'tab_name', 'owner_id', 'acquired_at', 'lost')
+
+    def __init__(self, row_id, analysis_id, tab_name, owner_id, acquired_at):
+        self.row_id = row_id
+        self.analysis_id = analysis_id
+        self.tab_name = tab_name
+        self.owner_id = owner_id
+        self.acquired_at = acquired_at
+        self.lost = False
+
+
+class _Flight:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+def _in_flight(analysis_id, tab_name):
+    return and_(_tabs.c.analysis_id == analysis_id, _tabs.c.tab_name == tab_name, _tabs.c.status == 'processing')
+
+
+def _ttl():
+    return timedelta(seconds=current_app.config.get('TAB_LEASE_TTL_SECONDS', 90))
+
+
+def acquire_tab_lease(analysis_id, tab_name):
+    """
+    Start a generation of a tab. Call with no pending session changes.
+
+    Returns:
+        TabLease or None if a live generation is already in flight
+    """
+    owner_id = f'{WORKER_ID}:{uuid.uuid4().hex[:8]}'
+    now = datetime.utcnow()
+    lease_values = {'lease_owner': owner_id, 'lease_expires_at': now + _ttl(), 'heartbeat_at': now, 'started_at': now}
+
+    # Take over an expired generation; the WHERE is re-checked under the row lock, so only one caller wins
+    result = db.session.execute(
+        _tabs.update()
+        .where(and_(_in_flight(analysis_id, tab_name), _tabs.c.lease_expires_at < now))
+        .values(**lease_values)
+        .returning(_tabs.c.id)
+    )
+    row_id = result.scalar()
+    if row_id is not None:
+        db.session.commit()
+        return TabLease(row_id, analysis_id, tab_name, owner_id, now)
+    db.session.rollback()
+
+    for _ in range(3):
+        row_id = str(uuid.uuid4())
+        try:
+            db.session.execute(_tabs.insert().values(
+                id=row_id, analysis_id=analysis_id, tab_name=tab_name,
+                version=next_tab_versions(analysis_id)[tab_name], is_current=False, status='processing',
+                created_at=now, updated_at=now, **lease_values
+            ))
+            db.session.commit()
+            return TabLease(row_id, analysis_id, tab_name, owner_id, now)
+        except IntegrityError:
+            db.session.rollback()
+            # Lost to a concurrent generation, unless only the version number collided
+            if db.session.query(_tabs.c.id).filter(_in_flight(analysis_id, tab_name)).first():
+                return None
+    return None
+
+
+def renew_tab_lease(lease):
+    """Extend the lease; returns False if it was reaped or taken over"""
+    now = datetime.utcnow()
+    result = db.session.execute(
+        _tabs.update()
+        .where(and_(_tabs.c.id == lease.row_id, _tabs.c.lease_owner == lease.owner_id, _tabs.c.status == 'processing'))
+        .values(heartbeat_at=now, lease_expires_at=now + _ttl())
+    )
+    db.session.commit()
+    return result.rowcount == 1
+
+
+def complete_tab_generation(lease, content, usage=None):
+    """
+    Make the generated row the current version of the tab. Saved even if the
+    lease was lost meanwhile: the Claude call has been paid for.
+    """
+    now = datetime.utcnow()
+    db.session.execute(
+        _tabs.update()
+        .where(and_(_tabs.c.analysis_id == lease.analysis_id, _tabs.c.tab_name == lease.tab_name,
+                    _tabs.c.is_current == True))
+        .values(is_current=False)
+    )
+    db.session.execute(
+        _tabs.update()
+        .where(_tabs.c.id == lease.row_id)
+        .values(status='completed', is_current=True, content=content, error=None, completed_at=now,
+                lease_owner=None, lease_expires_at=None, updated_at=now, **(usage or {}))
+    )
+    db.session.commit()
+
+
+def fail_tab_generation(lease, error):
+    db.session.execute(
+        _tabs.update()
+        .where(and_(_tabs.c.id == lease.row_id, _tabs.c.status == 'processing'))
+        .values(status='failed', error=(error or 'Generation failed')[:2000],
+                lease_owner=None, lease_expires_at=None, updated_at=datetime.utcnow())
+    )
+    db.session.commit()
+
+
+@contextmanager
+def hold_lease(lease):
+    """Renew `lease` from a background thread for the duration of the block"""
+    app = current_app._get_current_object()
+    interval = app.config.get('TAB_LEASE_HEARTBEAT_SECONDS', 30)
+    stop = threading.Event()
+
+    def beat():
+        while not stop.wait(interval):
+            with app.app_context():
+                try:
+                    if not renew_tab_lease(lease):
+                        lease.lost = True
+                        print(f"Lost generation lease for {lease.analysis_id}/{lease.tab_name}")
+                        return
+                except Exception as e:
+                    db.session.rollback()
+                    print(f"Lease heartbeat error: {e}")
+                finally:
+                    db.session.remove()
+
+    thread = threading.Thread(target=beat, name=f'lease-{lease.tab_name}', daemon=True)
+    thread.start()
+    try:
+        yield lease
+    finally:
+        stop.set()
+
+
+def _join(flight):
+    """
+    Wait briefly for a generation led by this worker. The wait holds a worker
+    thread, so it stays short; after it the caller answers 'processing' and
+    the client follows the tab through /api/ai/tab-events.
+    """
+    wait = current_app.config.get('TAB_GENERATION_JOIN_WAIT_SECONDS', 20)
+    release_db_connection()
+    if not flight.done.wait(wait):
+        return {'status': 'processing'}
+    if flight.error is not None:
+        return {'status': 'failed', 'error': flight.error}
+    return {'status': 'joined', 'data': flight.result}
+
+
+def generate_tab_single_flight(analysis_id, tab_name, generate):
+    """
+    Run `generate(lease)` unless the tab is already being generated.
+    `generate` returns (content, usage) where usage may hold model/input_tokens/output_tokens.
+
+    Returns:
+        dict: {'status': 'generated'|'joined', 'data': ...},
+              {'status': 'failed', 'error': ...} for a joined generation that failed, or
+              {'status': 'processing', 'started_at': ...} when another worker holds the lease.
+        Errors raised by `generate` propagate to the leader after the row is marked failed.
+    """
+    key = (analysis_id, tab_name)
+    with _flights_lock:
+        flight = _flights.get(key)
+    if flight is not None:
+        return _join(flight)
+
+    lease = acquire_tab_lease(analysis_id, tab_name)
+    if lease is None:
+        with _flights_lock:
+            flight = _flights.get(key)
+        if flight is not None:
+            return _join(flight)
+        started_at = db.session.query(_tabs.c.started_at).filter(_in_flight(analysis_id, tab_name)).scalar()
+        return {'status': 'processing', 'started_at': started_at.isoformat() if started_at else None}
+
+    flight = _Flight()
+    with _flights_lock:
+        _flights[key] = flight
+    publish_tab_change(analysis_id)
+    try:
+        with hold_lease(lease):
+            content, usage = generate(lease)
+        complete_tab_generation(lease, content, usage)
+        flight.result = content
+        return {'status': 'generated', 'data': content}
+    except Exception as e:
+        db.session.rollback()
+        flight.error = str(e)
+        try:
+            fail_tab_generation(lease, str(e))
+        except Exception as fail_error:
+            db.session.rollback()
+            print(f"Error recording failed generation: {fail_error}")
+        raise
+    finally:
+        with _flights_lock:
+            _flights.pop(key, None)
+        flight.done.set()
+        publish_tab_change(analysis_id)
+
+
+def reap_expired_leases():
+    """
+    Fail generations whose holder stopped heartbeating. Must run inside an app context.
+
+    Returns:
+        int: number of generations reaped
+    """
+    now = datetime.utcnow()
+    expired = db.session.query(_tabs.c.id, _tabs.c.analysis_id, _tabs.c.tab_name).filter(
+        _tabs.c.status == 'processing', _tabs.c.lease_expires_at < now
+    ).all()
+
+    reaped = 0
+    for row_id, analysis_id, tab_name in expired:
+        # Guard on the expiry again in case the holder renewed in the meantime
+        updated = db.session.execute(
+            _tabs.update()
+            .where(and_(_tabs.c.id == row_id, _tabs.c.status == 'processing', _tabs.c.lease_expires_at < now))
+            .values(status='failed', error='Generation timed out', lease_owner=None, lease_expires_at=None,
+                    updated_at=now)
+        ).rowcount
+        db.session.commit()
+        if not updated:
+            continue
+
+        publish_tab_change(analysis_id)
+        print(f"Reaped expired generation of {analysis_id}/{tab_name}")
+        reaped += 1
+
+    return reaped
+
+
+def start_lease_reaper(app):
+    """Start the expired-lease reaper once per process"""
+    from server.utils.background import start_periodic_task
+
+    return start_periodic_task(
+        app,
+        'tab-lease-reaper',
+        app.config.get('TAB_LEASE_REAPER_SECONDS', 30),
+        reap_expired_leases
+    )
@@ -1,11 +1,13 @@
 import re
-import bcrypt
-from openpyxl import load_workbook
 from io import BytesIO
 from server.models import db, User, Role
+from server.utils.lazy_imports import lazy_import
 import secrets
 import string
 
+bcrypt = lazy_import('bcrypt')
+openpyxl = lazy_import('openpyxl')
+
 REQUIRED_COLUMNS = ['email']
 OPTIONAL_COLUMNS = ['password', 'full_name', 'display_name', 'credits', 'role', 'language', 'phone_number', 'country', 'city']
 ALL_COLUMNS = REQUIRED_COLUMNS + OPTIONAL_COLUMNS
@@ -97,7 +99,7 @@ def normalize_column_name(col):
 
 def parse_excel_file(file_data):
     try:
-        wb = load_workbook(filename=BytesIO(file_data), read_only=True, data_only=True)
+        wb = openpyxl.load_workbook(filename=BytesIO(file_data), read_only=True, data_only=True)
         ws = wb.active
         
         rows = list(ws.iter_rows(values_only=True))
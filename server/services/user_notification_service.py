@@ -31,6 +31,46 @@ def create_user_notification(user_email, notification_type, title, message, meta
         return False
 
 
+def create_bulk_notifications(user_emails, notification_type, title, message, meta_data=None):
+    """
+    Fan out the same in-app notification to many users with a single
+    multi-row INSERT instead of one ORM object per recipient.
+    
+    Returns:
+        int: number of notifications created
+    """
+    rows = [
+        {
+            'user_email': user_email,
+            'type': notification_type,
+            'title': title,
+            'message': message,
+            'is_read': False,
+            'meta_data': meta_data or {}
+        }
+        for user_email in dict.fromkeys(user_emails)
+    ]
+    if not rows:
+        return 0
+    
+    try:
+        db.session.bulk_insert_mappings(Notification, rows)
+        db.session.commit()
+        return len(rows)
+    except Exception as e:
+        print(f"Error creating bulk notifications: {e}")
+        db.session.rollback()
+        return 0
+
+
+def get_unread_count(user_email):
+    """Count unread notifications (served by the partial unread index)"""
+    return db.session.query(db.func.count(Notification.id)).filter(
+        Notification.user_email == user_email,
+        Notification.is_read == False
+    ).scalar() or 0
+
+
 def send_user_email(user, subject, content_html, lang='en'):
     """Send email to user"""
     if not user.email_verified:
@@ -0,0 +1,104 @@
+"""
+Swagger UI and spec (flasgger) for the API.
+Eagerly, `Swagger(app)` imports flasgger and its dependencies on every worker
+boot and regenerates the spec from all view docstrings on every spec request.
+With API_DOCS_LAZY (on under FAST_BOOT), the docs routes are answered by a
+small side app built the first time one of them is requested: it carries
+copies of the main app's URL rules, so the spec is the same, and the spec is
+generated once per process and served from memory afterwards.
+"""
+import json
+import threading
+
+SWAGGER_TEMPLATE = {
+    "swagger": "2.0",
+    "info": {
+        "title": "Planlyze API",
+        "description": "Professional Business Analysis Platform API",
+        "version": "1.0.0",
+        "contact": {
+            "name": "Planlyze Support"
+        }
+    },
+    "schemes": ["http", "https"],
+    "basePath": "/api"
+}
+
+# flasgger's default routes: UI page, spec JSON and UI assets
+SPEC_ENDPOINT = 'apispec_1'
+SPEC_ROUTE = '/apispec_1.json'
+DOCS_PATH_PREFIXES = ('/apidocs', SPEC_ROUTE, '/flasgger_static/')
+
+
+def init_api_docs(app):
+    """Serve the API docs, eagerly or (API_DOCS_LAZY) on first request"""
+    if app.config.get('API_DOCS_LAZY'):
+        app.wsgi_app = LazyApiDocsMiddleware(app.wsgi_app, app)
+        return app
+
+    from flasgger import Swagger
+    Swagger(app, template=SWAGGER_TEMPLATE)
+    return app
+
+
+class LazyApiDocsMiddleware:
+    """WSGI middleware that builds the docs app and spec on first use"""
+
+    def __init__(self, wsgi_app, app):
+        self.wsgi_app = wsgi_app
+        self.app = app
+        self._docs_app = None
+        self._swagger = None
+        self._spec = None
+        self._lock = threading.Lock()
+
+    def __call__(self, environ, start_response):
+        path = environ.get('PATH_INFO', '')
+        if not path.startswith(DOCS_PATH_PREFIXES):
+            return self.wsgi_app(environ, start_response)
+
+        if path == SPEC_ROUTE:
+            from werkzeug.wrappers import Response
+            return Response(self.spec(), mimetype='application/json')(environ, start_response)
+        return self.docs_app()(environ, start_response)
+
+    def docs_app(self):
+        with self._lock:
+            if self._docs_app is None:
+                self._docs_app, self._swagger = build_docs_app(self.app)
+            return self._docs_app
+
+    def spec(self):
+        """Serialized spec, generated once"""
+        docs_app = self.docs_app()
+        with self._lock:
+            if self._spec is None:
+                with docs_app.test_request_context(SPEC_ROUTE):
+                    spec = self._swagger.get_apispecs(SPEC_ENDPOINT)
+                self._spec = json.dumps(spec).encode('utf-8')
+            return self._spec
+
+
+def build_docs_app(app):
+    """
+    Flask app with flasgger and copies of `app`'s routes (never dispatched to)
+
+    Returns:
+        tuple: (docs_app, swagger)
+    """
+    from flask import Flask
+    from flasgger import Swagger
+
+    docs_app = Flask(app.import_name)
+    for rule in app.url_map.iter_rules():
+        if rule.endpoint == 'static':
+            continue
+        docs_app.add_url_rule(
+            rule.rule,
+            endpoint=rule.endpoint,
+            view_func=app.view_functions[rule.endpoint],
+            methods=rule.methods - {'HEAD', 'OPTIONS'},
+            defaults=rule.defaults,
+        )
+    swagger = Swagger(docs_app, template=SWAGGER_TEMPLATE)
+    return docs_app, swagger
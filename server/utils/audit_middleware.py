@@ -129,7 +129,8 @@ def setup_audit_logging(app):
             
             response_body = None
             try:
-                if response.content_type and 'application/json' in response.content_type:
+                # Reading a streamed body here would buffer it all in memory
+                if not response.is_streamed and response.content_type and 'application/json' in response.content_type:
                     response_data = response.get_json(silent=True)
                     if response_data:
                         response_body = mask_sensitive_data(response_data)
@@ -138,7 +139,7 @@ def setup_audit_logging(app):
                 pass
             
             error_message = None
-            if response.status_code >= 400:
+            if response.status_code >= 400 and not response.is_streamed:
                 try:
                     error_data = response.get_json(silent=True)
                     if error_data and 'error' in error_data:
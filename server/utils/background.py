@@ -0,0 +1,40 @@
+"""
+Once-per-process periodic background threads.
+create_app() can run more than once in a process (e.g. scripts that build
+their own app), so each named loop is only started once.
+"""
+import threading
+import time
+
+_threads = {}
+_threads_lock = threading.Lock()
+
+
+def start_periodic_task(app, name, interval_seconds, task):
+    """
+    Run `task()` every `interval_seconds` inside an app context on a daemon thread.
+    Errors are logged and the session is cleaned up after each run.
+    """
+    with _threads_lock:
+        thread = _threads.get(name)
+        if thread is not None and thread.is_alive():
+            return thread
+
+        def loop():
+            from server.models import db
+
+            while True:
+                time.sleep(interval_seconds)
+                with app.app_context():
+                    try:
+                        task()
+                    except Exception as e:
+                        db.session.rollback()
+                        print(f"Background task '{name}' error: {e}")
+                    finally:
+                        db.session.remove()
+
+        thread = threading.Thread(target=loop, name=name, daemon=True)
+        thread.start()
+        _threads[name] = thread
+        return thread
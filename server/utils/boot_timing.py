@@ -0,0 +1,90 @@
+"""
+Worker cold-start measurement.
+`create_app()` records how long each startup phase took in
+`app.extensions['boot_timings']` and logs one summary line. The CLI boots
+fresh interpreters the way a gunicorn worker does (import the app module,
+build the app, serve a first request) and prints the breakdown:
+
+    FLASK_ENV=production python -m server.utils.boot_timing [--runs 5]
+"""
+import time
+
+READY_TARGET_MS = 200
+
+
+class BootTimer:
+    """Milliseconds spent in consecutive startup phases"""
+
+    def __init__(self):
+        self.started = self.last = time.perf_counter()
+        self.phases = []
+
+    def mark(self, phase):
+        now = time.perf_counter()
+        self.phases.append((phase, round((now - self.last) * 1000, 1)))
+        self.last = now
+
+    @property
+    def total_ms(self):
+        return round((self.last - self.started) * 1000, 1)
+
+    def summary(self):
+        return ', '.join(f"{phase} {ms}" for phase, ms in self.phases)
+
+
+# Runs in a fresh interpreter so module imports are cold
+_PROBE = """
+import json, logging, time
+started = time.perf_counter()
+from server.app import create_app
+imported = time.perf_counter()
+logging.disable(logging.INFO)
+app = create_app()
+created = time.perf_counter()
+app.test_client().get('/api/health')
+served = time.perf_counter()
+print(json.dumps({
+    'import server.app': (imported - started) * 1000,
+    'phases': app.extensions['boot_timings'],
+    'create_app': (created - imported) * 1000,
+    'first request': (served - created) * 1000,
+    'ready': (served - started) * 1000,
+}))
+"""
+
+
+def measure_cold_start(runs=5):
+    """Boot `runs` fresh interpreters and return their timing reports"""
+    import json
+    import subprocess
+    import sys
+
+    reports = []
+    for _ in range(runs):
+        out = subprocess.run([sys.executable, '-c', _PROBE], check=True, stdout=subprocess.PIPE, text=True).stdout
+        reports.append(json.loads(out.strip().splitlines()[-1]))
+    return reports
+
+
+def print_report(reports):
+    def median(values):
+        values = sorted(values)
+        return values[len(values) // 2]
+
+    print(f"Cold start, median of {len(reports)} run(s) (ms)")
+    print(f"  {'import server.app':<24}{median([r['import server.app'] for r in reports]):>8.1f}")
+    print(f"  {'create_app':<24}{median([r['create_app'] for r in reports]):>8.1f}")
+    for i, (phase, _) in enumerate(reports[0]['phases']):
+        print(f"    {phase:<22}{median([r['phases'][i][1] for r in reports]):>8.1f}")
+    print(f"  {'first request':<24}{median([r['first request'] for r in reports]):>8.1f}")
+    ready = median([r['ready'] for r in reports])
+    verdict = 'within' if ready <= READY_TARGET_MS else 'over'
+    print(f"  {'ready':<24}{ready:>8.1f}  ({verdict} the {READY_TARGET_MS} ms target)")
+
+
+if __name__ == '__main__':
+    import sys
+
+    args = sys.argv[1:]
+    runs = int(args[args.index('--runs') + 1]) if '--runs' in args else 5
+    print_report(measure_cold_start(runs))
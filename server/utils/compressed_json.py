@@ -0,0 +1,198 @@
+"""
+Compressed JSON column type for large report payloads.
+Report tabs and `analyses.report` are tens of kilobytes of repetitive JSON per
+row. `CompressedJSON` stores them as zlib-compressed bytes (bytea/BLOB), primed
+with a preset dictionary of the tab schema keys so even small tabs compress
+well; Postgres then moves fewer pages and ships fewer bytes per read.
+
+Stored format (first byte):
+    0x01  zlib, no dictionary
+    0x02  zlib with dictionary v1 (_TAB_KEYS_V1)
+    other plain UTF-8 JSON (small values, and rows not yet recompressed by
+          schema migration 4), so the column stays readable mid-migration
+
+Values are decompressed in the result processor, i.e. only when the column is
+part of the SELECT; status, ETag and list queries read narrow columns and
+never pay for it.
+
+Benchmark: python -m server.utils.compressed_json [payload.json] [--db]
+"""
+import zlib
+
+from sqlalchemy.types import LargeBinary, TypeDecorator
+
+from server.utils import json_provider
+
+FORMAT_ZLIB = 0x01
+FORMAT_ZLIB_DICT_V1 = 0x02
+
+# Values smaller than this are stored as plain JSON; compression would not pay off
+MIN_COMPRESS_BYTES = 200
+COMPRESS_LEVEL = 6
+
+# Keys of the TAB_PROMPTS response schemas (most frequent last, which zlib
+# favours). Frozen: rows compressed with v1 need exactly these bytes to be
+# read back. Add a _V2 and a new format byte instead of editing this.
+_TAB_KEYS_V1 = (
+    'action_plan', 'mitigation', 'impact', 'severity', 'risk', 'risk_assessment', 'suitability', 'terms',
+    'amount_range', 'source', 'funding_opportunities', 'justification', 'price', 'tiers', 'approach',
+    'model', 'pricing_strategy', 'estimated_monthly_revenue', 'potential', 'revenue_streams', 'how_it_helps',
+    'purpose', 'ai_tools', 'scope', 'core_features', 'mvp', 'development_plan', 'total_team_cost_monthly',
+    'monthly_cost_usd', 'count', 'role', 'team_requirements', 'implementation_details', 'languages',
+    'estimated_time', 'technology', 'category', 'recommended_stack', 'technical_stack',
+    'measurement_frequency', 'target', 'metric', 'kpis', 'potential_partners', 'partner_type', 'partnerships',
+    'estimated_cost', 'idea', 'marketing_ideas', 'marketing_ideas_and_partnerships', 'channel_name',
+    'distribution_channels', 'target_approach', 'key_messages', 'marketing_strategy', 'step',
+    'validation_steps', 'go_to_market_strategy', 'threats', 'opportunities', 'weaknesses', 'strengths', 'swot',
+    'competitive_advantages', 'recommended_features', 'unique_value_proposition',
+    'differentiation_opportunities', 'gaps_in_market', 'market_uniqueness', 'telegram', 'whatsapp',
+    'instagram', 'facebook', 'social', 'website', 'ios', 'android', 'app_links', 'relevance',
+    'syrian_competitors', 'regulations', 'challenges', 'unique_factors', 'growth_rate_percent',
+    'market_size_usd', 'opportunity', 'syrian_market', 'how_it_solves', 'unique_value', 'key_features',
+    'solution', 'problems', 'target_audiences', 'starting_cost_usd', 'competitors_count',
+    'time_to_build_months', 'market_fit_score', 'step_number', 'type', 'prototype_approach', 'how_to_build',
+    'feature', 'version', 'cons', 'pros', 'overview', 'value_proposition', 'features', 'priority', 'details',
+    'timeline', 'name', 'title', 'behavior', 'needs', 'size_estimate', 'segment', 'description',
+)
+ZDICT_V1 = b''.join(b'"%s":"' % key.encode('ascii') for key in _TAB_KEYS_V1)
+
+_ZDICTS = {FORMAT_ZLIB_DICT_V1: ZDICT_V1}
+
+
+def compress_json_bytes(data, level=COMPRESS_LEVEL):
+    """Encode serialized JSON bytes in the stored format"""
+    if len(data) < MIN_COMPRESS_BYTES:
+        return data
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 15, 9, zlib.Z_DEFAULT_STRATEGY, ZDICT_V1)
+    return bytes((FORMAT_ZLIB_DICT_V1,)) + compressor.compress(data) + compressor.flush()
+
+
+def decompress_json_bytes(stored):
+    """Serialized JSON bytes from a stored value (compressed or plain)"""
+    if isinstance(stored, str):
+        # SQLite hands back TEXT for rows written by the old JSON column type
+        return stored.encode('utf-8')
+    stored = bytes(stored)
+    if not stored:
+        return stored
+    fmt = stored[0]
+    if fmt == FORMAT_ZLIB:
+        return zlib.decompress(stored[1:])
+    if fmt in _ZDICTS:
+        decompressor = zlib.decompressobj(15, zdict=_ZDICTS[fmt])
+        return decompressor.decompress(stored[1:]) + decompressor.flush()
+    return stored
+
+
+def is_compressed(stored):
+    return isinstance(stored, (bytes, bytearray, memoryview)) and len(stored) > 0 and stored[0] in (FORMAT_ZLIB, *_ZDICTS)
+
+
+class CompressedJSON(TypeDecorator):
+    """JSON value stored as (dictionary-)zlib-compressed bytes"""
+
+    impl = LargeBinary
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        return compress_json_bytes(json_provider.dumps_bytes(value))
+
+    def process_result_value(self, value, dialect):
+        if value is None:
+            return None
+        data = decompress_json_bytes(value)
+        return json_provider.loads(data) if data else None
+
+
+def run_benchmark(payload, iterations=50):
+    """Print stored size and encode/decode time per value for each storage format"""
+    import time
+
+    value = json_provider.dumps_bytes(payload)
+    column = CompressedJSON()
+
+    def timed(fn):
+        start = time.perf_counter()
+        for _ in range(iterations):
+            out = fn()
+        return out, (time.perf_counter() - start) * 1000 / iterations
+
+    def zlib_only(data):
+        return bytes((FORMAT_ZLIB,)) + zlib.compress(data, COMPRESS_LEVEL)
+
+    print(f"Raw JSON: {len(value):,} bytes")
+    print(f"{'format':<14}{'bytes':>10}{'ratio':>8}{'write ms':>10}{'read ms':>10}")
+
+    _, write_ms = timed(lambda: json_provider.dumps_bytes(payload))
+    _, read_ms = timed(lambda: json_provider.loads(value))
+    print(f"{'json':<14}{len(value):>10,}{1.0:>8.1f}{write_ms:>10.3f}{read_ms:>10.3f}")
+
+    for name, encode in (('zlib', zlib_only), ('zlib+dict', compress_json_bytes)):
+        stored, write_ms = timed(lambda: encode(json_provider.dumps_bytes(payload)))
+        decoded, read_ms = timed(lambda: column.process_result_value(stored, None))
+        assert decoded == json_provider.loads(value)
+        print(f"{name:<14}{len(stored):>10,}{len(value) / len(stored):>8.1f}{write_ms:>10.3f}{read_ms:>10.3f}")
+
+
+def report_database_stats():
+    """
+    Print on-disk size and buffer-cache hit rate of the report tables in the
+    DATABASE_URL Postgres database. Connects directly (no app, so no
+    migrations run): take one reading before deploying schema migration 4 and
+    one after, each after exercising the report pages, to compare.
+    """
+    import os
+
+    from sqlalchemy import create_engine, text
+
+    engine = create_engine(os.environ['DATABASE_URL'])
+    if engine.dialect.name != 'postgresql':
+        print("Database stats need PostgreSQL")
+        return
+    with engine.connect() as conn:
+        rows = conn.execute(text("""
+            SELECT relname,
+                   pg_total_relation_size(relid) AS total_bytes,
+                   heap_blks_hit + COALESCE(toast_blks_hit, 0) AS hits,
+                   heap_blks_read + COALESCE(toast_blks_read, 0) AS reads
+            FROM pg_statio_user_tables
+            WHERE relname IN ('analyses', 'analysis_tabs')
+            ORDER BY relname
+        """)).all()
+    print(f"{'table':<16}{'size':>14}{'blks hit':>12}{'blks read':>12}{'hit rate':>10}")
+    for row in rows:
+        total = row.hits + row.reads
+        rate = f"{row.hits / total:.1%}" if total else '-'
+        print(f"{row.relname:<16}{row.total_bytes:>14,}{row.hits:>12,}{row.reads:>12,}{rate:>10}")
+
+
+if __name__ == '__main__':
+    import json
+    import sys
+
+    args = sys.argv[1:]
+    if '--db' in args:
+        args.remove('--db')
+        report_database_stats()
+
+    if args:
+        with open(args[0]) as f:
+            samples = json.load(f)
+        samples = samples if isinstance(samples, dict) else {'payload': samples}
+    else:
+        from server.utils.response_compression import _sample_payload
+        samples = {
+            'overview tab': {
+                'market_fit_score': 72, 'time_to_build_months': 6, 'competitors_count': 4,
+                'starting_cost_usd': 12000,
+                'value_proposition': 'A delivery marketplace connecting home cooks in Damascus with office '
+                                     'workers who want affordable, healthy lunches delivered on time.'
+            },
+            'large tab': _sample_payload()['tab_market'],
+        }
+
+    for name, sample in samples.items():
+        print(f"\n{name}")
+        run_benchmark(sample)
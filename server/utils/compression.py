@@ -0,0 +1,67 @@
+"""
+Content-encoding helpers shared by static asset serving and API responses.
+gzip is always available; brotli is used when the optional `brotli` package
+is installed.
+"""
+import gzip
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Preferred order when the client accepts several encodings equally
+SUPPORTED_ENCODINGS = ('br', 'gzip') if brotli else ('gzip',)
+
+COMPRESSIBLE_MIMETYPES = (
+    'text/', 'application/javascript', 'application/json', 'application/xml',
+    'image/svg+xml', 'application/manifest+json', 'font/ttf', 'font/otf',
+)
+
+
+def is_compressible(mimetype):
+    return bool(mimetype) and mimetype.startswith(COMPRESSIBLE_MIMETYPES)
+
+
+def parse_accept_encoding(header):
+    """Return {encoding: q} from an Accept-Encoding header"""
+    accepted = {}
+    for part in (header or '').split(','):
+        part = part.strip()
+        if not part:
+            continue
+        name, _, params = part.partition(';')
+        q = 1.0
+        params = params.strip()
+        if params.startswith('q='):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        accepted[name.strip().lower()] = q
+    return accepted
+
+
+def negotiate_encoding(accept_encoding, available=SUPPORTED_ENCODINGS):
+    """Pick the best encoding from `available` the client accepts, or None for identity"""
+    accepted = parse_accept_encoding(accept_encoding)
+    if not accepted:
+        return None
+    best = None
+    best_q = 0.0
+    for encoding in available:
+        q = accepted.get(encoding, accepted.get('*', 0.0))
+        if q > best_q:
+            best, best_q = encoding, q
+    return best
+
+
+def compress(data, encoding, level=None):
+    """Compress bytes with 'gzip' or 'br'"""
+    if encoding == 'gzip':
+        return gzip.compress(data, compresslevel=level if level is not None else 9, mtime=0)
+    if encoding == 'br':
+        if brotli is None:
+            raise ValueError("brotli is not installed")
+        return brotli.compress(data, quality=level if level is not None else 11)
+    raise ValueError(f"Unsupported encoding: {encoding}")
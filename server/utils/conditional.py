@@ -0,0 +1,40 @@
+"""
+Conditional GET helpers for authenticated, frequently polled endpoints.
+Views compute an ETag from cheap version columns (e.g. `updated_at`, per-tab
+versions) before loading the row body, and answer a matching If-None-Match with
+a 304 so the large JSON columns are never read or serialized. Responses are
+marked `private, no-cache`: browsers keep them and revalidate on every request,
+shared caches never store them.
+"""
+import hashlib
+
+from flask import current_app, request
+
+
+def make_etag(*parts):
+    """Build an opaque ETag value from version parts (ids, timestamps, counters)"""
+    raw = '|'.join('' if part is None else str(part) for part in parts)
+    return hashlib.md5(raw.encode('utf-8')).hexdigest()
+
+
+def is_not_modified(etag):
+    """True if the request's If-None-Match matches `etag` (weak comparison, so
+    ETags weakened by response compression still match)"""
+    return etag is not None and request.if_none_match.contains_weak(etag)
+
+
+def _set_validators(response, etag):
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = 'private, no-cache'
+    response.vary.add('Authorization')
+    return response
+
+
+def not_modified(etag):
+    """Empty 304 response carrying the current validators"""
+    return _set_validators(current_app.response_class(status=304), etag)
+
+
+def with_etag(response, etag):
+    """Attach the ETag and revalidation headers to a 200 response"""
+    return _set_validators(current_app.make_response(response), etag)
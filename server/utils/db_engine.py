@@ -0,0 +1,217 @@
+"""
+Database engine profile and connection pool instrumentation.
+`build_engine_options()` turns the DB_* settings in config.py into
+SQLALCHEMY_ENGINE_OPTIONS: a bounded pool per process, pre-ping, recycle,
+connect/statement timeouts, and a PgBouncer (transaction pooling) mode that
+sends no startup parameters and sets the statement timeout per transaction.
+
+Pool checkouts are timed by `InstrumentedQueuePool`, so the wait for a free
+connection and the pool's saturation can be read from `pool_metrics()`
+(exposed at GET /api/db-pool-metrics). Each gunicorn worker has its own pool:
+size the database for workers x (DB_POOL_SIZE + DB_MAX_OVERFLOW) connections,
+or for the PgBouncer pool when DB_PGBOUNCER is on.
+"""
+import functools
+import threading
+import time
+from collections import deque
+
+from sqlalchemy import event
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import QueuePool
+
+from server.utils import json_provider
+
+# Checkouts slower than this count as having waited for a connection
+WAIT_THRESHOLD_SECONDS = 0.005
+
+
+class PoolStats:
+    """Checkout wait times and peak usage of one pool"""
+
+    def __init__(self, samples=2000):
+        self._lock = threading.Lock()
+        self._waits = deque(maxlen=samples)
+        self.checkouts = 0
+        self.waited = 0
+        self.timeouts = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+        self.peak_checked_out = 0
+
+    def record(self, wait, checked_out):
+        with self._lock:
+            self.checkouts += 1
+            self.total_wait += wait
+            self.max_wait = max(self.max_wait, wait)
+            self.peak_checked_out = max(self.peak_checked_out, checked_out)
+            if wait >= WAIT_THRESHOLD_SECONDS:
+                self.waited += 1
+            self._waits.append(wait)
+
+    def record_timeout(self):
+        with self._lock:
+            self.timeouts += 1
+
+    def snapshot(self):
+        with self._lock:
+            waits = sorted(self._waits)
+            checkouts = self.checkouts
+
+            def percentile(p):
+                return round(waits[min(len(waits) - 1, int(len(waits) * p))] * 1000, 2) if waits else 0.0
+
+            return {
+                'checkouts': checkouts,
+                'waited': self.waited,
+                'timeouts': self.timeouts,
+                'wait_ms_avg': round(self.total_wait / checkouts * 1000, 2) if checkouts else 0.0,
+                'wait_ms_p95': percentile(0.95),
+                'wait_ms_max': round(self.max_wait * 1000, 2),
+                'peak_checked_out': self.peak_checked_out,
+            }
+
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool that records how long each checkout waited for a connection"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.stats = PoolStats()
+
+    def recreate(self):
+        # Keep the history when the engine replaces its pool (dispose, invalidation)
+        pool = super().recreate()
+        pool.stats = self.stats
+        return pool
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except PoolTimeoutError:
+            self.stats.record_timeout()
+            raise
+        self.stats.record(time.perf_counter() - start, self.checkedout())
+        return connection
+
+
+def build_engine_options(database_uri, pool_size=5, max_overflow=10, pool_timeout=10, pool_recycle=1800,
+                         pre_ping=True, connect_timeout=10, statement_timeout_ms=30000, pgbouncer=False):
+    """SQLALCHEMY_ENGINE_OPTIONS for the configured database"""
+    options = {
+        'json_serializer': json_provider.dumps,
+        'json_deserializer': json_provider.loads,
+    }
+    if not (database_uri or '').startswith(('postgres://', 'postgresql')):
+        return options
+
+    connect_args = {'connect_timeout': connect_timeout, 'application_name': 'planlyze'}
+    if statement_timeout_ms and not pgbouncer:
+        # PgBouncer rejects startup options; that mode uses SET LOCAL per transaction instead
+        connect_args['options'] = f'-c statement_timeout={int(statement_timeout_ms)}'
+
+    options.update({
+        'poolclass': InstrumentedQueuePool,
+        'pool_size': pool_size,
+        'max_overflow': max_overflow,
+        'pool_timeout': pool_timeout,
+        'pool_recycle': pool_recycle,
+        'pool_pre_ping': pre_ping,
+        'connect_args': connect_args,
+    })
+    return options
+
+
+def _is_postgres(engine):
+    return engine.dialect.name == 'postgresql'
+
+
+def _requested_timeout(app):
+    """Statement timeout for the current transaction, or None to keep the connection default"""
+    from flask import g, has_request_context
+
+    if has_request_context() and g.get('statement_timeout_ms'):
+        return g.statement_timeout_ms
+    if app.config.get('DB_PGBOUNCER'):
+        return app.config.get('DB_STATEMENT_TIMEOUT_MS') or None
+    return None
+
+
+def setup_sqlite_foreign_keys(engine):
+    """
+    Turn on foreign key enforcement for SQLite connections, which is off by
+    default. Without it ON DELETE CASCADE is ignored and child rows the ORM
+    leaves to the database (passive_deletes) would be orphaned.
+    """
+    if engine.dialect.name != 'sqlite':
+        return
+
+    @event.listens_for(engine, 'connect')
+    def enable_foreign_keys(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            cursor.execute('PRAGMA foreign_keys=ON')
+        finally:
+            cursor.close()
+
+
+def setup_statement_timeouts(app, engine):
+    """Apply per-route (and, with PgBouncer, default) statement timeouts at transaction begin"""
+    if not _is_postgres(engine):
+        return
+
+    @event.listens_for(engine, 'begin')
+    def set_statement_timeout(conn):
+        timeout = _requested_timeout(app)
+        if timeout:
+            cursor = conn.connection.dbapi_connection.cursor()
+            try:
+                cursor.execute('SET LOCAL statement_timeout = %s', (int(timeout),))
+            finally:
+                cursor.close()
+
+
+def statement_timeout(milliseconds):
+    """
+    Route decorator raising or lowering the statement timeout for the request.
+    Place it below the auth decorator; a transaction the auth check already
+    opened is updated in place.
+    """
+    def decorator(f):
+        @functools.wraps(f)
+        def wrapper(*args, **kwargs):
+            from flask import g
+            from sqlalchemy import text
+
+            from server.models import db
+
+            g.statement_timeout_ms = milliseconds
+            if _is_postgres(db.engine) and db.session.in_transaction():
+                db.session.execute(text(f'SET LOCAL statement_timeout = {int(milliseconds)}'))
+            return f(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def pool_metrics(engine):
+    """Pool size, current usage and checkout wait statistics for this process"""
+    import os
+
+    pool = engine.pool
+    metrics = {'pid': os.getpid(), 'pool': type(pool).__name__}
+    if isinstance(pool, QueuePool):
+        capacity = pool.size() + max(pool._max_overflow, 0)
+        checked_out = pool.checkedout()
+        metrics.update({
+            'size': pool.size(),
+            'max_overflow': pool._max_overflow,
+            'checked_out': checked_out,
+            'idle': pool.checkedin(),
+            'overflow': max(pool.overflow(), 0),
+            'saturation': round(checked_out / capacity, 3) if capacity else None,
+        })
+    stats = getattr(pool, 'stats', None)
+    if stats is not None:
+        metrics.update(stats.snapshot())
+    return metrics
@@ -0,0 +1,104 @@
+"""
+Read-replica routing for heavy read-only endpoints.
+When DATABASE_REPLICA_URL is set it is registered as the 'replica' bind, and
+views decorated with `@read_replica` run their queries against it. Everything
+else, including any flush from those views (the audit log, for instance),
+goes to the primary.
+
+Read-your-writes: a successful POST/PUT/PATCH/DELETE pins the caller to the
+primary for DB_REPLICA_STICKY_SECONDS, so a dashboard reloaded right after an
+edit never shows replica lag. The pin is a cookie (works across workers) and
+an in-process entry keyed by the bearer token (for clients without cookies).
+
+Try it locally with two SQLite files, the second a copy of the first:
+    cp app.db replica.db
+    DATABASE_URL=sqlite:///app.db DATABASE_REPLICA_URL=sqlite:///replica.db python wsgi.py
+"""
+import functools
+import hashlib
+import threading
+import time
+
+from flask import g, has_request_context, request
+from flask_sqlalchemy.session import Session
+
+REPLICA_BIND = 'replica'
+STICKY_COOKIE = 'db_primary_until'
+WRITE_METHODS = ('POST', 'PUT', 'PATCH', 'DELETE')
+
+_pinned = {}  # token digest -> epoch seconds until which reads stay on the primary
+_pinned_lock = threading.Lock()
+
+
+class RoutingSession(Session):
+    """Session that sends reads to the replica inside @read_replica views"""
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if (
+            bind is None
+            and not self._flushing
+            and has_request_context()
+            and g.get('db_use_replica')
+        ):
+            engine = self._db.engines.get(REPLICA_BIND)
+            if engine is not None:
+                return engine
+        return super().get_bind(mapper, clause=clause, bind=bind, **kwargs)
+
+
+def _token_key():
+    auth_header = request.headers.get('Authorization')
+    if not auth_header:
+        return None
+    return hashlib.sha1(auth_header.encode('utf-8')).hexdigest()
+
+
+def _pinned_to_primary():
+    now = time.time()
+    try:
+        if float(request.cookies.get(STICKY_COOKIE, 0)) > now:
+            return True
+    except ValueError:
+        pass
+    key = _token_key()
+    if key is None:
+        return False
+    with _pinned_lock:
+        return _pinned.get(key, 0) > now
+
+
+def read_replica(f):
+    """Route this view's queries to the replica unless the caller wrote recently"""
+    @functools.wraps(f)
+    def wrapper(*args, **kwargs):
+        if not _pinned_to_primary():
+            g.db_use_replica = True
+        return f(*args, **kwargs)
+    return wrapper
+
+
+def setup_read_routing(app):
+    """Register the read-your-writes hook when a replica is configured"""
+    if REPLICA_BIND not in (app.config.get('SQLALCHEMY_BINDS') or {}):
+        return app
+
+    sticky_seconds = app.config.get('DB_REPLICA_STICKY_SECONDS', 10)
+
+    @app.after_request
+    def pin_writers_to_primary(response):
+        if request.method not in WRITE_METHODS or response.status_code >= 400:
+            return response
+        until = time.time() + sticky_seconds
+        key = _token_key()
+        if key is not None:
+            with _pinned_lock:
+                _pinned[key] = until
+                if len(_pinned) > 10000:
+                    now = time.time()
+                    for stale in [k for k, v in _pinned.items() if v <= now]:
+                        del _pinned[stale]
+        response.set_cookie(STICKY_COOKIE, str(int(until)), max_age=sticky_seconds,
+                            httponly=True, samesite='Lax', secure=request.is_secure)
+        return response
+
+    return app
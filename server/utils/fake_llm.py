@@ -0,0 +1,133 @@
+"""
+Local stand-in for the Anthropic Messages API.
+Answers POST /v1/messages after a fixed delay with a well-formed message, so
+the Claude routes can be load-tested without spending tokens. It counts the
+requests it is holding at once, which shows how many calls the app really
+keeps in flight.
+
+Usage:
+    python -m server.utils.fake_llm --port 8030 [--latency 2.0] [--text '{"valid": true}']
+    AI_INTEGRATIONS_ANTHROPIC_API_KEY=local AI_INTEGRATIONS_ANTHROPIC_BASE_URL=http://localhost:8030 python main.py
+
+GET    /stats -> {'requests': n, 'in_flight': n, 'peak_in_flight': n}
+DELETE /stats -> reset the counters
+"""
+import argparse
+import json
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+DEFAULT_TEXT = '{"valid": true, "reason": "", "confidence": 0.9, "industry_match": true}'
+
+
+class _Server(ThreadingHTTPServer):
+    # Load tests open hundreds of connections at once
+    request_queue_size = 1024
+
+
+class FakeLLM:
+    def __init__(self, latency=2.0, text=DEFAULT_TEXT):
+        self.latency = latency
+        self.text = text
+        self.requests = 0
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.lock = threading.Lock()
+
+    def stats(self):
+        with self.lock:
+            return {'requests': self.requests, 'in_flight': self.in_flight, 'peak_in_flight': self.peak_in_flight}
+
+    def reset(self):
+        with self.lock:
+            self.requests = 0
+            self.peak_in_flight = self.in_flight
+
+    def make_handler(self):
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def _send_json(self, status, data):
+                body = json.dumps(data).encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_POST(self):
+                length = int(self.headers.get('Content-Length', 0))
+                raw = self.rfile.read(length)
+
+                if self.path.split('?')[0] != '/v1/messages':
+                    self._send_json(404, {'type': 'error', 'error': {'type': 'not_found_error', 'message': self.path}})
+                    return
+                try:
+                    payload = json.loads(raw or b'{}')
+                except ValueError:
+                    self._send_json(400, {'type': 'error', 'error': {'type': 'invalid_request_error', 'message': 'invalid json'}})
+                    return
+
+                with fake.lock:
+                    fake.requests += 1
+                    fake.in_flight += 1
+                    fake.peak_in_flight = max(fake.peak_in_flight, fake.in_flight)
+                try:
+                    time.sleep(fake.latency)
+                finally:
+                    with fake.lock:
+                        fake.in_flight -= 1
+
+                self._send_json(200, {
+                    'id': f'msg_{uuid.uuid4().hex[:24]}',
+                    'type': 'message',
+                    'role': 'assistant',
+                    'model': payload.get('model', 'claude-sonnet-4-5'),
+                    'content': [{'type': 'text', 'text': fake.text}],
+                    'stop_reason': 'end_turn',
+                    'stop_sequence': None,
+                    'usage': {'input_tokens': len(raw) // 4, 'output_tokens': len(fake.text) // 4},
+                })
+
+            def do_GET(self):
+                self._send_json(200, fake.stats())
+
+            def do_DELETE(self):
+                fake.reset()
+                self._send_json(200, fake.stats())
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def serve(self, host='127.0.0.1', port=8030):
+        server = _Server((host, port), self.make_handler())
+        server.daemon_threads = True
+        print(f"Fake LLM listening on http://{host}:{server.server_address[1]}")
+        return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Local Anthropic Messages API stand-in')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8030)
+    parser.add_argument('--latency', type=float, default=2.0, help='seconds before each reply')
+    parser.add_argument('--text', default=DEFAULT_TEXT, help='text content of every reply')
+    args = parser.parse_args()
+
+    server = FakeLLM(args.latency, args.text).serve(args.host, args.port)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == '__main__':
+    main()
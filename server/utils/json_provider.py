@@ -0,0 +1,87 @@
+"""
+Fast JSON encoding for Flask responses and SQLAlchemy JSON columns.
+Uses orjson when it is installed and falls back to the stdlib json module
+otherwise. Both paths serialize datetime/date/time as ISO 8601 and UUID/Decimal
+as strings, so models can return native values from to_dict().
+"""
+import dataclasses
+import decimal
+import json
+import uuid
+from datetime import date, datetime, time
+
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+_ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS if orjson else 0
+
+
+def default(o):
+    """Fallback encoder for types neither backend handles natively"""
+    if isinstance(o, (datetime, date, time)):
+        return o.isoformat()
+    if isinstance(o, (decimal.Decimal, uuid.UUID)):
+        return str(o)
+    if dataclasses.is_dataclass(o) and not isinstance(o, type):
+        return dataclasses.asdict(o)
+    if isinstance(o, (set, frozenset)):
+        return list(o)
+    if hasattr(o, '__html__'):
+        return str(o.__html__())
+    raise TypeError(f"Object of type {type(o).__name__} is not JSON serializable")
+
+
+def dumps_bytes(obj, indent=False):
+    """Serialize to UTF-8 bytes"""
+    if orjson is not None:
+        options = _ORJSON_OPTIONS | (orjson.OPT_INDENT_2 if indent else 0)
+        try:
+            return orjson.dumps(obj, default=default, option=options)
+        except TypeError:
+            # e.g. integers beyond 64 bits; let the stdlib handle the odd case
+            pass
+    if indent:
+        return json.dumps(obj, default=default, ensure_ascii=False, indent=2).encode('utf-8')
+    return json.dumps(obj, default=default, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+def dumps(obj, **kwargs):
+    """Serialize to str (used as SQLAlchemy's json_serializer)"""
+    if kwargs:
+        kwargs.setdefault('default', default)
+        return json.dumps(obj, **kwargs)
+    return dumps_bytes(obj).decode('utf-8')
+
+
+def loads(s, **kwargs):
+    """Deserialize str/bytes (used as SQLAlchemy's json_deserializer)"""
+    if orjson is not None and not kwargs:
+        return orjson.loads(s)
+    return json.loads(s, **kwargs)
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    """Flask JSON provider backed by orjson (or stdlib json as a fallback)"""
+
+    ensure_ascii = False
+    sort_keys = False
+    default = staticmethod(default)
+
+    def dumps(self, obj, **kwargs):
+        if kwargs:
+            kwargs.setdefault('default', default)
+            kwargs.setdefault('ensure_ascii', self.ensure_ascii)
+            return json.dumps(obj, **kwargs)
+        return dumps_bytes(obj).decode('utf-8')
+
+    def loads(self, s, **kwargs):
+        return loads(s, **kwargs)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        indent = (self.compact is None and self._app.debug) or self.compact is False
+        return self._app.response_class(dumps_bytes(obj, indent=indent) + b'\n', mimetype=self.mimetype)
@@ -0,0 +1,68 @@
+"""
+Deferred imports for heavy optional modules.
+`lazy_import(name)` returns a stand-in that imports the real module on first
+attribute access, so a module-level `anthropic = lazy_import('anthropic')`
+reads like a normal import but costs nothing until a route calls the SDK.
+
+DEFERRED_MODULES is the registry of modules that must not load while a
+worker boots; `python -m server.import_profile` fails when one does. Add a
+module here when deferring it, whether through lazy_import() or an import
+inside the function that needs it.
+"""
+import importlib
+import sys
+import threading
+
+DEFERRED_MODULES = {
+    'anthropic': 'Claude SDK (~1.3 s); AI routes and background analysis only',
+    'openpyxl': 'Excel user/report imports (admin only)',
+    'requests': 'ZeptoMail HTTP client; used when an email is sent',
+    'bcrypt': 'password hashing; login, registration and password changes',
+    'flasgger': 'Swagger docs, built on first /apidocs/ request (API_DOCS_LAZY)',
+    'alembic': 'Flask-Migrate, `flask db` commands only (FAST_BOOT)',
+    'server.services.competitor_service': 'competitor dataset (4,400 lines) for tab prompts',
+}
+
+_lazy_modules = {}
+_lazy_modules_lock = threading.Lock()
+
+
+class LazyModule:
+    """Stand-in for a module, imported on first attribute access"""
+
+    def __init__(self, name):
+        self.__dict__['_lazy_name'] = name
+        self.__dict__['_lazy_module'] = None
+
+    def _load(self):
+        module = self.__dict__['_lazy_module']
+        if module is None:
+            module = importlib.import_module(self._lazy_name)
+            self.__dict__['_lazy_module'] = module
+        return module
+
+    def __getattr__(self, attr):
+        return getattr(self._load(), attr)
+
+    def __dir__(self):
+        return dir(self._load())
+
+    def __repr__(self):
+        state = 'loaded' if self.__dict__['_lazy_module'] is not None else 'not loaded'
+        return f"<lazy module '{self._lazy_name}' ({state})>"
+
+
+def lazy_import(name):
+    """Module stand-in for `name`; the import happens on first use"""
+    if name not in DEFERRED_MODULES:
+        raise ValueError(f"{name} is not registered in DEFERRED_MODULES")
+    with _lazy_modules_lock:
+        module = _lazy_modules.get(name)
+        if module is None:
+            module = _lazy_modules[name] = LazyModule(name)
+        return module
+
+
+def loaded_deferred_modules():
+    """Registered modules that have been imported in this process"""
+    return sorted(name for name in DEFERRED_MODULES if name in sys.modules)
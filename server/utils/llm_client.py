@@ -0,0 +1,129 @@
+"""
+Shared Claude client for request handlers and background jobs.
+One client per process (per API key / base URL), so every call reuses the
+SDK's HTTP connection pool instead of building a new client and TLS session.
+
+`create_message()` is the one place Claude is called from. Before sending it
+ends the session's transaction, so the request does not hold a pooled
+database connection for the seconds the model takes to answer: with
+cooperative workers (GUNICORN_WORKER_CLASS=gevent, see gunicorn.conf.py) a
+process can then keep hundreds of calls in flight on DB_POOL_SIZE
+connections. A transaction that has written anything is left open (see
+`release_db_connection()`). Objects loaded before the call are expired by the
+commit and reload on next access. Measure with `python -m server.llm_concurrency_bench`.
+Each call is also recorded in the usage ledger (services/llm_usage_service.py).
+"""
+import os
+import threading
+import time
+
+from server.utils.lazy_imports import lazy_import
+
+anthropic = lazy_import('anthropic')
+
+_clients = {}  # (api_key, base_url) -> anthropic.Anthropic
+_clients_lock = threading.Lock()
+
+
+def get_anthropic_client():
+    """Process-wide client, or None when no API key is configured"""
+    api_key = os.environ.get('AI_INTEGRATIONS_ANTHROPIC_API_KEY') or os.environ.get('ANTHROPIC_API_KEY')
+    base_url = os.environ.get('AI_INTEGRATIONS_ANTHROPIC_BASE_URL')
+    if not api_key:
+        return None
+    key = (api_key, base_url)
+    with _clients_lock:
+        client = _clients.get(key)
+        if client is None:
+            if base_url:
+                client = anthropic.Anthropic(api_key=api_key, base_url=base_url)
+            else:
+                client = anthropic.Anthropic(api_key=api_key)
+            _clients[key] = client
+        return client
+
+
+_WRITES_KEY = 'has_pending_writes'
+
+
+def _mark_flush(session, flush_context):
+    session.info[_WRITES_KEY] = True
+
+
+def _mark_execute(orm_execute_state):
+    if not orm_execute_state.is_select:
+        orm_execute_state.session.info[_WRITES_KEY] = True
+
+
+def _clear_writes(session):
+    session.info.pop(_WRITES_KEY, None)
+
+
+def setup_write_tracking():
+    """
+    Record in `session.info` when the open transaction has written anything:
+    a flush, or an INSERT/UPDATE/DELETE (or any other non-SELECT statement)
+    run through `session.execute()`. Cleared when the transaction ends.
+    """
+    from sqlalchemy import event
+    from server.models import db
+
+    if event.contains(db.session, 'after_flush', _mark_flush):
+        return
+    event.listen(db.session, 'after_flush', _mark_flush)
+    event.listen(db.session, 'do_orm_execute', _mark_execute)
+    event.listen(db.session, 'after_commit', _clear_writes)
+    event.listen(db.session, 'after_rollback', _clear_writes)
+
+
+def release_db_connection():
+    """
+    Return the session's connection to the pool ahead of a slow network call.
+    The transaction is only ended when it holds no writes: no unflushed
+    changes and, per `setup_write_tracking()`, nothing flushed or executed.
+    Otherwise the connection is kept, so a caller's work is never committed
+    early. Statements run on `session.connection()` directly are not seen.
+    """
+    from server.models import db
+
+    session = db.session()
+    if not session.in_transaction() or session.info.get(_WRITES_KEY):
+        return
+    if not (session.new or session.dirty or session.deleted):
+        session.commit()
+
+
+def create_message(client, endpoint, tab_name=None, analysis_id=None, user_email=None, **kwargs):
+    """
+    `client.messages.create(**kwargs)` without holding a database connection.
+    A caller that has written in the current transaction keeps its connection
+    for the call; commit first to release it.
+    The call (tokens, latency, retries, or the error) is recorded in the usage
+    ledger under `endpoint` and, for tab generation, `tab_name`.
+    """
+    from server.services.llm_usage_service import record_llm_call
+
+    release_db_connection()
+    call = {'endpoint': endpoint, 'tab_name': tab_name, 'analysis_id': analysis_id, 'user_email': user_email}
+    started = time.perf_counter()
+    try:
+        raw = client.messages.with_raw_response.create(**kwargs)
+        response = raw.parse()
+    except Exception as e:
+        record_llm_call(**call, model=kwargs.get('model'), status='error', error=f"{type(e).__name__}: {e}",
+                        latency_ms=round((time.perf_counter() - started) * 1000, 1))
+        raise
+
+    usage = response.usage
+    record_llm_call(
+        **call,
+        model=response.model or kwargs.get('model'),
+        input_tokens=usage.input_tokens,
+        output_tokens=usage.output_tokens,
+        cache_read_tokens=getattr(usage, 'cache_read_input_tokens', None),
+        cache_creation_tokens=getattr(usage, 'cache_creation_input_tokens', None),
+        stop_reason=response.stop_reason,
+        latency_ms=round((time.perf_counter() - started) * 1000, 1),
+        retries=getattr(raw, 'retries_taken', 0),
+    )
+    return response
@@ -0,0 +1,100 @@
+"""
+Local stand-in for the ZeptoMail HTTP API.
+Accepts the same JSON payload, records every message in memory and can be told
+to fail a share of requests so the outbox retry / dead-letter paths can be
+exercised without sending real email.
+
+Usage:
+    python -m server.utils.mail_sink --port 8025 [--fail-rate 0.2] [--fail-status 503]
+    ZEPTOMAIL_API_URL=http://localhost:8025/v1.1/email ZEPTOMAIL_API_KEY=local python wsgi.py
+
+GET  /messages  -> list of received messages
+DELETE /messages -> clear the list
+"""
+import argparse
+import json
+import random
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class MailSink:
+    def __init__(self, fail_rate=0.0, fail_status=503):
+        self.fail_rate = fail_rate
+        self.fail_status = fail_status
+        self.messages = []
+        self.lock = threading.Lock()
+
+    def make_handler(self):
+        sink = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def _send_json(self, status, data):
+                body = json.dumps(data).encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_POST(self):
+                length = int(self.headers.get('Content-Length', 0))
+                raw = self.rfile.read(length)
+
+                if sink.fail_rate and random.random() < sink.fail_rate:
+                    self._send_json(sink.fail_status, {'error': 'simulated failure'})
+                    return
+
+                try:
+                    payload = json.loads(raw or b'{}')
+                except ValueError:
+                    self._send_json(400, {'error': 'invalid json'})
+                    return
+
+                with sink.lock:
+                    sink.messages.append(payload)
+                    count = len(sink.messages)
+                self._send_json(201, {'data': [{'code': 'EM_104', 'message': 'Email request received'}], 'count': count})
+
+            def do_GET(self):
+                with sink.lock:
+                    messages = list(sink.messages)
+                self._send_json(200, messages)
+
+            def do_DELETE(self):
+                with sink.lock:
+                    sink.messages.clear()
+                self._send_json(200, {'cleared': True})
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def serve(self, host='127.0.0.1', port=8025):
+        server = ThreadingHTTPServer((host, port), self.make_handler())
+        print(f"Mail sink listening on http://{host}:{server.server_address[1]}")
+        return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Local ZeptoMail stand-in')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8025)
+    parser.add_argument('--fail-rate', type=float, default=0.0)
+    parser.add_argument('--fail-status', type=int, default=503)
+    args = parser.parse_args()
+
+    server = MailSink(args.fail_rate, args.fail_status).serve(args.host, args.port)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == '__main__':
+    main()
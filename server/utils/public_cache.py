@@ -0,0 +1,86 @@
+"""
+In-process response cache for public read endpoints.
+Serialized JSON bodies are cached per endpoint (and per value of the query
+arguments the endpoint declares it varies on) with a TTL, and cleared by the admin routes that write
+the underlying data. Responses carry an ETag and Cache-Control so browsers and
+CDNs can revalidate with If-None-Match and get a 304.
+"""
+import hashlib
+import threading
+import time
+from functools import wraps
+
+from flask import current_app, request
+
+# Bounds memory when clients send many distinct argument values
+MAX_ENTRIES = 256
+
+_cache = {}
+_cache_lock = threading.Lock()
+
+
+def _default_ttl():
+    return current_app.config.get('PUBLIC_CACHE_TTL_SECONDS', 60)
+
+
+def cached_public(namespace, ttl=None, vary_on_args=()):
+    """
+    Cache a public GET view's JSON response.
+
+    Args:
+        namespace: Cache group name used for invalidation (e.g. 'partners')
+        ttl: Seconds to keep the response; defaults to PUBLIC_CACHE_TTL_SECONDS
+        vary_on_args: Names of the query arguments the view reads; their
+            (lowercased) values become part of the cache key, other arguments
+            are ignored
+
+    A view can opt a response out of caching by setting its own Cache-Control
+    header (e.g. 'no-store' on a fallback response).
+    """
+    def decorator(f):
+        @wraps(f)
+        def wrapper(*args, **kwargs):
+            max_age = ttl if ttl is not None else _default_ttl()
+            key = (namespace, tuple((request.args.get(name) or '').strip().lower() for name in vary_on_args))
+            now = time.monotonic()
+
+            entry = _cache.get(key)
+            if entry is None or entry[0] <= now or max_age <= 0:
+                response = current_app.make_response(f(*args, **kwargs))
+                if response.status_code != 200 or 'Cache-Control' in response.headers:
+                    return response
+
+                body = response.get_data()
+                etag = hashlib.md5(body).hexdigest()
+                entry = (now + max_age, body, etag, response.mimetype)
+                if max_age > 0:
+                    with _cache_lock:
+                        if len(_cache) >= MAX_ENTRIES:
+                            _evict(now)
+                        _cache[key] = entry
+
+            response = current_app.response_class(entry[1], mimetype=entry[3])
+            response.set_etag(entry[2])
+            response.headers['Cache-Control'] = f'public, max-age={max_age}'
+            return response.make_conditional(request)
+        return wrapper
+    return decorator
+
+
+def _evict(now):
+    """Drop expired entries, then the soonest-expiring ones if still full. Caller holds _cache_lock."""
+    for key in [k for k, entry in _cache.items() if entry[0] <= now]:
+        del _cache[key]
+    if len(_cache) >= MAX_ENTRIES:
+        for key in sorted(_cache, key=lambda k: _cache[k][0])[:len(_cache) - MAX_ENTRIES + 1]:
+            del _cache[key]
+
+
+def invalidate_public_cache(*namespaces):
+    """Drop cached responses for the given namespaces (all if none given)"""
+    with _cache_lock:
+        if not namespaces:
+            _cache.clear()
+            return
+        for key in [k for k in _cache if k[0] in namespaces]:
+            _cache.pop(key, None)
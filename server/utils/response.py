@@ -3,6 +3,7 @@ Response wrapper and utilities for consistent API responses.
 """
 from flask import jsonify
 from datetime import datetime
+import json
 
 
 class APIResponse:
@@ -49,3 +50,38 @@ class APIResponse:
             'timestamp': datetime.utcnow().isoformat(),
         }
         return jsonify(response), 200
+
+
+STREAM_CHUNK_SIZE = 64 * 1024
+
+
+def stream_json(data, status_code=200):
+    """
+    Return a JSON response that is encoded incrementally in ~64KB chunks.
+    Used for large report payloads so the encoded body (and its compressed
+    form) never has to be held in memory in full. `data` must already be
+    plain Python data; the generator runs after the request context is gone.
+    """
+    from flask import current_app
+    
+    provider = current_app.json
+    encoder = json.JSONEncoder(
+        ensure_ascii=getattr(provider, 'ensure_ascii', True),
+        sort_keys=getattr(provider, 'sort_keys', False),
+        default=getattr(provider, 'default', None)
+    )
+    
+    def generate():
+        buffer = []
+        size = 0
+        for piece in encoder.iterencode(data):
+            buffer.append(piece)
+            size += len(piece)
+            if size >= STREAM_CHUNK_SIZE:
+                yield ''.join(buffer).encode('utf-8')
+                buffer = []
+                size = 0
+        if buffer:
+            yield ''.join(buffer).encode('utf-8')
+    
+    return current_app.response_class(generate(), status=status_code, mimetype='application/json')
@@ -0,0 +1,162 @@
+"""
+Negotiated gzip/brotli compression for API responses.
+Buffered JSON responses are compressed when they exceed a size threshold;
+streamed responses (see utils.response.stream_json) are compressed chunk by
+chunk so neither the raw nor the compressed body is held in memory in full.
+Levels default to fast settings, which give most of the size reduction for a
+fraction of the CPU of maximum compression.
+
+Benchmark: python -m server.utils.response_compression [payload.json]
+"""
+import zlib
+
+from server.utils.compression import brotli, compress, is_compressible, negotiate_encoding
+
+
+def _gzip_stream(chunks, level):
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def _brotli_stream(chunks, quality):
+    compressor = brotli.Compressor(quality=quality)
+    for chunk in chunks:
+        data = compressor.process(chunk)
+        if data:
+            yield data
+    yield compressor.finish()
+
+
+def compress_stream(chunks, encoding, level):
+    if encoding == 'br':
+        return _brotli_stream(chunks, level)
+    return _gzip_stream(chunks, level)
+
+
+def _close_after(iterable, original):
+    try:
+        yield from iterable
+    finally:
+        if hasattr(original, 'close'):
+            original.close()
+
+
+def setup_response_compression(app):
+    """
+    Register the compression after_request hook. Register this before other
+    after_request hooks that read the response body (Flask runs them in
+    reverse order), so they still see uncompressed JSON.
+    """
+    @app.after_request
+    def compress_response(response):
+        config = app.config
+        if not config.get('API_COMPRESSION_ENABLED', True):
+            return response
+
+        from flask import request
+
+        if (
+            not request.path.startswith('/api/')
+            or response.status_code < 200
+            or response.status_code in (204, 206, 304)
+            or response.direct_passthrough
+            or 'Content-Encoding' in response.headers
+            or not is_compressible(response.mimetype)
+        ):
+            return response
+
+        encoding = negotiate_encoding(request.headers.get('Accept-Encoding'))
+        if not encoding:
+            return response
+
+        level = config.get('API_COMPRESSION_BROTLI_QUALITY', 4) if encoding == 'br' else config.get('API_COMPRESSION_GZIP_LEVEL', 5)
+
+        if response.is_streamed:
+            original = response.response
+            response.response = _close_after(compress_stream(original, encoding, level), original)
+            response.headers.pop('Content-Length', None)
+        else:
+            data = response.get_data()
+            if len(data) < config.get('API_COMPRESSION_MIN_BYTES', 1024):
+                return response
+            response.set_data(compress(data, encoding, level))
+
+        response.headers['Content-Encoding'] = encoding
+        response.vary.add('Accept-Encoding')
+
+        # The compressed bytes are a different representation; a strong ETag no longer applies
+        etag, weak = response.get_etag()
+        if etag and not weak:
+            response.set_etag(etag, weak=True)
+
+        return response
+
+    return app
+
+
+def run_benchmark(payload, iterations=20):
+    """Print bytes on the wire and CPU time per response for each encoding/level"""
+    import gzip as gzip_module
+    import json
+    import time
+
+    data = json.dumps(payload).encode('utf-8')
+    print(f"Raw JSON: {len(data):,} bytes")
+    print(f"{'encoding':<12}{'level':>6}{'bytes':>12}{'ratio':>8}{'ms/resp':>10}")
+
+    cases = [('gzip', level) for level in (1, 5, 6, 9)]
+    if brotli:
+        cases += [('br', quality) for quality in (1, 4, 5, 11)]
+
+    for encoding, level in cases:
+        start = time.process_time()
+        for _ in range(iterations):
+            out = compress(data, encoding, level)
+        elapsed_ms = (time.process_time() - start) * 1000 / iterations
+        print(f"{encoding:<12}{level:>6}{len(out):>12,}{len(data) / len(out):>8.1f}{elapsed_ms:>10.2f}")
+
+    chunks = [data[i:i + 65536] for i in range(0, len(data), 65536)]
+    start = time.process_time()
+    for _ in range(iterations):
+        out = b''.join(_gzip_stream(chunks, 5))
+    elapsed_ms = (time.process_time() - start) * 1000 / iterations
+    assert gzip_module.decompress(out) == data
+    print(f"{'gzip-stream':<12}{5:>6}{len(out):>12,}{len(data) / len(out):>8.1f}{elapsed_ms:>10.2f}")
+
+
+def _sample_payload():
+    """Synthetic report-shaped payload (~300KB) for benchmarking without a database"""
+    import random
+
+    random.seed(1)
+    words = ('market', 'customer', 'revenue', 'growth', 'risk', 'strategy', 'competitor',
+             'pricing', 'segment', 'channel', 'السوق', 'العملاء', 'الإيرادات', 'النمو')
+
+    def paragraph(n):
+        return ' '.join(random.choice(words) for _ in range(n))
+
+    tab = {
+        'summary': paragraph(200),
+        'sections': [
+            {'title': paragraph(5), 'body': paragraph(150), 'score': random.randint(1, 100),
+             'items': [{'name': paragraph(3), 'value': random.random()} for _ in range(20)]}
+            for _ in range(12)
+        ]
+    }
+    return {f'tab_{name}': tab for name in ('overview', 'market', 'business', 'technical', 'financial', 'strategy')}
+
+
+if __name__ == '__main__':
+    import json
+    import sys
+
+    if len(sys.argv) > 1:
+        with open(sys.argv[1]) as f:
+            sample = json.load(f)
+    else:
+        sample = _sample_payload()
+    run_benchmark(sample)
@@ -0,0 +1,265 @@
+"""
+Static file serving for the Vite build (dist/).
+A manifest of every file is built once at startup: mimetype, ETag, whether the
+name is content-hashed, and the file body plus any precompressed .gz/.br
+siblings. Requests are answered from the manifest by a WSGI middleware in front
+of Flask, so asset hits do no filesystem lookups and skip the request hooks.
+Content-hashed files are served with a one-year `immutable` Cache-Control;
+everything else (index.html) must revalidate.
+
+Precompress after `npm run build` for the best ratios:
+    python -m server.utils.static_assets dist
+Missing variants are otherwise compressed on first request and kept in memory.
+"""
+import hashlib
+import mimetypes
+import os
+import re
+import sys
+import threading
+
+from server.utils.compression import SUPPORTED_ENCODINGS, compress, is_compressible, negotiate_encoding
+
+# Vite names emitted assets `<name>-<8 char hash>.<ext>`
+HASHED_NAME_PATTERN = re.compile(r'-[A-Za-z0-9_-]{8}\.[A-Za-z0-9]+$')
+
+IMMUTABLE_CACHE_CONTROL = 'public, max-age=31536000, immutable'
+REVALIDATE_CACHE_CONTROL = 'no-cache'
+
+# Files larger than this are streamed from disk instead of held in memory
+MAX_IN_MEMORY_BYTES = 8 * 1024 * 1024
+# Files smaller than this are not worth compressing
+MIN_COMPRESS_BYTES = 1024
+
+ENCODING_SUFFIXES = {'gzip': '.gz', 'br': '.br'}
+# Appended to the ETag of an encoded body; strong validators differ per content-coding
+ETAG_SUFFIXES = {'gzip': '-gz', 'br': '-br'}
+
+_manifests = {}
+_manifests_lock = threading.Lock()
+
+
+class StaticAsset:
+    __slots__ = ('url_path', 'file_path', 'mimetype', 'size', 'etag', 'cache_control',
+                 'compressible', 'body', 'variants', '_lock')
+
+    def __init__(self, url_path, file_path, mimetype, size, etag, immutable, compressible, body):
+        self.url_path = url_path
+        self.file_path = file_path
+        self.mimetype = mimetype
+        self.size = size
+        self.etag = etag
+        self.cache_control = IMMUTABLE_CACHE_CONTROL if immutable else REVALIDATE_CACHE_CONTROL
+        self.compressible = compressible
+        self.body = body
+        self.variants = {}
+        self._lock = threading.Lock()
+
+    def read(self):
+        if self.body is not None:
+            return self.body
+        with open(self.file_path, 'rb') as f:
+            return f.read()
+
+    def variant(self, encoding):
+        """Compressed body for an encoding, compressing on first use"""
+        data = self.variants.get(encoding)
+        if data is None:
+            with self._lock:
+                data = self.variants.get(encoding)
+                if data is None:
+                    # Fast settings at request time; the CLI writes max-quality files
+                    data = compress(self.read(), encoding, level=6 if encoding == 'gzip' else 5)
+                    self.variants[encoding] = data
+        return data
+
+
+class StaticManifest:
+    def __init__(self, dist_folder):
+        self.dist_folder = dist_folder
+        self.assets = {}
+        self.index = None
+        self._build()
+
+    def _build(self):
+        if not os.path.isdir(self.dist_folder):
+            return
+
+        for root, _, files in os.walk(self.dist_folder):
+            names = set(files)
+            for name in files:
+                if name.endswith(('.gz', '.br')) and name[:-3] in names:
+                    continue
+
+                file_path = os.path.join(root, name)
+                rel_path = os.path.relpath(file_path, self.dist_folder).replace(os.sep, '/')
+                size = os.path.getsize(file_path)
+                mimetype = mimetypes.guess_type(name)[0] or 'application/octet-stream'
+
+                with open(file_path, 'rb') as f:
+                    data = f.read()
+                etag = hashlib.md5(data).hexdigest()
+
+                asset = StaticAsset(
+                    url_path='/' + rel_path,
+                    file_path=file_path,
+                    mimetype=mimetype,
+                    size=size,
+                    etag=etag,
+                    immutable=rel_path.startswith('assets/') and bool(HASHED_NAME_PATTERN.search(name)),
+                    compressible=is_compressible(mimetype) and size >= MIN_COMPRESS_BYTES,
+                    body=data if size <= MAX_IN_MEMORY_BYTES else None
+                )
+
+                if asset.compressible:
+                    for encoding in SUPPORTED_ENCODINGS:
+                        sibling = name + ENCODING_SUFFIXES[encoding]
+                        if sibling in names:
+                            with open(os.path.join(root, sibling), 'rb') as f:
+                                asset.variants[encoding] = f.read()
+
+                self.assets[asset.url_path] = asset
+
+        self.index = self.assets.get('/index.html')
+        if self.index is not None:
+            self.assets['/'] = self.index
+
+    def get(self, url_path):
+        return self.assets.get(url_path)
+
+    def respond(self, asset, method='GET', accept_encoding=None, if_none_match=None):
+        """
+        Build a response for an asset.
+
+        Returns:
+            tuple: (status, headers list, body bytes)
+        """
+        body = None
+        encoding = negotiate_encoding(accept_encoding) if asset.compressible else None
+        if encoding:
+            body = asset.variant(encoding)
+            if len(body) >= asset.size:
+                body, encoding = None, None
+
+        headers = [
+            ('Cache-Control', asset.cache_control),
+            ('ETag', f'"{asset.etag}{ETAG_SUFFIXES.get(encoding, "")}"'),
+        ]
+        if asset.compressible:
+            headers.append(('Vary', 'Accept-Encoding'))
+
+        # Any encoding's tag names the same content, so each one revalidates
+        if if_none_match and _etag_matches(if_none_match, _asset_etags(asset)):
+            return '304 Not Modified', headers, b''
+
+        if encoding:
+            headers.append(('Content-Encoding', encoding))
+        else:
+            body = asset.read()
+
+        headers.append(('Content-Type', _content_type(asset.mimetype)))
+        headers.append(('Content-Length', str(len(body))))
+        return '200 OK', headers, (b'' if method == 'HEAD' else body)
+
+    def flask_response(self, asset, request):
+        from flask import Response
+
+        status, headers, body = self.respond(
+            asset,
+            request.method,
+            request.headers.get('Accept-Encoding'),
+            request.headers.get('If-None-Match')
+        )
+        response = Response(body, status=int(status.split(' ', 1)[0]))
+        for key, value in headers:
+            response.headers[key] = value
+        return response
+
+
+def _content_type(mimetype):
+    if mimetype.startswith('text/') or mimetype in ('application/javascript', 'application/json'):
+        return f'{mimetype}; charset=utf-8'
+    return mimetype
+
+
+def _asset_etags(asset):
+    """ETags (unquoted) of every representation of an asset"""
+    return {asset.etag} | {asset.etag + suffix for suffix in ETAG_SUFFIXES.values()}
+
+
+def _etag_matches(header, etags):
+    for candidate in header.split(','):
+        candidate = candidate.strip()
+        if candidate == '*':
+            return True
+        if candidate.startswith('W/'):
+            candidate = candidate[2:]
+        if candidate.strip('"') in etags:
+            return True
+    return False
+
+
+def get_static_manifest(dist_folder):
+    """Build the manifest for a folder once per process"""
+    manifest = _manifests.get(dist_folder)
+    if manifest is None:
+        with _manifests_lock:
+            manifest = _manifests.get(dist_folder)
+            if manifest is None:
+                manifest = StaticManifest(dist_folder)
+                _manifests[dist_folder] = manifest
+    return manifest
+
+
+class StaticAssetMiddleware:
+    """Serve manifest files before the request reaches Flask"""
+
+    def __init__(self, wsgi_app, manifest):
+        self.wsgi_app = wsgi_app
+        self.manifest = manifest
+
+    def __call__(self, environ, start_response):
+        if environ.get('REQUEST_METHOD') in ('GET', 'HEAD'):
+            asset = self.manifest.get(environ.get('PATH_INFO', ''))
+            if asset is not None:
+                status, headers, body = self.manifest.respond(
+                    asset,
+                    environ['REQUEST_METHOD'],
+                    environ.get('HTTP_ACCEPT_ENCODING'),
+                    environ.get('HTTP_IF_NONE_MATCH')
+                )
+                start_response(status, headers)
+                return [body]
+        return self.wsgi_app(environ, start_response)
+
+
+def precompress(dist_folder):
+    """Write max-quality .gz (and .br when available) siblings for compressible files"""
+    written = 0
+    for root, _, files in os.walk(dist_folder):
+        for name in files:
+            if name.endswith(('.gz', '.br')):
+                continue
+            file_path = os.path.join(root, name)
+            mimetype = mimetypes.guess_type(name)[0]
+            if not is_compressible(mimetype) or os.path.getsize(file_path) < MIN_COMPRESS_BYTES:
+                continue
+            with open(file_path, 'rb') as f:
+                data = f.read()
+            for encoding in SUPPORTED_ENCODINGS:
+                compressed = compress(data, encoding)
+                if len(compressed) >= len(data):
+                    continue
+                with open(file_path + ENCODING_SUFFIXES[encoding], 'wb') as f:
+                    f.write(compressed)
+                written += 1
+                print(f"{file_path}{ENCODING_SUFFIXES[encoding]}: {len(data)} -> {len(compressed)} bytes")
+    return written
+
+
+if __name__ == '__main__':
+    folder = sys.argv[1] if len(sys.argv) > 1 else os.path.join(
+        os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), 'dist'
+    )
+    count = precompress(folder)
+    print(f"Wrote {count} precompressed file(s) in {folder}")
@@ -0,0 +1,320 @@
+"""
+Schema-checked JSON output from Claude.
+Report prompts describe their JSON by example ("Respond in JSON format: {...}").
+`schema_from_prompt()` turns that example into a JSON schema, and
+`create_structured()` asks for the output through a forced tool call with that
+schema as the tool's input, so the model returns an object instead of prose
+around a fenced block.
+
+When a response still has problems, only the bad parts are fixed:
+- Text answers are read with `parse_partial_json()`. It tolerates fences and
+  prose, trailing commas, missing commas and raw newlines in strings, and it
+  closes output that was cut off at max_tokens.
+- Top-level fields that are missing, have the wrong type or were cut off are
+  requested again, on their own, with a schema containing just those fields.
+  Before this, one bad field meant regenerating the whole tab. Repair calls are
+  recorded in the usage ledger as '<endpoint>-repair'.
+"""
+import re
+
+from flask import current_app
+
+from server.utils.llm_client import create_message
+
+_NUMBER = re.compile(r'-?(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?')
+_STRING_RUN = {'"': re.compile(r'[^"\\]+'), "'": re.compile(r"[^'\\]+")}
+_LITERALS = {'true': True, 'false': False, 'null': None, 'True': True, 'False': False, 'None': None}
+
+
+# --- Schemas -----------------------------------------------------------------
+
+def schema_from_example(example):
+    """JSON schema for values shaped like `example`; every example key is required"""
+    if isinstance(example, dict):
+        return {
+            'type': 'object',
+            'properties': {key: schema_from_example(value) for key, value in example.items()},
+            'required': list(example),
+        }
+    if isinstance(example, list):
+        schema = {'type': 'array'}
+        if example:
+            schema['items'] = schema_from_example(example[0])
+        return schema
+    if isinstance(example, bool):
+        return {'type': 'boolean'}
+    if isinstance(example, (int, float)):
+        return {'type': 'number'}
+    if isinstance(example, str) and example.endswith('or null'):
+        return {'type': ['string', 'null']}
+    return {'type': 'string'}
+
+
+def schema_from_prompt(prompt):
+    """
+    Schema of the JSON example that follows the last "JSON format" in a prompt.
+    Raises ValueError when the prompt has no parseable example.
+    """
+    start = prompt.find('{', max(prompt.rfind('JSON format'), 0))
+    if start < 0:
+        raise ValueError('Prompt has no JSON example')
+    example, truncated = parse_partial_json(prompt[start:])
+    if not isinstance(example, dict) or truncated:
+        raise ValueError('Prompt JSON example is not a complete object')
+    return schema_from_example(example)
+
+
+def subset_schema(schema, keys):
+    """Object schema with only the given top-level properties"""
+    return {
+        'type': 'object',
+        'properties': {key: schema['properties'][key] for key in keys},
+        'required': list(keys),
+    }
+
+
+def _matches(value, schema):
+    """Type check only; nested fields may be missing or null"""
+    if value is None:
+        return True
+    types = schema.get('type')
+    types = types if isinstance(types, list) else [types]
+    if isinstance(value, dict):
+        return 'object' in types and all(
+            _matches(value[key], sub) for key, sub in schema.get('properties', {}).items() if key in value
+        )
+    if isinstance(value, list):
+        return 'array' in types and all(_matches(item, schema.get('items', {})) for item in value)
+    if isinstance(value, bool):
+        return 'boolean' in types
+    if isinstance(value, (int, float)):
+        return 'number' in types
+    return 'string' in types
+
+
+def invalid_fields(data, schema, truncated=()):
+    """Top-level fields of `data` that are missing, null, of the wrong shape or were cut off"""
+    if not isinstance(data, dict):
+        return list(schema['properties'])
+    return [
+        key for key, sub in schema['properties'].items()
+        if data.get(key) is None or key in truncated or not _matches(data[key], sub)
+    ]
+
+
+# --- Tolerant parsing --------------------------------------------------------
+
+class _PartialParser:
+    def __init__(self, text, pos=0):
+        self.text = text
+        self.pos = pos
+        self.eof = False  # set once input ran out inside a value
+        self.truncated_key = None
+
+    def ws(self):
+        text, pos = self.text, self.pos
+        while pos < len(text) and text[pos] in ' \t\r\n':
+            pos += 1
+        self.pos = pos
+        return text[pos] if pos < len(text) else ''
+
+    def value(self):
+        char = self.ws()
+        if not char:
+            self.eof = True
+            return None
+        if char == '{':
+            return self.container('}')
+        if char == '[':
+            return self.container(']')
+        if char in '"\'':
+            return self.string(char)
+        match = _NUMBER.match(self.text, self.pos)
+        if match:
+            self.pos = match.end()
+            literal = match.group()
+            if self.pos == len(self.text):
+                self.eof = True  # a number cut off at the end may be missing digits
+            return float(literal) if any(c in literal for c in '.eE') else int(literal)
+        for literal, parsed in _LITERALS.items():
+            if self.text.startswith(literal, self.pos):
+                self.pos += len(literal)
+                return parsed
+            if literal.startswith(self.text[self.pos:self.pos + len(literal)]) and \
+                    self.pos + len(literal) > len(self.text):
+                self.pos = len(self.text)
+                self.eof = True
+                return None
+        raise ValueError(f'Unexpected {char!r} at {self.pos}')
+
+    def string(self, quote):
+        text = self.text
+        run = _STRING_RUN[quote]
+        pos = self.pos + 1
+        chunks = []
+        while pos < len(text):
+            match = run.match(text, pos)
+            if match:
+                chunks.append(match.group())
+                pos = match.end()
+                continue
+            char = text[pos]
+            if char == quote:
+                self.pos = pos + 1
+                return ''.join(chunks)
+            if char == '\\' and pos + 1 < len(text):
+                escaped = text[pos + 1]
+                if escaped == 'u' and pos + 6 <= len(text):
+                    try:
+                        chunks.append(chr(int(text[pos + 2:pos + 6], 16)))
+                        pos += 6
+                        continue
+                    except ValueError:
+                        pass
+                chunks.append({'n': '\n', 't': '\t', 'r': '\r', 'b': '\b', 'f': '\f'}.get(escaped, escaped))
+                pos += 2
+                continue
+            pos += 1  # lone backslash at the very end
+        self.pos = len(text)
+        self.eof = True
+        return ''.join(chunks)
+
+    def container(self, close):
+        is_object = close == '}'
+        result = {} if is_object else []
+        self.pos += 1
+        while True:
+            char = self.ws()
+            if not char:
+                self.eof = True
+                return result
+            if char == close:
+                self.pos += 1
+                return result
+            if char == ',':
+                self.pos += 1
+                continue
+            if char in '}]':
+                # Mismatched bracket: end this container and leave the char to the parent
+                return result
+            if not is_object:
+                result.append(self.value())
+                if self.eof:
+                    return result
+                continue
+
+            if char not in '"\'':
+                raise ValueError(f'Expected a key at {self.pos}')
+            key = self.string(char)
+            if self.eof or self.ws() != ':':
+                self.eof = self.eof or self.pos >= len(self.text)
+                if self.eof:
+                    return result  # key without a value
+                raise ValueError(f'Expected ":" at {self.pos}')
+            self.pos += 1
+            value = self.value()
+            if self.eof:
+                if value is not None:
+                    result[key] = value
+                self.truncated_key = key  # outermost container sets it last
+                return result
+            result[key] = value
+
+
+def parse_partial_json(text):
+    """
+    Parse the first JSON object (or array, if there is none) in `text`,
+    repairing common defects and closing whatever was left open if the text
+    ends early.
+
+    Returns:
+        tuple: (value, truncated) where `truncated` is the set of top-level
+        keys whose value was cut off (or {None} when the cut-off was in an array
+        or between keys). value is None when the text holds no JSON.
+    """
+    start = text.find('{')
+    if start < 0:
+        start = text.find('[')
+    if start < 0:
+        return None, set()
+    parser = _PartialParser(text, start)
+    try:
+        value = parser.value()
+    except ValueError:
+        return None, set()
+    truncated = set()
+    if parser.eof:
+        truncated.add(parser.truncated_key if isinstance(value, dict) else None)
+    return value, truncated
+
+
+# --- Requests ----------------------------------------------------------------
+
+def _tool_input(response, tool_name):
+    for block in response.content:
+        if getattr(block, 'type', None) == 'tool_use' and block.name == tool_name:
+            return block.input
+    return None
+
+
+def _response_text(response):
+    return ''.join(getattr(block, 'text', '') for block in response.content)
+
+
+def _request(client, endpoint, prompt, schema, tool_name, use_tools, ledger, **kwargs):
+    """One call; returns (data, truncated top-level keys, response)"""
+    if use_tools:
+        kwargs['tools'] = [{
+            'name': tool_name,
+            'description': 'Save the requested JSON fields',
+            'input_schema': schema,
+        }]
+        kwargs['tool_choice'] = {'type': 'tool', 'name': tool_name}
+    response = create_message(client, endpoint, messages=[{'role': 'user', 'content': prompt}], **ledger, **kwargs)
+
+    data = _tool_input(response, tool_name)
+    if data is not None:
+        truncated = {None} if response.stop_reason == 'max_tokens' else set()
+        return data, truncated, response
+    data, truncated = parse_partial_json(_response_text(response))
+    return data, truncated, response
+
+
+def create_structured(client, endpoint, prompt, schema, tool_name, tab_name=None, analysis_id=None,
+                      user_email=None, **kwargs):
+    """
+    Ask for a JSON object matching `schema` and repair invalid top-level fields
+    with follow-up calls for just those fields.
+
+    Returns:
+        tuple: (data, response, usage) where data is the best object obtained
+        ({"raw_response": text} when no JSON could be read at all), response is
+        the first response and usage sums input/output tokens over all calls.
+    """
+    use_tools = current_app.config.get('LLM_STRUCTURED_OUTPUT_ENABLED', True)
+    retries = current_app.config.get('LLM_FRAGMENT_RETRIES', 1)
+    ledger = {'tab_name': tab_name, 'analysis_id': analysis_id, 'user_email': user_email}
+
+    data, truncated, response = _request(client, endpoint, prompt, schema, tool_name, use_tools, ledger, **kwargs)
+    usage = {'input_tokens': response.usage.input_tokens, 'output_tokens': response.usage.output_tokens}
+    if not isinstance(data, dict):
+        return {'raw_response': _response_text(response)}, response, usage
+
+    for _ in range(retries):
+        missing = invalid_fields(data, schema, truncated)
+        if not missing:
+            break
+        fragment_prompt = (
+            f"{prompt}\n\nOnly these fields are needed now: {', '.join(missing)}. "
+            f"Return an object with exactly these fields and nothing else."
+        )
+        fragment, truncated, repair = _request(
+            client, f'{endpoint}-repair', fragment_prompt, subset_schema(schema, missing), tool_name, use_tools,
+            ledger, **kwargs
+        )
+        usage['input_tokens'] += repair.usage.input_tokens
+        usage['output_tokens'] += repair.usage.output_tokens
+        if isinstance(fragment, dict):
+            data.update({key: fragment[key] for key in missing if fragment.get(key) is not None})
+
+    return data, response, usage
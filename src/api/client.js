@@ -325,7 +325,16 @@ export const ActivityFeed = {
 };
 
 export const Notification = {
-  list: () => api.get("/notifications"),
+  list: (params = {}) => {
+    const queryParams = new URLSearchParams();
+    if (params.page) queryParams.set("page", params.page);
+    if (params.per_page) queryParams.set("per_page", params.per_page);
+    if (params.limit) queryParams.set("limit", params.limit);
+    if (params.unread_only) queryParams.set("unread_only", "true");
+    const queryString = queryParams.toString();
+    return api.get(`/notifications${queryString ? "?" + queryString : ""}`);
+  },
+  unreadCount: () => api.get("/notifications/unread-count"),
   create: (data) => api.post("/notifications", data),
   markRead: (id) => api.post(`/notifications/${id}/read`),
   markAllRead: () => api.post("/notifications/mark-all-read"),
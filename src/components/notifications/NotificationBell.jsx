@@ -34,29 +34,42 @@ const notificationColors = {
 
 export default function NotificationBell({ userEmail, isArabic = false }) {
   const [notifications, setNotifications] = useState([]);
+  const [unreadCount, setUnreadCount] = useState(0);
   const [isOpen, setIsOpen] = useState(false);
   const [isLoading, setIsLoading] = useState(false);
 
   useEffect(() => {
     if (userEmail) {
-      loadNotifications();
-      const interval = setInterval(loadNotifications, 30000);
+      loadUnreadCount();
+      const interval = setInterval(loadUnreadCount, 30000);
       return () => clearInterval(interval);
     }
   }, [userEmail]);
 
+  useEffect(() => {
+    if (userEmail && isOpen) {
+      loadNotifications();
+    }
+  }, [userEmail, isOpen]);
+
+  const loadUnreadCount = async () => {
+    try {
+      const data = await Notification.unreadCount();
+      setUnreadCount(data?.unread_count || 0);
+    } catch (error) {
+      console.error("Error loading unread count:", error);
+    }
+  };
+
   const loadNotifications = async () => {
     try {
-      const data = await Notification.filter({ user_email: userEmail });
-      const sorted = Array.isArray(data) ? data.sort((a, b) => new Date(b.created_at) - new Date(a.created_at)).slice(0, 20) : [];
-      setNotifications(sorted);
+      const data = await Notification.list({ limit: 20 });
+      setNotifications(Array.isArray(data) ? data : []);
     } catch (error) {
       console.error("Error loading notifications:", error);
     }
   };
 
-  const unreadCount = notifications.filter(n => !n.is_read).length;
-
   const markAsRead = async (notification) => {
     if (notification.is_read) return;
     try {
@@ -64,6 +77,7 @@ export default function NotificationBell({ userEmail, isArabic = false }) {
       setNotifications(prev => 
         prev.map(n => n.id === notification.id ? { ...n, is_read: true } : n)
       );
+      setUnreadCount(prev => Math.max(prev - 1, 0));
     } catch (error) {
       console.error("Error marking notification as read:", error);
     }
@@ -74,6 +88,7 @@ export default function NotificationBell({ userEmail, isArabic = false }) {
     try {
       await Notification.markAllRead();
       setNotifications(prev => prev.map(n => ({ ...n, is_read: true })));
+      setUnreadCount(0);
     } catch (error) {
       console.error("Error marking all as read:", error);
     } finally {
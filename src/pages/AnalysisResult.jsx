@@ -329,23 +329,23 @@ export default function AnalysisResult() {
     return data;
   };
 
-  const pollingIntervalsRef = useRef({});
+  // Tabs waiting on generation, and the single long-poll loop watching them
+  const watchedTabsRef = useRef(new Set());
+  const tabEventsLoopRef = useRef(null);
 
   const checkTabStatus = useCallback(
     async (tabName) => {
       if (!analysis) return;
 
       try {
-        const response = await api.post("/ai/check-tab-status", {
+        // GET so the browser revalidates with If-None-Match and reuses completed tabs on 304
+        const params = new URLSearchParams({
           analysis_id: analysis.id,
           tab_name: tabName,
         });
+        const response = await api.get(`/ai/check-tab-status?${params}`);
 
         if (response?.status === "completed" && response?.data) {
-          if (pollingIntervalsRef.current[tabName]) {
-            clearInterval(pollingIntervalsRef.current[tabName]);
-            delete pollingIntervalsRef.current[tabName];
-          }
           setTabData((prev) => ({
             ...prev,
             [tabName]: parseTabData(response.data),
@@ -357,10 +357,6 @@ export default function AnalysisResult() {
         }
 
         if (response?.status === "stuck") {
-          if (pollingIntervalsRef.current[tabName]) {
-            clearInterval(pollingIntervalsRef.current[tabName]);
-            delete pollingIntervalsRef.current[tabName];
-          }
           setTabProcessingStatus((prev) => ({
             ...prev,
             [tabName]: {
@@ -397,25 +393,59 @@ export default function AnalysisResult() {
 
   const startPolling = useCallback(
     (tabName) => {
-      if (pollingIntervalsRef.current[tabName]) {
-        clearInterval(pollingIntervalsRef.current[tabName]);
-      }
+      watchedTabsRef.current.add(tabName);
+      if (tabEventsLoopRef.current || !analysis) return;
+
+      const loop = { cancelled: false };
+      tabEventsLoopRef.current = loop;
+
+      (async () => {
+        let cursor = "";
+        while (!loop.cancelled && watchedTabsRef.current.size > 0) {
+          try {
+            // Returns immediately on a state change, otherwise waits server-side
+            const params = new URLSearchParams({ analysis_id: analysis.id });
+            if (cursor) params.set("cursor", cursor);
+            const response = await api.get(`/ai/tab-events?${params}`);
+            if (loop.cancelled) break;
+            cursor = response.cursor;
+
+            for (const name of [...watchedTabsRef.current]) {
+              const state = response.tabs?.[name];
+              if (!state || state.status === "processing") continue;
+
+              if (state.status === "failed" || state.status === "pending") {
+                watchedTabsRef.current.delete(name);
+                setTabProcessingStatus((prev) => ({ ...prev, [name]: null }));
+                setTabError((prev) => ({ ...prev, [name]: true }));
+                setTabLoading((prev) => ({ ...prev, [name]: false }));
+                continue;
+              }
 
-      pollingIntervalsRef.current[tabName] = setInterval(async () => {
-        const isResolved = await checkTabStatus(tabName);
-        if (isResolved) {
-          clearInterval(pollingIntervalsRef.current[tabName]);
-          delete pollingIntervalsRef.current[tabName];
+              if (await checkTabStatus(name)) {
+                watchedTabsRef.current.delete(name);
+              }
+            }
+          } catch (error) {
+            console.error("Error waiting for tab events:", error);
+            await new Promise((resolve) => setTimeout(resolve, 5000));
+          }
         }
-      }, 5000);
+        if (tabEventsLoopRef.current === loop) {
+          tabEventsLoopRef.current = null;
+        }
+      })();
     },
-    [checkTabStatus]
+    [analysis, checkTabStatus]
   );
 
   useEffect(() => {
     return () => {
-      Object.values(pollingIntervalsRef.current).forEach(clearInterval);
-      pollingIntervalsRef.current = {};
+      if (tabEventsLoopRef.current) {
+        tabEventsLoopRef.current.cancelled = true;
+        tabEventsLoopRef.current = null;
+      }
+      watchedTabsRef.current.clear();
     };
   }, []);
 
@@ -2,6 +2,15 @@ import React, { useState, useEffect } from "react";
 import { auth, api, SystemSettings } from "@/api/client";
 import { Button } from "@/components/ui/button";
 import { Card, CardContent, CardHeader, CardTitle } from "@/components/ui/card";
+import {
+  AlertDialog,
+  AlertDialogCancel,
+  AlertDialogContent,
+  AlertDialogDescription,
+  AlertDialogFooter,
+  AlertDialogHeader,
+  AlertDialogTitle,
+} from "@/components/ui/alert-dialog";
 import { useNavigate } from "react-router-dom";
 import { createPageUrl } from "@/utils";
 import {
@@ -29,6 +38,9 @@ export default function NewAnalysis() {
   const [isSubmitting, setIsSubmitting] = useState(false);
   const [authChecked, setAuthChecked] = useState(false);
   const [premiumReportCost, setPremiumReportCost] = useState(1);
+  // Near-duplicates of the submitted idea, offered before the analysis is paid for
+  const [duplicates, setDuplicates] = useState([]);
+  const [pendingForm, setPendingForm] = useState(null);
   const { t, i18n } = useTranslation();
   const isUIArabic =
     i18n.language === "ar" || currentUser?.preferred_language === "arabic";
@@ -65,6 +77,46 @@ export default function NewAnalysis() {
   const handleFormSubmit = async (formDataFromWizard) => {
     setIsSubmitting(true);
 
+    try {
+      const resp = await api.post("/analyses/duplicates", {
+        business_idea: formDataFromWizard.business_idea,
+        industry: formDataFromWizard.industry || "Other",
+        country: formDataFromWizard.country || "",
+        report_language: formDataFromWizard.report_language,
+      });
+      const matches = resp?.duplicates || [];
+      if (matches.length > 0) {
+        setDuplicates(matches);
+        setPendingForm(formDataFromWizard);
+        setIsSubmitting(false);
+        return;
+      }
+    } catch (error) {
+      // The check only saves work; never block creating the analysis on it
+      console.error("Duplicate idea check failed:", error);
+    }
+
+    await createAnalysis(formDataFromWizard);
+  };
+
+  const closeDuplicates = () => {
+    setDuplicates([]);
+    setPendingForm(null);
+  };
+
+  const openExisting = (analysisId) => {
+    closeDuplicates();
+    navigate(createPageUrl(`AnalysisResult?id=${analysisId}`));
+  };
+
+  const createFromDuplicates = async (reuseFromId = null) => {
+    const formDataFromWizard = pendingForm;
+    closeDuplicates();
+    setIsSubmitting(true);
+    await createAnalysis(formDataFromWizard, reuseFromId);
+  };
+
+  const createAnalysis = async (formDataFromWizard, reuseFromId = null) => {
     try {
       const resp = await api.post("/analyses/generate", formDataFromWizard);
       const createdAnalysis = resp?.data || resp;
@@ -73,6 +125,17 @@ export default function NewAnalysis() {
         throw new Error("Failed to create analysis.");
       }
 
+      if (reuseFromId) {
+        try {
+          await api.post(`/analyses/${createdAnalysis.id}/clone-tabs`, {
+            source_id: reuseFromId,
+          });
+        } catch (error) {
+          // Tabs that were not copied are generated as usual
+          console.error("Copying tabs failed:", error);
+        }
+      }
+
       await refreshUser();
       emitCreditUpdate();
 
@@ -283,6 +346,74 @@ export default function NewAnalysis() {
           </div>
         </div>
       </div>
+
+      <AlertDialog
+        open={duplicates.length > 0}
+        onOpenChange={(open) => !open && closeDuplicates()}
+      >
+        <AlertDialogContent dir={isUIArabic ? "rtl" : "ltr"}>
+          <AlertDialogHeader>
+            <AlertDialogTitle className={isUIArabic ? "text-right" : ""}>
+              {isUIArabic
+                ? "لديك تحليل لفكرة مشابهة"
+                : "You already analyzed a similar idea"}
+            </AlertDialogTitle>
+            <AlertDialogDescription className={isUIArabic ? "text-right" : ""}>
+              {isUIArabic
+                ? "يمكنك فتح التقرير الموجود دون استخدام رصيد، أو إنشاء تحليل جديد ونسخ الأقسام الجاهزة منه بدلاً من إنشائها من جديد."
+                : "Open the existing report without using credits, or create a new analysis that copies its finished sections instead of generating them again."}
+            </AlertDialogDescription>
+          </AlertDialogHeader>
+          <div className="space-y-3">
+            {duplicates.map((duplicate) => (
+              <div
+                key={duplicate.id}
+                className="p-3 rounded-xl border border-slate-200 dark:border-gray-600"
+              >
+                <p className="text-sm text-slate-800 dark:text-white line-clamp-2">
+                  {duplicate.business_idea}
+                </p>
+                <p className="text-xs text-slate-500 dark:text-slate-400 mt-1">
+                  {Math.round(duplicate.similarity * 100)}%{" "}
+                  {isUIArabic ? "تشابه" : "similar"} ·{" "}
+                  {duplicate.completed_tabs.length}{" "}
+                  {isUIArabic ? "أقسام جاهزة" : "sections ready"}
+                  {duplicate.created_at &&
+                    ` · ${new Date(duplicate.created_at).toLocaleDateString()}`}
+                </p>
+                <div className="flex gap-2 mt-3">
+                  <Button
+                    size="sm"
+                    variant="outline"
+                    onClick={() => openExisting(duplicate.id)}
+                  >
+                    {isUIArabic ? "فتح التقرير" : "Open report"}
+                  </Button>
+                  {duplicate.completed_tabs.length > 0 && (
+                    <Button
+                      size="sm"
+                      className="bg-purple-600 hover:bg-purple-700"
+                      onClick={() => createFromDuplicates(duplicate.id)}
+                    >
+                      {isUIArabic ? "إنشاء ونسخ الأقسام" : "Create and reuse sections"}
+                    </Button>
+                  )}
+                </div>
+              </div>
+            ))}
+          </div>
+          <AlertDialogFooter
+            className={isUIArabic ? "flex-row-reverse gap-2" : ""}
+          >
+            <AlertDialogCancel onClick={closeDuplicates}>
+              {isUIArabic ? "إلغاء" : "Cancel"}
+            </AlertDialogCancel>
+            <Button variant="outline" onClick={() => createFromDuplicates()}>
+              {isUIArabic ? "إنشاء تحليل جديد" : "Create new analysis"}
+            </Button>
+          </AlertDialogFooter>
+        </AlertDialogContent>
+      </AlertDialog>
     </div>
   );
 }